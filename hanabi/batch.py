@@ -0,0 +1,350 @@
+import numpy as np
+
+from hanabi import cards
+from hanabi.game import Game
+
+
+DECK_SIZE = len(cards.FULL_DECK)
+"""
+The number of cards in a full deck.
+"""
+
+EMPTY = -1
+"""
+The value used for empty hand slots.
+"""
+
+NO_TURN_LIMIT = -1
+"""
+The number of turns remaining in games where the last card has not been
+drawn yet.
+"""
+
+CARD_COLORS = np.array(
+    [cards.COLOR_INDICES[card.color] for card in cards.ALL_CARDS]
+)
+CARD_COPIES = np.array([card.copies for card in cards.ALL_CARDS])
+CARD_NUMBERS = np.array([card.number for card in cards.ALL_CARDS])
+FULL_DECK_INDICES = np.array([card.index for card in cards.FULL_DECK])
+
+
+def deals_from_decks(decks):
+    """
+    Convert decks into an array of deals.
+
+    Args:
+        decks:
+            An iterable of :class:`hanabi.cards.Deck` instances.
+
+    Returns:
+        An array with a row for each deck containing the indices of the
+        deck's cards in order.
+    """
+    return np.array(
+        [[card.index for card in deck.cards] for deck in decks],
+        dtype=np.int8,
+    )
+
+
+def random_deals(count, rng=None):
+    """
+    Generate shuffled decks.
+
+    Args:
+        count:
+            The number of decks to generate.
+        rng:
+            An optional :class:`numpy.random.Generator` to shuffle with.
+
+    Returns:
+        An array with a row of card indices for each deck.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    order = rng.random((count, DECK_SIZE)).argsort(axis=1)
+
+    return FULL_DECK_INDICES[order].astype(np.int8)
+
+
+class BatchGame:
+    """
+    A batch of games played in lockstep by omniscient players.
+
+    The state of every game is stored in arrays and the decisions made
+    by :class:`hanabi.players.GodPlayer` are expressed as masked array
+    operations, so a batch produces exactly the same scores as playing
+    each deal with :class:`hanabi.game.Game`.
+    """
+
+    def __init__(self, deals, player_count, game_class=Game):
+        """
+        Deal a batch of games.
+
+        Args:
+            deals:
+                An array with a row for each game containing the indices
+                of the deck's cards. Cards are drawn from the end of
+                each row, just like :class:`hanabi.cards.Deck`.
+            player_count:
+                The number of players in each game.
+            game_class:
+                The game class whose rules (hand size, hints, bombs)
+                the batch follows.
+        """
+        deals = np.asarray(deals)
+        count = len(deals)
+
+        self.game_class = game_class
+        self.player_count = player_count
+        self.turn = 0
+
+        self.decks = deals.astype(np.int8)
+        self.deck_sizes = np.full(count, deals.shape[1], dtype=np.int64)
+
+        self.stacks = np.zeros((count, len(cards.Colors)), dtype=np.int64)
+        self.discard_counts = np.zeros(
+            (count, len(cards.ALL_CARDS)), dtype=np.int64
+        )
+        self.dead_from = np.full(
+            (count, len(cards.Colors)),
+            cards.NUMBERS_PER_COLOR + 1,
+            dtype=np.int64,
+        )
+
+        self.hints = np.full(count, game_class.MAX_HINTS, dtype=np.int64)
+        self.bombs = np.zeros(count, dtype=np.int64)
+        self.turns_remaining = np.full(count, NO_TURN_LIMIT, dtype=np.int64)
+
+        self.hands = np.full(
+            (count, player_count, game_class.CARDS_PER_PLAYER),
+            EMPTY,
+            dtype=np.int64,
+        )
+        self.hand_sizes = np.zeros((count, player_count), dtype=np.int64)
+
+        everyone = np.arange(count)
+        for _ in range(game_class.CARDS_PER_PLAYER):
+            for player in range(player_count):
+                self._deal(everyone, player)
+
+    @property
+    def is_finished(self):
+        """
+        Returns:
+            A boolean array indicating which games are finished.
+        """
+        return (
+            (self.bombs >= self.game_class.MAX_BOMBS)
+            | (self.stacks == cards.NUMBERS_PER_COLOR).all(axis=1)
+            | (self.deck_sizes == 0) & (self.turns_remaining == 0)
+        )
+
+    @property
+    def scores(self):
+        """
+        Returns:
+            An array containing the current score of each game.
+        """
+        return self.stacks.sum(axis=1) - self.bombs
+
+    def _deal(self, rows, player):
+        """
+        Move the top card of the deck into a player's hand.
+
+        Args:
+            rows:
+                The indices of the games to deal in. Each game must
+                have a card left in its deck.
+            player:
+                The index of the player receiving the card.
+        """
+        self.deck_sizes[rows] -= 1
+        card = self.decks[rows, self.deck_sizes[rows]]
+
+        self.hands[rows, player, self.hand_sizes[rows, player]] = card
+        self.hand_sizes[rows, player] += 1
+
+    def _draw(self, rows, player):
+        """
+        Give a player a new card in each of the given games that still
+        has cards in the deck, starting the final round if the last
+        card is drawn.
+
+        Args:
+            rows:
+                The indices of the games to draw in.
+            player:
+                The index of the player drawing.
+        """
+        rows = rows[self.deck_sizes[rows] > 0]
+        self._deal(rows, player)
+
+        last_draw = rows[
+            (self.deck_sizes[rows] == 0)
+            & (self.turns_remaining[rows] == NO_TURN_LIMIT)
+        ]
+        self.turns_remaining[last_draw] = self.player_count
+
+    def _give_hint(self, rows):
+        """
+        Add a hint in each of the given games, up to the maximum.
+
+        Args:
+            rows:
+                The indices of the games to add a hint to.
+        """
+        self.hints[rows] = np.minimum(
+            self.hints[rows] + 1, self.game_class.MAX_HINTS
+        )
+
+    def _remove_cards(self, rows, player, slots):
+        """
+        Remove cards from a player's hand, shifting the cards after them
+        down to keep the order of the hand.
+
+        Args:
+            rows:
+                The indices of the games to remove cards in.
+            player:
+                The index of the player whose hand is modified.
+            slots:
+                The slot of the card to remove in each game.
+
+        Returns:
+            The indices of the cards that were removed.
+        """
+        hands = self.hands[rows, player]
+        removed = hands[np.arange(len(rows)), slots]
+
+        positions = np.arange(hands.shape[1])
+        sources = positions + (positions >= slots[:, np.newaxis])
+        padded = np.pad(hands, ((0, 0), (0, 1)), constant_values=EMPTY)
+
+        self.hands[rows, player] = np.take_along_axis(padded, sources, axis=1)
+        self.hand_sizes[rows, player] -= 1
+
+        return removed
+
+    def _discard(self, rows, player, slots):
+        """
+        Discard cards from a player's hand.
+
+        Args:
+            rows:
+                The indices of the games to discard in.
+            player:
+                The index of the player discarding.
+            slots:
+                The slot of the discarded card in each game.
+        """
+        removed = self._remove_cards(rows, player, slots)
+        colors = CARD_COLORS[removed]
+
+        self.discard_counts[rows, removed] += 1
+        killed = self.discard_counts[rows, removed] == CARD_COPIES[removed]
+        self.dead_from[rows[killed], colors[killed]] = np.minimum(
+            self.dead_from[rows[killed], colors[killed]],
+            CARD_NUMBERS[removed[killed]],
+        )
+
+        self._draw(rows, player)
+        self._give_hint(rows)
+
+    def _play(self, rows, player, slots):
+        """
+        Play cards from a player's hand. The cards must be playable.
+
+        Args:
+            rows:
+                The indices of the games to play in.
+            player:
+                The index of the player playing.
+            slots:
+                The slot of the played card in each game.
+        """
+        removed = self._remove_cards(rows, player, slots)
+        self.stacks[rows, CARD_COLORS[removed]] += 1
+
+        gives_hint = np.isin(
+            CARD_NUMBERS[removed], self.game_class.HINT_GIVING_NUMBERS
+        )
+        self._give_hint(rows[gives_hint])
+
+        self._draw(rows, player)
+
+    def play(self):
+        """
+        Play every game in the batch until it is finished.
+
+        Returns:
+            An array containing the final score of each game.
+        """
+        while self.step():
+            pass
+
+        return self.scores
+
+    def step(self):
+        """
+        Play a single turn in every game that is not finished.
+
+        Returns:
+            A boolean indicating if any game was still in progress.
+        """
+        active = np.flatnonzero(~self.is_finished)
+        if not len(active):
+            return False
+
+        player = self.turn % self.player_count
+        hands = self.hands[active, player]
+        slots = np.arange(hands.shape[1])
+
+        held = slots < self.hand_sizes[active, player, np.newaxis]
+        indices = np.where(held, hands, 0)
+        colors = CARD_COLORS[indices]
+        numbers = CARD_NUMBERS[indices]
+        stacks = np.take_along_axis(self.stacks[active], colors, axis=1)
+        dead_from = np.take_along_axis(
+            self.dead_from[active], colors, axis=1
+        )
+
+        playable = held & (numbers == stacks + 1)
+        useful = (numbers > stacks) & (numbers <= dead_from)
+        useless = held & ~playable & ~useful
+
+        # Play the lowest playable card.
+        plays = playable.any(axis=1)
+        play_keys = np.where(playable, numbers * len(slots) + slots, np.inf)
+        play_slots = play_keys.argmin(axis=1)
+
+        # Stall with a hint when the deck is about to run out.
+        hints_left = self.hints[active] > 0
+        stalls = ~plays & (self.deck_sizes[active] == 1) & hints_left
+
+        # Discard the first useless card.
+        useless_discards = ~plays & ~stalls & useless.any(axis=1)
+        useless_slots = useless.argmax(axis=1)
+
+        # Use a hint rather than discard a useful card.
+        hints = ~plays & ~stalls & ~useless_discards & hints_left
+
+        # Discard the most common card.
+        fallbacks = ~plays & ~stalls & ~useless_discards & ~hints
+        copies = np.where(held, CARD_COPIES[indices], EMPTY)
+        fallback_slots = copies.argmax(axis=1)
+
+        self._play(active[plays], player, play_slots[plays])
+        self.hints[active[stalls | hints]] -= 1
+
+        discards = useless_discards | fallbacks
+        discard_slots = np.where(
+            useless_discards, useless_slots, fallback_slots
+        )
+        self._discard(active[discards], player, discard_slots[discards])
+
+        counting_down = active[self.turns_remaining[active] != NO_TURN_LIMIT]
+        self.turns_remaining[counting_down] -= 1
+        self.turn += 1
+
+        return True
@@ -0,0 +1,93 @@
+import argparse
+import sys
+
+from hanabi.benchmarks import suite
+
+
+def main():
+    """
+    Run the benchmark suite or compare two sets of results.
+
+    Returns:
+        The process exit code. This is non-zero if a comparison finds a
+        regression or a missing benchmark.
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m hanabi.benchmarks',
+        description='Measure the throughput of the Hanabi engine.',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser(
+        'run', help='Run the benchmarks and save the results as JSON.'
+    )
+    run_parser.add_argument('output', help='The file to write results to.')
+    run_parser.add_argument(
+        '--filter', default='',
+        help='Only run benchmarks whose name contains this string.',
+    )
+    run_parser.add_argument(
+        '--repeat', default=3, type=int,
+        help='The number of times to run each benchmark.',
+    )
+    run_parser.add_argument(
+        '--scale', default=1.0, type=float,
+        help='A multiplier for the number of iterations of each benchmark.',
+    )
+
+    compare_parser = subparsers.add_parser(
+        'compare',
+        help='Fail if throughput regressed compared to a baseline.',
+    )
+    compare_parser.add_argument('baseline', help='The baseline results.')
+    compare_parser.add_argument('current', help='The results to check.')
+    compare_parser.add_argument(
+        '--tolerance', default=suite.DEFAULT_TOLERANCE, type=float,
+        help='The fraction by which throughput may drop.',
+    )
+
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        benchmarks = [
+            benchmark for benchmark in suite.BENCHMARKS
+            if args.filter in benchmark.name
+        ]
+        results = suite.run(
+            benchmarks,
+            repeat=args.repeat,
+            scale=args.scale,
+            output=lambda name, ops: print(f'{name:40}{ops:>16,.0f} ops/s'),
+        )
+        suite.save(results, args.output)
+
+        return 0
+
+    regressions = suite.compare(
+        suite.load(args.baseline),
+        suite.load(args.current),
+        tolerance=args.tolerance,
+    )
+
+    for regression in regressions:
+        if regression.current is None:
+            print(f'{regression.name}: missing from the current results')
+
+            continue
+
+        print(
+            f'{regression.name}: {regression.baseline:,.0f} -> '
+            f'{regression.current:,.0f} ops/s ({regression.change:+.1%})'
+        )
+
+    if regressions:
+        return 1
+
+    print('No benchmarks regressed.')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,390 @@
+import collections
+import json
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+
+from hanabi import cards, players
+from hanabi.game import Game
+from hanabi.renderers.console import ConsoleRenderer
+
+
+DEFAULT_TOLERANCE = 0.1
+"""
+The default fraction by which throughput may drop before a benchmark is
+considered to have regressed.
+"""
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+"""
+The directory containing the package, which imports are timed from.
+"""
+
+Benchmark = collections.namedtuple('Benchmark', ['name', 'func', 'iterations'])
+"""
+A named benchmark. The function receives a number of iterations and
+returns the number of seconds spent on them, excluding any setup.
+"""
+
+Regression = collections.namedtuple(
+    'Regression', ['name', 'baseline', 'current', 'change']
+)
+"""
+A benchmark whose throughput dropped by more than the tolerance. The
+current throughput and the change are ``None`` if the benchmark is
+missing from the current run.
+"""
+
+
+def _mid_game(player_count=4, seed=0):
+    """
+    Play a game with god players until half the deck is used up.
+
+    Args:
+        player_count:
+            The number of players in the game.
+        seed:
+            The seed used to shuffle the deck.
+
+    Returns:
+        The partially played game.
+    """
+    game = Game([players.GodPlayer] * player_count, rng=seed)
+
+    while len(game.deck.cards) > len(cards.FULL_DECK) // 2:
+        game.players[game.current_player_index].get_move()
+        game.end_turn()
+
+    return game
+
+
+def _time_game_play(player_class, player_count):
+    """
+    Create a benchmark function that plays full games.
+
+    Args:
+        player_class:
+            The class used for every player.
+        player_count:
+            The number of players in each game.
+
+    Returns:
+        A benchmark function.
+    """
+    def benchmark(iterations):
+        games = [
+            Game([player_class] * player_count, rng=seed)
+            for seed in range(iterations)
+        ]
+
+        start = time.perf_counter()
+        for game in games:
+            game.play()
+
+        return time.perf_counter() - start
+
+    return benchmark
+
+
+def _time_full_shuffled_deck(iterations):
+    """
+    Time creating full shuffled decks.
+
+    Args:
+        iterations:
+            The number of times to repeat the operation.
+
+    Returns:
+        The number of seconds spent.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        cards.Deck.full_shuffled_deck()
+
+    return time.perf_counter() - start
+
+
+def _time_is_card_useful(iterations):
+    """
+    Time checking the usefulness of cards in a game in progress.
+
+    Args:
+        iterations:
+            The number of times to repeat the operation.
+
+    Returns:
+        The number of seconds spent.
+    """
+    game = _mid_game()
+    all_cards = cards.ALL_CARDS * (iterations // len(cards.ALL_CARDS) + 1)
+    all_cards = all_cards[:iterations]
+
+    start = time.perf_counter()
+    for card in all_cards:
+        game.is_card_useful(card)
+
+    return time.perf_counter() - start
+
+
+def _time_god_player_get_move(iterations):
+    """
+    Time a single move by a god player in games in progress.
+
+    Args:
+        iterations:
+            The number of times to repeat the operation.
+
+    Returns:
+        The number of seconds spent.
+    """
+    games = [_mid_game(seed=seed) for seed in range(iterations)]
+    movers = [game.players[game.current_player_index] for game in games]
+
+    start = time.perf_counter()
+    for player in movers:
+        player.get_move()
+
+    return time.perf_counter() - start
+
+
+def _time_renderer(method_name, *args):
+    """
+    Create a benchmark function for a console renderer method.
+
+    Args:
+        method_name:
+            The name of the method to call. The public rendering methods
+            reuse their result while the game is unchanged, so timing
+            the rendering itself requires the uncached method, such as
+            ``_render_stacks``.
+        *args:
+            Indices of the players to pass to the method.
+
+    Returns:
+        A benchmark function.
+    """
+    def benchmark(iterations):
+        game = _mid_game()
+        method = getattr(ConsoleRenderer(game), method_name)
+        method_args = [game.players[index] for index in args]
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            method(*method_args)
+
+        return time.perf_counter() - start
+
+    return benchmark
+
+
+def _time_import(module):
+    """
+    Create a benchmark function for importing a module.
+
+    Args:
+        module:
+            The name of the module to import.
+
+    Returns:
+        A benchmark function. Each iteration imports the module in a
+        fresh interpreter, and only the import itself is timed.
+    """
+    script = (
+        'import time; '
+        'start = time.perf_counter(); '
+        f'import {module}; '
+        'print(time.perf_counter() - start)'
+    )
+
+    def benchmark(iterations):
+        elapsed = 0.0
+
+        for _ in range(iterations):
+            process = subprocess.run(
+                [sys.executable, '-c', script],
+                stdout=subprocess.PIPE,
+                universal_newlines=True,
+                check=True,
+                cwd=str(ROOT),
+            )
+            elapsed += float(process.stdout)
+
+        return elapsed
+
+    return benchmark
+
+
+GAME_PLAY_ITERATIONS = [
+    (players.GodPlayer, 200),
+    (players.CompiledGodPlayer, 200),
+    (players.HintPlayer, 50),
+]
+"""
+The player classes that full games are benchmarked with, and the number
+of games played with each. Slower players play fewer games so that each
+benchmark takes a similar amount of time.
+"""
+
+BENCHMARKS = [
+    Benchmark(
+        f'game_play[{klass.__name__}-{count}]',
+        _time_game_play(klass, count),
+        iterations,
+    )
+    for klass, iterations in GAME_PLAY_ITERATIONS
+    for count in range(2, 6)
+] + [
+    Benchmark('deck_full_shuffled_deck', _time_full_shuffled_deck, 20_000),
+    Benchmark('game_is_card_useful', _time_is_card_useful, 200_000),
+    Benchmark('god_player_get_move', _time_god_player_get_move, 1_000),
+    Benchmark(
+        'console_render_discards',
+        _time_renderer('_render_discards'),
+        2_000,
+    ),
+    Benchmark(
+        'console_render_game_info',
+        _time_renderer('_render_game_info'),
+        20_000,
+    ),
+    Benchmark(
+        'console_render_other_hands',
+        _time_renderer('_render_other_hands', 0),
+        2_000,
+    ),
+    Benchmark(
+        'console_render_stacks',
+        _time_renderer('_render_stacks'),
+        20_000,
+    ),
+    Benchmark(
+        'console_render_stacks_cached',
+        _time_renderer('render_stacks'),
+        200_000,
+    ),
+] + [
+    Benchmark(f'import[{module}]', _time_import(module), 20)
+    for module in ['hanabi.game', 'hanabi.players', 'hanabi.simulation']
+]
+"""
+Every benchmark in the suite.
+"""
+
+
+def run(benchmarks=None, repeat=3, scale=1.0, output=None):
+    """
+    Run benchmarks and record their throughput.
+
+    Args:
+        benchmarks:
+            The benchmarks to run. Defaults to the entire suite.
+        repeat:
+            The number of times to run each benchmark. The fastest run
+            is recorded to reduce noise.
+        scale:
+            A multiplier for the number of iterations of each benchmark.
+        output:
+            An optional callable that receives each benchmark's name and
+            throughput as it completes.
+
+    Returns:
+        A dictionary that can be saved as a JSON baseline.
+    """
+    if benchmarks is None:
+        benchmarks = BENCHMARKS
+
+    results = {}
+
+    for benchmark in benchmarks:
+        iterations = max(1, int(benchmark.iterations * scale))
+        elapsed = min(benchmark.func(iterations) for _ in range(repeat))
+        throughput = iterations / elapsed
+
+        results[benchmark.name] = {
+            'iterations': iterations,
+            'ops_per_second': throughput,
+        }
+
+        if output is not None:
+            output(benchmark.name, throughput)
+
+    return {
+        'benchmarks': results,
+        'machine': platform.machine(),
+        'python': platform.python_version(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(baseline, current, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare the throughput of two benchmark runs.
+
+    Args:
+        baseline:
+            The results of the baseline run, as returned by :func:`run`.
+        current:
+            The results of the run being checked.
+        tolerance:
+            The fraction by which throughput may drop before it is
+            considered a regression.
+
+    Returns:
+        A list of :class:`Regression` instances for each benchmark that
+        slowed down by more than the tolerance or is missing from the
+        current run. Benchmarks that are only in the current run are
+        ignored.
+    """
+    regressions = []
+
+    for name, result in baseline['benchmarks'].items():
+        baseline_ops = result['ops_per_second']
+
+        # A benchmark that was renamed, removed, or crashed can't be
+        # checked, so it fails the comparison.
+        if name not in current['benchmarks']:
+            regressions.append(Regression(name, baseline_ops, None, None))
+
+            continue
+
+        current_ops = current['benchmarks'][name]['ops_per_second']
+        change = current_ops / baseline_ops - 1
+
+        if change < -tolerance:
+            regressions.append(
+                Regression(name, baseline_ops, current_ops, change)
+            )
+
+    return regressions
+
+
+def load(path):
+    """
+    Load benchmark results from a JSON file.
+
+    Args:
+        path:
+            The path of the file to load.
+
+    Returns:
+        The benchmark results.
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def save(results, path):
+    """
+    Save benchmark results as a JSON file.
+
+    Args:
+        results:
+            The results to save.
+        path:
+            The path of the file to write.
+    """
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
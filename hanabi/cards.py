@@ -13,23 +13,88 @@ class Colors(enum.Enum):
     YELLOW = 'yellow'
 
 
+COLOR_INDICES = {color: index for index, color in enumerate(Colors)}
+"""
+A map from each color to its position in the enum. Cards are indexed by
+color and then by number.
+"""
+
+NUMBERS_PER_COLOR = 5
+"""
+The number of distinct card numbers in each color.
+"""
+
+
+def get_rng(rng=None):
+    """
+    Get a random number generator.
+
+    Args:
+        rng:
+            Either an existing :class:`random.Random` instance, which is
+            returned as is, an integer seed for a new generator, or
+            ``None`` to use the global generator from :mod:`random`.
+
+    Returns:
+        An object providing the methods of :class:`random.Random`.
+    """
+    if rng is None:
+        return random
+
+    if isinstance(rng, int):
+        return random.Random(rng)
+
+    return rng
+
+
 class Card:
     """
     A card has a color and a number.
+
+    Cards are flyweights. There is exactly one instance for each
+    combination of color and number, so constructing a card returns the
+    shared instance and cards may be compared by identity. Since the
+    instances are shared, they must never be modified.
     """
 
-    def __init__(self, color: Colors, number: int):
+    __slots__ = ('color', 'copies', 'index', 'number')
+
+    _instances = {}
+
+    def __new__(cls, color: Colors, number: int):
         """
-        Initialize a new card.
+        Get the card with the given color and number.
 
         Args:
             color:
                 The card's color.
             number:
                 The card's number.
+
+        Returns:
+            The shared instance for the card.
+        """
+        try:
+            return cls._instances[(color, number)]
+        except KeyError:
+            pass
+
+        card = super().__new__(cls)
+        card.color = color
+        card.copies = Deck.CARD_COUNT_MAP[number]
+        card.index = COLOR_INDICES[color] * NUMBERS_PER_COLOR + number - 1
+        card.number = number
+
+        cls._instances[(color, number)] = card
+
+        return card
+
+    def __reduce__(self):
+        """
+        Pickle cards by their color and number so that unpickling returns
+        the shared instance.
         """
-        self.color = color
-        self.number = number
+        return Card, (self.color, self.number)
 
     def __str__(self):
         """
@@ -38,6 +103,20 @@ class Card:
         """
         return f'{self.color.value} {self.number}'
 
+    @classmethod
+    def from_index(cls, index):
+        """
+        Get a card from its compact index.
+
+        Args:
+            index:
+                The card's index, as given by its ``index`` attribute.
+
+        Returns:
+            The card with the given index.
+        """
+        return ALL_CARDS[index]
+
 
 class Deck:
     """
@@ -62,19 +141,38 @@ class Deck:
         self.cards = []
 
     @classmethod
-    def full_shuffled_deck(cls):
+    def full_shuffled_deck(cls, rng=None):
         """
+        Args:
+            rng:
+                An optional random number generator or seed to shuffle
+                with. See :func:`get_rng`.
+
         Returns:
             A new deck containing a random shuffle of all possible
             cards.
         """
         deck = cls()
+        deck.cards = FULL_DECK.copy()
+        deck.shuffle(rng)
 
-        for color in Colors:
-            for number, count in cls.CARD_COUNT_MAP.items():
-                deck.cards += [Card(color, number) for _ in range(count)]
+        return deck
 
-        deck.shuffle()
+    @classmethod
+    def from_indices(cls, indices):
+        """
+        Create a deck from a sequence of compact card indices.
+
+        Args:
+            indices:
+                The indices of the cards in the deck, in the same order
+                as :attr:`cards`. The last card is the top of the deck.
+
+        Returns:
+            A new deck containing the given cards.
+        """
+        deck = cls()
+        deck.cards = [ALL_CARDS[index] for index in indices]
 
         return deck
 
@@ -82,8 +180,30 @@ class Deck:
     def is_empty(self):
         return not len(self.cards)
 
-    def shuffle(self):
+    def shuffle(self, rng=None):
         """
         Shuffle the cards in the deck (in place).
+
+        Args:
+            rng:
+                An optional random number generator or seed to shuffle
+                with. See :func:`get_rng`.
         """
-        random.shuffle(self.cards)
+        get_rng(rng).shuffle(self.cards)
+
+
+ALL_CARDS = [
+    Card(color, number)
+    for color in Colors
+    for number in Deck.CARD_COUNT_MAP
+]
+"""
+Every distinct card, ordered by index.
+"""
+
+FULL_DECK = [
+    card for card in ALL_CARDS for _ in range(Deck.CARD_COUNT_MAP[card.number])
+]
+"""
+An unshuffled template containing every card in a full deck.
+"""
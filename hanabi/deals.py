@@ -0,0 +1,122 @@
+import ctypes
+from multiprocessing import sharedctypes
+
+import numpy as np
+
+from hanabi import batch, cards
+
+
+DEFAULT_BATCH_SIZE = 100_000
+"""
+The number of deals generated at a time. Shuffling needs several times
+more temporary memory than the deals themselves, so large pools are
+generated in batches.
+"""
+
+
+class DealPool:
+    """
+    A block of shuffled decks in shared memory.
+
+    The deals are generated once, in vectorized batches, and stored as
+    one row of card indices per deck. Worker processes attach to the
+    pool with :func:`attach` when they start, so the deals are never
+    pickled or shuffled again and every game played from the pool sees
+    exactly the same deal, whatever the engine or player.
+    """
+
+    def __init__(self, array, count):
+        """
+        Wrap a shared array of deals.
+
+        Args:
+            array:
+                A shared ``ctypes`` array of card indices.
+            count:
+                The number of deals in the array.
+        """
+        self.array = array
+        self.count = count
+        self.deals = np.frombuffer(array, dtype=np.int8).reshape(
+            count, batch.DECK_SIZE
+        )
+
+    def __len__(self):
+        return self.count
+
+    @classmethod
+    def generate(cls, count, seed=None, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Create a pool of random deals.
+
+        Args:
+            count:
+                The number of deals.
+            seed:
+                An optional seed for the deals. The same seed always
+                gives the same deals.
+            batch_size:
+                The number of deals to shuffle at a time.
+
+        Returns:
+            A new pool.
+        """
+        rng = np.random.default_rng(seed)
+        pool = cls(
+            sharedctypes.RawArray(ctypes.c_int8, count * batch.DECK_SIZE),
+            count,
+        )
+
+        for start in range(0, count, batch_size):
+            stop = min(start + batch_size, count)
+            pool.deals[start:stop] = batch.random_deals(stop - start, rng)
+
+        return pool
+
+    def deck(self, index):
+        """
+        Create a deck for one of the deals.
+
+        Args:
+            index:
+                The index of the deal.
+
+        Returns:
+            A new :class:`hanabi.cards.Deck` with the deal's cards.
+        """
+        return cards.Deck.from_indices(self.deals[index].tolist())
+
+
+_attached = None
+
+
+def attach(array, count):
+    """
+    Attach the current process to a pool. This is used as the
+    initializer of worker processes, which receive the shared array
+    when they start rather than with each task.
+
+    Args:
+        array:
+            The pool's shared array.
+        count:
+            The number of deals in the pool.
+    """
+    global _attached
+
+    _attached = DealPool(array, count)
+
+
+def attached():
+    """
+    Returns:
+        The pool the current process is attached to.
+
+    Raises:
+        RuntimeError:
+            If the process isn't attached to a pool.
+    """
+    if _attached is None:
+        raise RuntimeError('The process is not attached to a deal pool.')
+
+    return _attached
@@ -0,0 +1,144 @@
+import collections
+import enum
+
+
+class Event(enum.Enum):
+    """
+    Enum containing the events a game notifies its listeners of.
+
+    Each event is delivered with keyword arguments describing it:
+
+    * ``CARD_PLAYED`` and ``BOMB``: ``player``, ``card``, ``card_index``
+    * ``DISCARD``: ``player``, ``card``, ``card_index``, ``gave_hint``
+    * ``DRAW``: ``player``, ``card``
+    * ``HINT_SPENT``: ``player``, ``target``, ``color``, ``number``,
+      ``card_indices`` (everything but ``player`` is ``None`` for
+      simulated hints)
+    * ``LAST_CARD_DRAWN``: ``player``, ``turns_remaining``
+    * ``GAME_OVER``: ``score``
+    """
+    BOMB = 'bomb'
+    CARD_PLAYED = 'card_played'
+    DISCARD = 'discard'
+    DRAW = 'draw'
+    GAME_OVER = 'game_over'
+    HINT_SPENT = 'hint_spent'
+    LAST_CARD_DRAWN = 'last_card_drawn'
+
+
+class LoggingListener:
+    """
+    A listener that writes each event to a logger.
+    """
+
+    MESSAGES = {
+        Event.BOMB: '%(player)s tried to play the %(card)s which is not '
+                    'playable.',
+        Event.CARD_PLAYED: '%(player)s played the %(card)s increasing the '
+                           'score to %(score)d.',
+        Event.DISCARD: '%(player)s discarded a %(card)s.',
+        Event.DRAW: 'Dealing %(player)s a %(card)s.',
+        Event.GAME_OVER: 'The game is complete with a score of %(score)d.',
+        Event.HINT_SPENT: '%(player)s used a hint.',
+        Event.LAST_CARD_DRAWN: 'The last card was drawn from the deck. There '
+                               'are %(turns_remaining)d turns remaining.',
+    }
+    """
+    A map from events to the messages logged for them.
+    """
+
+    def __init__(self, logger=None, level=None):
+        """
+        Create a new logging listener.
+
+        Args:
+            logger:
+                The logger to write to. Defaults to this module's
+                logger.
+            level:
+                The level to log events at. Defaults to
+                ``logging.INFO``.
+        """
+        # The logging module is only needed once something listens, so
+        # it isn't imported with the rest of the engine.
+        import logging
+
+        if level is None:
+            level = logging.INFO
+
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def __call__(self, game, event, **details):
+        """
+        Log an event.
+
+        Args:
+            game:
+                The game the event occurred in.
+            event:
+                The event that occurred.
+            **details:
+                The details of the event.
+        """
+        if self.logger.isEnabledFor(self.level):
+            details.setdefault('score', game.score)
+            self.logger.log(self.level, self.MESSAGES[event], details)
+
+
+class StatisticsListener:
+    """
+    A listener that counts the events that occur, optionally across many
+    games.
+    """
+
+    def __init__(self):
+        """
+        Create a new statistics listener with no recorded events.
+        """
+        self.counts = collections.Counter()
+        self.scores = collections.Counter()
+
+    def __call__(self, game, event, **details):
+        """
+        Count an event.
+
+        Args:
+            game:
+                The game the event occurred in.
+            event:
+                The event that occurred.
+            **details:
+                The details of the event.
+        """
+        self.counts[event] += 1
+
+        if event == Event.GAME_OVER:
+            self.scores[details['score']] += 1
+
+
+class ReplayRecorder:
+    """
+    A listener that records every event in order so a game can be
+    inspected after it is played.
+    """
+
+    def __init__(self):
+        """
+        Create a new recorder with no recorded events.
+        """
+        self.events = []
+
+    def __call__(self, game, event, **details):
+        """
+        Record an event.
+
+        Args:
+            game:
+                The game the event occurred in.
+            event:
+                The event that occurred.
+            **details:
+                The details of the event.
+        """
+        self.events.append((event, details))
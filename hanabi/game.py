@@ -1,16 +1,73 @@
 #!/usr/bin/env python3
 
 import collections
-import logging
-import time
+import enum
 
-from tqdm import tqdm
+from hanabi import cards, events, knowledge, players, stats
 
-from hanabi import cards, players
 
-
-logging.basicConfig(level=logging.WARNING)
-logger = logging.getLogger(__name__)
+class MoveType(enum.Enum):
+    """
+    Enum containing the types of moves a player can make.
+    """
+    DISCARD = 'discard'
+    HINT = 'hint'
+    PLAY = 'play'
+
+
+Move = collections.namedtuple(
+    'Move', ['type', 'card_index', 'target', 'color', 'number']
+)
+"""
+A move made by the current player. The card index is ``None`` for
+hints. A hint with a target tells the player at that index about their
+cards with the given color or number, and a hint without one is only
+simulated.
+"""
+
+# The hint fields are optional so that plays, discards, and simulated
+# hints can be given by their type and card index alone.
+Move.__new__.__defaults__ = (None, None, None)
+
+GameState = collections.namedtuple(
+    'GameState',
+    [
+        'deck',
+        'hands',
+        'stacks',
+        'discards',
+        'hints',
+        'bombs',
+        'turns_remaining',
+        'current_player',
+        'knowledge',
+        'turns_played',
+        'last_draw_turn',
+    ],
+)
+"""
+A snapshot of a game's state that does not reference any players.
+
+Cards are stored by their compact index. The hands and the knowledge of
+each card in them are ordered by player index, and the stacks are
+ordered like :class:`hanabi.cards.Colors`.
+"""
+
+_UndoRecord = collections.namedtuple(
+    '_UndoRecord',
+    [
+        'move',
+        'card',
+        'was_played',
+        'card_knowledge',
+        'drew',
+        'hints',
+        'bombs',
+        'turns_remaining',
+        'current_player',
+        'last_draw_turn',
+    ],
+)
 
 
 class Game:
@@ -43,7 +100,7 @@ class Game:
     the number of hints available at the beginning of the game.
     """
 
-    def __init__(self, player_classes):
+    def __init__(self, player_classes, deck=None, rng=None):
         """
         Create a new game.
 
@@ -52,26 +109,130 @@ class Game:
                 An iterable containing the classes used to represent
                 each player in the game. Each class will be instantiated
                 with a reference to the game instance.
+            deck:
+                An optional deck to deal from. The game takes ownership
+                of the deck and draws cards from it. If this is not
+                provided, a full shuffled deck is used.
+            rng:
+                An optional random number generator or integer seed used
+                to shuffle the deck if one is not provided.
         """
-        self.deck = cards.Deck.full_shuffled_deck()
+        if deck is None:
+            deck = cards.Deck.full_shuffled_deck(rng)
+
+        self.deck = deck
         self._hints_remaining = self.MAX_HINTS
 
         # Track plays and discards
         self.stacks = collections.defaultdict(int)
         self.discards = []
 
+        # State derived from the plays and discards. It is updated as
+        # cards are played or discarded so that it is cheap to query.
+        self.completed_stacks = 0
+        self.critical_cards = set()
+        self.dead_from = {}
+        self.discard_counts = [0] * len(cards.ALL_CARDS)
+        self._cards_played = 0
+
+        # The number of cards that could still be on the stacks at the
+        # end of the game, ignoring how many turns are left.
+        self._reachable_cards = len(cards.Colors) * cards.NUMBERS_PER_COLOR
+
+        # The same state as masks of cards, as used by the knowledge
+        # engine in hanabi.knowledge.
+        self.playable_mask = 0
+        self.played_mask = 0
+        self.useful_mask = 0
+
+        for color in cards.Colors:
+            self._refresh_color(color)
+
         # Player creation
         self.players = [klass(self, i) for i, klass in enumerate(player_classes)]
         self.player_hands = collections.defaultdict(list)
 
+        # What each player has been told about the cards in their hand,
+        # stored as a mask of the possible cards in the same order as
+        # their hand.
+        self.hand_knowledge = collections.defaultdict(list)
+
         for _ in range(self.CARDS_PER_PLAYER):
             for player in self.players:
                 self.player_hands[player].append(self.deck.cards.pop())
+                self.hand_knowledge[player].append(knowledge.ALL_CARDS_MASK)
 
         # Game completion status
         self.bombs = 0
+        self.current_player_index = 0
         self.turns_remaining = None
 
+        # The number of turns that have ended, and the turn in which a
+        # card was last drawn from the deck. This is None until a card is
+        # drawn after the deal.
+        self.turns_played = 0
+        self.last_draw_turn = None
+
+        # Moves made with make_move that can be undone
+        self._undo_stack = []
+
+        # A map from events to the callables notified of them. It is
+        # empty unless something subscribes, which lets the game skip
+        # building event details entirely.
+        self.listeners = {}
+
+    @classmethod
+    def from_snapshot(cls, state, player_classes):
+        """
+        Create a game from a snapshot of another game's state.
+
+        Args:
+            state:
+                The :class:`GameState` to restore.
+            player_classes:
+                The classes used to represent each player. There must be
+                one for each hand in the snapshot.
+
+        Returns:
+            A new game in the given state.
+        """
+        # The game deals its opening hands while it is created, so it is
+        # given a full deck before being put into the snapshot's state.
+        deck = cards.Deck()
+        deck.cards = cards.FULL_DECK.copy()
+
+        game = cls(player_classes, deck=deck)
+        game.restore(state)
+
+        return game
+
+    def apply_move(self, move):
+        """
+        Make a move on behalf of the current player without ending their
+        turn.
+
+        Args:
+            move:
+                The :class:`Move` to make.
+        """
+        player = self.players[self.current_player_index]
+
+        if move.type == MoveType.PLAY:
+            self.play_card(player, move.card_index)
+        elif move.type == MoveType.DISCARD:
+            self.discard_player_card_by_index(player, move.card_index)
+        elif move.type == MoveType.HINT and move.target is None:
+            self.give_hint(player)
+        elif move.type == MoveType.HINT:
+            self.give_hint(
+                player,
+                target=self.players[move.target],
+                color=move.color,
+                number=move.number,
+            )
+        else:
+            raise ValueError(f'Received unexpected move type: {move.type}')
+
     def describe_other_hands(self, player):
         """
         Get representations of each of the other players' hands.
@@ -89,7 +250,62 @@ class Game:
 
         return hands
 
-    def discard_player_card(self, player, card, give_hint=True):
+    def _refresh_color(self, color):
+        """
+        Recompute the derived state for a single color after one of its
+        cards was played or discarded.
+
+        Args:
+            color:
+                The color to recompute the state of.
+        """
+        color_index = cards.COLOR_INDICES[color]
+        start = color_index * cards.NUMBERS_PER_COLOR
+        color_cards = cards.ALL_CARDS[start:start + cards.NUMBERS_PER_COLOR]
+
+        dead_from = cards.NUMBERS_PER_COLOR + 1
+        for card in color_cards:
+            if self.discard_counts[card.index] == card.copies:
+                dead_from = card.number
+
+                break
+
+        # Every card below the first dead one can still be played.
+        self._reachable_cards += dead_from - self.dead_from.get(
+            color, cards.NUMBERS_PER_COLOR + 1
+        )
+        self.dead_from[color] = dead_from
+
+        stack = self.stacks.get(color, 0)
+        for card in color_cards:
+            remaining = card.copies - self.discard_counts[card.index]
+
+            if stack < card.number <= dead_from and remaining == 1:
+                self.critical_cards.add(card)
+            else:
+                self.critical_cards.discard(card)
+
+        other_colors = ~(knowledge.COLOR_BITS << start)
+        self.playable_mask = (
+            self.playable_mask & other_colors
+            | knowledge.NEXT_CARD_MASKS[color_index][stack]
+        )
+        self.played_mask = (
+            self.played_mask & other_colors
+            | knowledge.PLAYED_MASKS[color_index][stack]
+        )
+        self.useful_mask = (
+            self.useful_mask & other_colors
+            | knowledge.USEFUL_MASKS[color_index][stack][dead_from]
+        )
+
+    def discard_player_card(
+            self,
+            player,
+            card,
+            give_hint=True,
+            card_index=None,
+    ):
         """
         Discard a card that was in a player's hand and give them a new
         card.
@@ -102,10 +318,20 @@ class Game:
             give_hint:
                 A boolean indicating if a hint should be given for the
                 discard.
+            card_index:
+                The index the card had in the player's hand, if known.
+                This is only used to describe the discard to listeners.
         """
-        self.discards.append(card)
-
-        logger.info('%s discarded a %s', player, card)
+        self.record_discard(card)
+
+        if self.listeners:
+            self.emit(
+                events.Event.DISCARD,
+                player=player,
+                card=card,
+                card_index=card_index,
+                gave_hint=give_hint,
+            )
 
         self.draw_card(player)
 
@@ -123,8 +349,11 @@ class Game:
                 The index within the player's hand of the card to
                 discard.
         """
+        self.hand_knowledge[player].pop(card_index)
         self.discard_player_card(
-            player, self.player_hands[player].pop(card_index)
+            player,
+            self.player_hands[player].pop(card_index),
+            card_index=card_index,
         )
 
     def draw_card(self, player):
@@ -137,29 +366,116 @@ class Game:
                 The player to deal a card to.
         """
         if self.deck.is_empty:
-            logger.info(
-                'Not dealing a card to %s because the deck is empty.',
-                player,
-            )
-
             return
 
-        logger.info('Dealing %s a new card.', player)
+        card = self.deck.cards.pop()
+        self.player_hands[player].append(card)
+        self.hand_knowledge[player].append(knowledge.ALL_CARDS_MASK)
+        self.last_draw_turn = self.turns_played
 
-        self.player_hands[player].append(self.deck.cards.pop())
-        logger.debug(
-            'Dealing %s a %s.', player, self.player_hands[player][-1]
-        )
+        if self.listeners:
+            self.emit(events.Event.DRAW, player=player, card=card)
 
         if self.deck.is_empty and self.turns_remaining is None:
             self.turns_remaining = len(self.players)
 
-            logger.info(
-                'The last card was drawn from the deck. There are %d turns '
-                'remaining.',
-                self.turns_remaining,
+            if self.listeners:
+                self.emit(
+                    events.Event.LAST_CARD_DRAWN,
+                    player=player,
+                    turns_remaining=self.turns_remaining,
+                )
+
+    def end_turn(self):
+        """
+        Pass the turn to the next player and count down the final round
+        once the deck is empty.
+        """
+        self.current_player_index = (
+            (self.current_player_index + 1) % len(self.players)
+        )
+        self.turns_played += 1
+
+        # If the amount of remaining turns is not None, we can assume
+        # the deck is empty and we are now in the final round.
+        if self.turns_remaining is not None:
+            self.turns_remaining -= 1
+
+    def emit(self, event, **details):
+        """
+        Notify the listeners subscribed to an event.
+
+        Callers on hot paths should check :attr:`listeners` first so no
+        work is done when nothing is listening.
+
+        Args:
+            event:
+                The event that occurred.
+            **details:
+                The details of the event passed to each listener.
+        """
+        for listener in self.listeners.get(event, ()):
+            listener(self, event, **details)
+
+    def give_hint(self, player, target=None, color=None, number=None):
+        """
+        Spend a hint on behalf of a player.
+
+        If a target is given, the hint tells them which of their cards
+        have the given color or number, and which do not. Otherwise the
+        hint is only simulated and nobody learns anything.
+
+        Args:
+            player:
+                The player giving the hint.
+            target:
+                The player receiving the hint.
+            color:
+                The color being hinted, for a color hint.
+            number:
+                The number being hinted, for a number hint.
+
+        Returns:
+            A list of the indices of the target's cards that the hint
+            applies to, or ``None`` for a simulated hint.
+        """
+        card_indices = None
+
+        if target is not None:
+            if target is player:
+                raise ValueError('Players may not give hints to themselves.')
+
+            mask = knowledge.hint_mask(color=color, number=number)
+            hand = self.player_hands[target]
+            card_indices = [
+                index for index, card in enumerate(hand)
+                if knowledge.card_mask(card) & mask
+            ]
+
+            if not card_indices:
+                raise ValueError('A hint must apply to at least one card.')
+
+            hand_knowledge = self.hand_knowledge[target]
+            for index in range(len(hand)):
+                if index in card_indices:
+                    hand_knowledge[index] &= mask
+                else:
+                    hand_knowledge[index] &= ~mask
+
+        self.hints_remaining -= 1
+
+        if self.listeners:
+            self.emit(
+                events.Event.HINT_SPENT,
+                player=player,
+                target=target,
+                color=color,
+                number=number,
+                card_indices=card_indices,
             )
 
+        return card_indices
+
     @property
     def hints_remaining(self):
         """
@@ -186,21 +502,8 @@ class Game:
             )
 
         if hints > self.MAX_HINTS:
-            logger.info(
-                'Capping remaining hints to %d after attempting to set it to '
-                '%d',
-                self.MAX_HINTS,
-                hints,
-            )
-
             hints = self.MAX_HINTS
 
-        logger.debug(
-            'The number of available hints changed from %d to %d',
-            self._hints_remaining,
-            hints,
-        )
-
         self._hints_remaining = hints
 
     @property
@@ -212,10 +515,18 @@ class Game:
         """
         return (
             self.bombs >= self.MAX_BOMBS
-            or all(self.stacks[color] == 5 for color in cards.Colors)
+            or self.completed_stacks == len(cards.Colors)
             or self.deck.is_empty and self.turns_remaining == 0
         )
 
+    @property
+    def can_win(self):
+        """
+        Returns:
+            A boolean indicating if the game could still end in a win.
+        """
+        return self.max_score >= stats.WINNING_SCORE
+
     def is_card_useful(self, card):
         """
         Determine if a card is still useful.
@@ -225,21 +536,27 @@ class Game:
                 The card to determine the usefulness of.
 
         Returns:
-            A boolean indicating if the card is still useful.
+            A boolean indicating if the card is still useful. A card is
+            useful if it has not been played yet and none of the lower
+            numbers of its color have been entirely discarded.
         """
-        if card.number <= self.stacks[card.color]:
-            return False
+        color = card.color
+
+        return self.stacks[color] < card.number <= self.dead_from[color]
 
-        discarded_counts = collections.defaultdict(int)
-        for discard in self.discards:
-            if discard.color == card.color:
-                discarded_counts[discard.number] += 1
+    def is_critical(self, card):
+        """
+        Determine if a card is critical.
 
-        for i in range(card.number - 1, 0, -1):
-            if discarded_counts[i] == cards.Deck.CARD_COUNT_MAP[i]:
-                return False
+        Args:
+            card:
+                The card to check.
 
-        return True
+        Returns:
+            A boolean indicating if the card is still useful and is the
+            last remaining copy of that card.
+        """
+        return card in self.critical_cards
 
     def is_playable(self, card):
         """
@@ -271,27 +588,136 @@ class Game:
         """
         return 0 <= card_index < len(self.player_hands[player])
 
-    def play(self):
+    def legal_moves(self):
         """
-        Start the game and prompt each player for their move until the
-        game is finished.
+        Returns:
+            A list of the moves available to the current player. While
+            hints remain, this includes a simulated hint and every hint
+            that applies to at least one of another player's cards.
         """
-        player_index = 0
+        hand = self.player_hands[self.players[self.current_player_index]]
 
-        while not self.is_finished:
-            self.players[player_index].get_move()
+        moves = [Move(MoveType.PLAY, index) for index in range(len(hand))]
+        moves += [Move(MoveType.DISCARD, index) for index in range(len(hand))]
+
+        if self.hints_remaining > 0:
+            moves.append(Move(MoveType.HINT, None))
+
+            for target, other in enumerate(self.players):
+                if target == self.current_player_index:
+                    continue
+
+                other_hand = self.player_hands[other]
+                colors = {card.color for card in other_hand}
+                numbers = {card.number for card in other_hand}
+
+                moves += [
+                    Move(MoveType.HINT, None, target, color=color)
+                    for color in cards.Colors
+                    if color in colors
+                ]
+                moves += [
+                    Move(MoveType.HINT, None, target, number=number)
+                    for number in sorted(numbers)
+                ]
 
-            player_index = (player_index + 1) % len(self.players)
+        return moves
 
-            # If the amount of remaining turns is not None, we can
-            # assume the deck is empty and we are now in the final
-            # round.
-            if self.turns_remaining is not None:
-                self.turns_remaining -= 1
+    def make_move(self, move):
+        """
+        Make a move for the current player and end their turn, recording
+        what is needed to undo it with :meth:`unmake_move`.
 
-                logger.debug('%d turn(s) remaining.', self.turns_remaining)
+        Args:
+            move:
+                The :class:`Move` to make.
+        """
+        player = self.players[self.current_player_index]
+        hand = self.player_hands[player]
+        card = None
+        card_knowledge = None
+        if move.card_index is not None:
+            card = hand[move.card_index]
+            card_knowledge = self.hand_knowledge[player][move.card_index]
+        elif move.target is not None:
+            # A real hint changes what the target knows about every card
+            # in their hand, so all of it is kept.
+            card_knowledge = list(
+                self.hand_knowledge[self.players[move.target]]
+            )
 
-        logger.info('The game is complete.')
+        deck_size = len(self.deck.cards)
+        record = _UndoRecord(
+            move=move,
+            card=card,
+            was_played=move.type == MoveType.PLAY and self.is_playable(card),
+            card_knowledge=card_knowledge,
+            drew=None,
+            hints=self._hints_remaining,
+            bombs=self.bombs,
+            turns_remaining=self.turns_remaining,
+            current_player=self.current_player_index,
+            last_draw_turn=self.last_draw_turn,
+        )
+
+        self.apply_move(move)
+        self.end_turn()
+
+        self._undo_stack.append(
+            record._replace(drew=len(self.deck.cards) < deck_size)
+        )
+
+    @property
+    def max_score(self):
+        """
+        Get an upper bound on the final score. The bound never increases
+        as the game goes on, and it is equal to the score once the game
+        is finished.
+
+        The bound counts the cards that can still be played, which stop
+        at the first card of each color with every copy discarded. It is
+        also limited by the number of turns left, since at most one card
+        is played each turn. Every turn that plays a card draws another
+        until the deck runs out, after which each player gets one more
+        turn.
+
+        Returns:
+            The highest score the game could end with.
+        """
+        if self.bombs >= self.MAX_BOMBS:
+            return self.score
+
+        plays = self._reachable_cards - self._cards_played
+
+        if self.turns_remaining is not None:
+            plays = min(plays, self.turns_remaining)
+        elif not self.deck.is_empty:
+            plays = min(plays, len(self.deck.cards) + len(self.players) - 1)
+
+        return self.score + plays
+
+    def play(self, win_only=False):
+        """
+        Start the game and prompt each player for their move until the
+        game is finished.
+
+        Args:
+            win_only:
+                A boolean indicating if only winning the game matters.
+                If it does, the game stops as soon as it can no longer
+                be won, and :attr:`max_score` is left as the best score
+                it could have ended with. A game stopped early is not
+                finished, so listeners are not told that it is over.
+        """
+        while not self.is_finished:
+            if win_only and not self.can_win:
+                return
+
+            self.players[self.current_player_index].get_move()
+            self.end_turn()
+
+        if self.listeners:
+            self.emit(events.Event.GAME_OVER, score=self.score)
 
     def play_card(self, player, card_index):
         """
@@ -311,70 +737,431 @@ class Game:
         """
         was_played = False
         card = self.player_hands[player].pop(card_index)
+        self.hand_knowledge[player].pop(card_index)
 
         if self.is_playable(card):
-            self.stacks[card.color] += 1
-
-            logger.info(
-                '%s played the %s increasing the score to %d',
-                player,
-                card,
-                self.score,
-            )
+            self.record_play(card)
 
             if card.number in self.HINT_GIVING_NUMBERS:
-                logger.info(
-                    'Giving an additional hint because a %d was played.',
-                    card.number,
-                )
                 self.hints_remaining += 1
 
             was_played = True
+            event = events.Event.CARD_PLAYED
         else:
-            logger.info(
-                '%s tried to play the %s which is not playable.', player, card
-            )
-            logger.debug(
-                'The %s is not playable on the stacks %s', card, self.stacks
-            )
             self.bombs += 1
+            self.record_discard(card)
 
-            self.discard_player_card(player, card, give_hint=False)
+            event = events.Event.BOMB
+
+        if self.listeners:
+            self.emit(event, player=player, card=card, card_index=card_index)
 
         self.draw_card(player)
 
         return was_played
 
+    def record_discard(self, card):
+        """
+        Add a card to the discard pile and update the state derived from
+        the discards.
+
+        Args:
+            card:
+                The card being discarded.
+        """
+        self.discards.append(card)
+        self.discard_counts[card.index] += 1
+
+        self._refresh_color(card.color)
+
+    def restore(self, state):
+        """
+        Put the game into the state described by a snapshot. The game
+        must have the same number of players as the snapshot.
+
+        Args:
+            state:
+                The :class:`GameState` to restore.
+        """
+        self.deck.cards = [cards.ALL_CARDS[index] for index in state.deck]
+
+        for player, hand, hand_knowledge in zip(
+                self.players, state.hands, state.knowledge
+        ):
+            self.player_hands[player] = [
+                cards.ALL_CARDS[index] for index in hand
+            ]
+            self.hand_knowledge[player] = list(hand_knowledge)
+
+        self.stacks = collections.defaultdict(int)
+        self.completed_stacks = 0
+        self._cards_played = 0
+        for color, height in zip(cards.Colors, state.stacks):
+            if height:
+                self.stacks[color] = height
+                self._cards_played += height
+
+            if height == cards.NUMBERS_PER_COLOR:
+                self.completed_stacks += 1
+
+        self.discards = [cards.ALL_CARDS[index] for index in state.discards]
+        self.discard_counts = [0] * len(cards.ALL_CARDS)
+        for card in self.discards:
+            self.discard_counts[card.index] += 1
+
+        for color in cards.Colors:
+            self._refresh_color(color)
+
+        self._hints_remaining = state.hints
+        self.bombs = state.bombs
+        self.turns_remaining = state.turns_remaining
+        self.current_player_index = state.current_player
+        self.turns_played = state.turns_played
+        self.last_draw_turn = state.last_draw_turn
+        self._undo_stack = []
+
+    def record_play(self, card):
+        """
+        Add a card to the top of its stack and update the state derived
+        from the stacks. The caller is responsible for ensuring that the
+        card is playable.
+
+        Args:
+            card:
+                The card being played.
+        """
+        self.stacks[card.color] = card.number
+        self._cards_played += 1
+
+        if card.number == cards.NUMBERS_PER_COLOR:
+            self.completed_stacks += 1
+
+        self._refresh_color(card.color)
+
     @property
     def score(self):
-        return sum(stack for stack in self.stacks.values()) - self.bombs
+        """
+        Returns:
+            The number of cards played minus the number of bombs that
+            were set off.
+        """
+        return self._cards_played - self.bombs
+
+    def snapshot(self):
+        """
+        Returns:
+            A :class:`GameState` describing the game without referencing
+            any of its players.
+        """
+        return GameState(
+            deck=tuple(card.index for card in self.deck.cards),
+            hands=tuple(
+                tuple(card.index for card in self.player_hands[player])
+                for player in self.players
+            ),
+            stacks=tuple(self.stacks.get(color, 0) for color in cards.Colors),
+            discards=tuple(card.index for card in self.discards),
+            hints=self._hints_remaining,
+            bombs=self.bombs,
+            turns_remaining=self.turns_remaining,
+            current_player=self.current_player_index,
+            knowledge=tuple(
+                tuple(self.hand_knowledge[player]) for player in self.players
+            ),
+            turns_played=self.turns_played,
+            last_draw_turn=self.last_draw_turn,
+        )
+
+    def subscribe(self, listener, subscribed_events=None):
+        """
+        Subscribe a listener to the game's events.
+
+        Args:
+            listener:
+                A callable that receives the game, the event, and the
+                event's details as keyword arguments.
+            subscribed_events:
+                An optional iterable of the events to subscribe to. If
+                this is not provided, the listener receives every event.
+        """
+        if subscribed_events is None:
+            subscribed_events = events.Event
+
+        for event in subscribed_events:
+            self.listeners.setdefault(event, []).append(listener)
+
+    def unmake_move(self):
+        """
+        Undo the last move made with :meth:`make_move`, restoring the
+        game to exactly the state it was in before. Listeners are not
+        notified of undone moves.
+        """
+        record = self._undo_stack.pop()
+        player = self.players[record.current_player]
+        hand = self.player_hands[player]
+        card = record.card
+
+        self.current_player_index = record.current_player
+        self.turns_played -= 1
+        self.last_draw_turn = record.last_draw_turn
+        self.turns_remaining = record.turns_remaining
+        self._hints_remaining = record.hints
+        self.bombs = record.bombs
+
+        if record.drew:
+            self.deck.cards.append(hand.pop())
+            self.hand_knowledge[player].pop()
+
+        if card is None:
+            if record.move.target is not None:
+                target = self.players[record.move.target]
+                self.hand_knowledge[target] = record.card_knowledge
+
+            return
+
+        if record.was_played:
+            self.stacks[card.color] = card.number - 1
+            self._cards_played -= 1
+
+            if card.number == cards.NUMBERS_PER_COLOR:
+                self.completed_stacks -= 1
+        else:
+            self.discards.pop()
+            self.discard_counts[card.index] -= 1
+
+        self._refresh_color(card.color)
+        hand.insert(record.move.card_index, card)
+        self.hand_knowledge[player].insert(
+            record.move.card_index, record.card_knowledge
+        )
+
+    def unsubscribe(self, listener):
+        """
+        Remove a listener from every event it is subscribed to.
+
+        Args:
+            listener:
+                The listener to remove.
+        """
+        for event, listeners in list(self.listeners.items()):
+            if listener in listeners:
+                listeners.remove(listener)
+
+            if not listeners:
+                del self.listeners[event]
 
 
 def main():
     """
     The entry-point into the game.
     """
-    scores = []
-    trials = 100_000
-    # trials = 10
+    import argparse
+    import logging
+    import random
+
+    from tqdm import tqdm
+
+    from hanabi import profiling, simulation
+
+    parser = argparse.ArgumentParser(
+        description='Simulate games of Hanabi played by AI players.'
+    )
+    parser.add_argument(
+        '--trials', default=100_000, type=int,
+        help='The maximum number of games to simulate.',
+    )
+    parser.add_argument(
+        '--players', default=4, type=int,
+        help='The number of players in each game.',
+    )
+    parser.add_argument(
+        '--player-class', default='GodPlayer',
+        help='The name of the player class in hanabi.players to use.',
+    )
+    parser.add_argument(
+        '--workers', default=1, type=int,
+        help='The number of worker processes to spread the games over.',
+    )
+    parser.add_argument(
+        '--chunk-size', default=simulation.DEFAULT_CHUNK_SIZE, type=int,
+        help='The number of games in each unit of work.',
+    )
+    parser.add_argument(
+        '--seed', default=None, type=int,
+        help='The seed for the run. A random seed is used if omitted.',
+    )
+    parser.add_argument(
+        '--precision', default=None, type=float,
+        help='Stop once the 95%% confidence interval for the chosen metric '
+             'has a half-width below this value.',
+    )
+    parser.add_argument(
+        '--metric', default='win_rate', choices=['mean', 'win_rate'],
+        help='The metric that the precision applies to.',
+    )
+    parser.add_argument(
+        '--min-trials', default=simulation.MIN_PRECISION_TRIALS, type=int,
+        help='The minimum number of games to play before the precision can '
+             'stop the run.',
+    )
+    parser.add_argument(
+        '--phases', action='store_true',
+        help='Report the time spent in each phase of the games.',
+    )
+    parser.add_argument(
+        '--cprofile', default=None, metavar='PATH',
+        help='Profile the run with cProfile and save the stats to a file.',
+    )
+    parser.add_argument(
+        '--collapsed', default=None, metavar='PATH',
+        help='Sample the call stack and save it as collapsed stacks for '
+             'building a flame graph.',
+    )
+    parser.add_argument(
+        '--deal-pool', action='store_true',
+        help='Shuffle every deal up front into memory shared with the '
+             'workers. The deals differ from those of an unpooled run.',
+    )
+    parser.add_argument(
+        '--results', default=None, metavar='PATH',
+        help='Append a record of every game to the result store in this '
+             'directory.',
+    )
+    parser.add_argument(
+        '--move-log', default=None, metavar='PATH',
+        help='Append the moves of every game to the move log at this path.',
+    )
+    parser.add_argument(
+        '--metrics-port', default=None, type=int, metavar='PORT',
+        help='Serve live metrics in the Prometheus text format on this '
+             'local port.',
+    )
+    parser.add_argument(
+        '--metrics-file', default=None, metavar='PATH',
+        help='Periodically write live metrics in the Prometheus text format '
+             'to this file.',
+    )
+    parser.add_argument(
+        '--win-only', action='store_true',
+        help='Stop each game as soon as it can no longer be won. The win '
+             'rate is exact, but scores are reported as upper bounds.',
+    )
+    args = parser.parse_args()
+
+    profiled = args.phases or args.cprofile or args.collapsed
+    if profiled and args.workers != 1:
+        parser.error('profiling is only supported with a single worker')
+
+    logged = args.results is not None or args.move_log is not None
+    if args.win_only and logged:
+        parser.error('games stopped early cannot be recorded')
+
+    if args.deal_pool and args.move_log is not None:
+        parser.error('games dealt from a pool cannot be logged')
+
+    if args.win_only and args.precision and args.metric == 'mean':
+        parser.error('only the win rate can be measured with --win-only')
+
+    logging.basicConfig(level=logging.WARNING)
+
+    seed = args.seed
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    deal_pool = None
+    if args.deal_pool:
+        from hanabi import deals
+
+        deal_pool = deals.DealPool.generate(args.trials, seed)
+
+    writer = None
+    if args.results is not None:
+        from hanabi import results
+
+        writer = results.ResultWriter(args.results)
+
+    move_log = None
+    if args.move_log is not None:
+        from hanabi import movelog
+
+        move_log = movelog.MoveLogWriter(args.move_log)
+
+    run_metrics = None
+    metrics_server = None
+    if args.metrics_port is not None or args.metrics_file is not None:
+        from hanabi import metrics
+
+        run_metrics = metrics.SimulationMetrics(args.metrics_file)
+
+        if args.metrics_port is not None:
+            metrics_server = metrics.MetricsServer(
+                run_metrics, args.metrics_port
+            )
+
+    with tqdm(total=args.trials) as progress_bar, profiling.profile(
+            args.phases, args.cprofile, args.collapsed
+    ) as timer:
+        result = simulation.run_trials(
+            args.trials,
+            player_class=getattr(players, args.player_class),
+            player_count=args.players,
+            workers=args.workers,
+            seed=seed,
+            chunk_size=args.chunk_size,
+            progress=progress_bar.update,
+            precision=args.precision,
+            metric=args.metric,
+            min_trials=args.min_trials,
+            writer=writer,
+            deals=deal_pool,
+            win_only=args.win_only,
+            move_log=move_log,
+            metrics=run_metrics,
+        )
 
-    start = time.time()
+    if writer is not None:
+        writer.close()
+
+    if move_log is not None:
+        move_log.close()
+
+    if run_metrics is not None:
+        run_metrics.close()
+
+    if metrics_server is not None:
+        metrics_server.close()
+
+    statistics = result.statistics
+    mean_error = statistics.half_width('mean')
+    win_error = statistics.half_width('win_rate') * 100
+
+    print(f'Ran {result.trials:,} trials in {result.elapsed:.2f} seconds.')
+    print(f'\tSeed: {seed}')
+    if args.win_only:
+        print(f'\tAverage score bound: {result.average_score:.2f}')
+    else:
+        print(
+            f'\tAverage score: {result.average_score:.2f} '
+            f'(±{mean_error:.2f})'
+        )
+    print(
+        f'\tWins: {result.wins:,} '
+        f'({result.win_percentage:.2f}% ±{win_error:.2f}%)'
+    )
 
-    for _ in tqdm(range(trials)):
-        game = Game([players.GodPlayer for _ in range(4)])
-        game.play()
+    for worker, throughput in sorted(result.worker_throughput().items()):
+        print(f'\tWorker {worker}: {throughput:,.0f} trials/second')
 
-        scores.append(game.score)
+    if timer is not None:
+        print('\nPhases:')
+        for line in timer.report(result.elapsed):
+            print(f'\t{line}')
 
-    end = time.time()
-    avg_score = float(sum(scores)) / len(scores)
-    score_counts = collections.Counter(scores)
-    wins = score_counts[25]
-    win_percentage = wins / float(trials) * 100
+    if args.cprofile is not None:
+        import pstats
 
-    print(f'Ran {trials:,} trials in {end - start:.2f} seconds.')
-    print(f'\tAverage score: {avg_score:.2f}')
-    print(f'\tWins: {wins:,} ({win_percentage:.2f}%)')
+        print()
+        pstats.Stats(args.cprofile).sort_stats('cumulative').print_stats(20)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,313 @@
+from hanabi import cards
+
+
+ALL_CARDS_MASK = (1 << len(cards.ALL_CARDS)) - 1
+"""
+A mask containing every card. This is what a player knows about a card
+they have not been given any hints about.
+"""
+
+COLOR_BITS = (1 << cards.NUMBERS_PER_COLOR) - 1
+"""
+The mask of the cards of the first color. Shifting it by the index of
+a color's first card gives the mask of that color.
+"""
+
+COLOR_MASKS = {
+    color: sum(1 << card.index for card in cards.ALL_CARDS
+               if card.color == color)
+    for color in cards.Colors
+}
+"""
+A map from each color to the mask containing the cards of that color.
+"""
+
+NUMBER_MASKS = {
+    number: sum(1 << card.index for card in cards.ALL_CARDS
+                if card.number == number)
+    for number in range(1, cards.NUMBERS_PER_COLOR + 1)
+}
+"""
+A map from each number to the mask containing the cards with that
+number.
+"""
+
+_HINT_MASKS = list(COLOR_MASKS.values()) + list(NUMBER_MASKS.values())
+"""
+The mask of the cards every possible hint is about.
+"""
+
+
+def card_mask(card):
+    """
+    Args:
+        card:
+            The card to get the mask of.
+
+    Returns:
+        A mask containing only the given card.
+    """
+    return 1 << card.index
+
+
+def hint_mask(color=None, number=None):
+    """
+    Get the mask of the cards touched by a hint.
+
+    Args:
+        color:
+            The color being hinted, if this is a color hint.
+        number:
+            The number being hinted, if this is a number hint.
+
+    Returns:
+        A mask containing every card the hint applies to.
+    """
+    if (color is None) == (number is None):
+        raise ValueError('A hint must be for exactly one color or number.')
+
+    if color is not None:
+        return COLOR_MASKS[color]
+
+    return NUMBER_MASKS[number]
+
+
+def mask_cards(mask):
+    """
+    Args:
+        mask:
+            The mask to list the cards of.
+
+    Returns:
+        A list of the cards in the mask, ordered by index.
+    """
+    return [card for card in cards.ALL_CARDS if mask >> card.index & 1]
+
+
+def is_hinted(mask):
+    """
+    Args:
+        mask:
+            What is known about a card.
+
+    Returns:
+        A boolean indicating if the card's color or number is known.
+        Every card a hint was about has this, as do cards ruled out of
+        every other color or number by hints about other cards.
+    """
+    return any(not mask & ~hint for hint in _HINT_MASKS)
+
+
+def is_single_card(mask):
+    """
+    Args:
+        mask:
+            The mask to check.
+
+    Returns:
+        A boolean indicating if the mask contains exactly one card.
+    """
+    return mask != 0 and mask & (mask - 1) == 0
+
+
+def _color_range_mask(color, low, high):
+    """
+    Get the mask of the cards of a color with numbers in a range.
+
+    Args:
+        color:
+            The color of the cards.
+        low:
+            The lowest number to include.
+        high:
+            The highest number to include.
+
+    Returns:
+        A mask containing the cards.
+    """
+    high = min(high, cards.NUMBERS_PER_COLOR)
+
+    return sum(
+        card_mask(cards.Card(color, number))
+        for number in range(max(low, 1), high + 1)
+    )
+
+
+NEXT_CARD_MASKS = [
+    [
+        _color_range_mask(color, stack + 1, stack + 1)
+        for stack in range(cards.NUMBERS_PER_COLOR + 1)
+    ]
+    for color in cards.Colors
+]
+"""
+The masks of the playable card of each color, indexed by the color's
+position in :class:`hanabi.cards.Colors` and then by the height of its
+stack.
+"""
+
+PLAYED_MASKS = [
+    [
+        _color_range_mask(color, 1, stack)
+        for stack in range(cards.NUMBERS_PER_COLOR + 1)
+    ]
+    for color in cards.Colors
+]
+"""
+The masks of the played cards of each color, indexed like
+:data:`NEXT_CARD_MASKS`.
+"""
+
+USEFUL_MASKS = [
+    [
+        [
+            _color_range_mask(color, stack + 1, dead_from)
+            for dead_from in range(cards.NUMBERS_PER_COLOR + 2)
+        ]
+        for stack in range(cards.NUMBERS_PER_COLOR + 1)
+    ]
+    for color in cards.Colors
+]
+"""
+The masks of the useful cards of each color, indexed like
+:data:`NEXT_CARD_MASKS` and then by the number the color is dead from.
+"""
+
+
+class PublicView:
+    """
+    The cards that are visible to everyone in a game, used to infer
+    what each player could be holding.
+
+    A view is only valid until the game changes, so it should be created
+    again for every move.
+    """
+
+    def __init__(self, game):
+        """
+        Create a view of a game.
+
+        Args:
+            game:
+                The game to view.
+        """
+        self.game = game
+        self.playable = game.playable_mask
+        self.useful = game.useful_mask
+
+        # The number of copies of each card that are played, discarded,
+        # or in anyone's hand. Each player sees all of these except the
+        # cards in their own hand.
+        self.counts = list(game.discard_counts)
+        for hand in game.player_hands.values():
+            for card in hand:
+                self.counts[card.index] += 1
+
+        played = game.played_mask
+        self.exhausted = 0
+        for card in cards.ALL_CARDS:
+            index = card.index
+            self.counts[index] += played >> index & 1
+
+            if self.counts[index] >= card.copies:
+                self.exhausted |= 1 << index
+
+    def possibilities(self, player):
+        """
+        Infer what each card in a player's hand could be, using the
+        hints they were given and everything they can see.
+
+        A card is ruled out once every copy of it is accounted for by
+        the visible cards or by other cards in the player's hand whose
+        identity is already known. This is repeated until nothing else
+        can be ruled out.
+
+        Args:
+            player:
+                The player whose hand is inferred.
+
+        Returns:
+            A list containing a mask of the possible cards for each card
+            in the player's hand.
+        """
+        hand = self.game.player_hands[player]
+
+        # The player can't see their own cards, so the copies in their
+        # hand don't count towards what they have seen.
+        seen = self.counts.copy()
+        exhausted = self.exhausted
+        for card in hand:
+            seen[card.index] -= 1
+
+        for card in hand:
+            if seen[card.index] < card.copies:
+                exhausted &= ~(1 << card.index)
+
+        masks = [
+            mask & ~exhausted for mask in self.game.hand_knowledge[player]
+        ]
+
+        changed = any(is_single_card(mask) for mask in masks)
+        while changed:
+            changed = False
+
+            for known in masks:
+                if not is_single_card(known):
+                    continue
+
+                index = known.bit_length() - 1
+                holders = [i for i, mask in enumerate(masks) if mask == known]
+
+                # Once the visible copies and the copies known to be in
+                # the hand use up every copy, no other card can be this
+                # one.
+                if seen[index] + len(holders) < cards.ALL_CARDS[index].copies:
+                    continue
+
+                for i, mask in enumerate(masks):
+                    if i not in holders and mask & known:
+                        masks[i] = mask & ~known
+                        changed = True
+
+        return masks
+
+    def unseen(self, player):
+        """
+        List the cards a player cannot see. These are the cards in
+        their own hand and in the deck.
+
+        Args:
+            player:
+                The player whose view is used.
+
+        Returns:
+            A list of the indices of the unseen cards, with an entry for
+            each copy.
+        """
+        seen = self.counts.copy()
+        for card in self.game.player_hands[player]:
+            seen[card.index] -= 1
+
+        return [
+            card.index
+            for card in cards.ALL_CARDS
+            for _ in range(card.copies - seen[card.index])
+        ]
+
+
+def possibilities(game, player):
+    """
+    Infer what each card in a player's hand could be. See
+    :meth:`PublicView.possibilities`.
+
+    Args:
+        game:
+            The game the player is in.
+        player:
+            The player whose hand is inferred.
+
+    Returns:
+        A list containing a mask of the possible cards for each card in
+        the player's hand.
+    """
+    return PublicView(game).possibilities(player)
@@ -0,0 +1,278 @@
+import collections
+import http.server
+import os
+import threading
+import time
+
+from hanabi import stats
+
+
+DEFAULT_HOST = '127.0.0.1'
+"""
+The address the metrics server listens on by default. Only local
+clients, such as a Prometheus agent on the same machine, can connect.
+"""
+
+DEFAULT_INTERVAL = 5.0
+"""
+The minimum number of seconds between rewrites of a metrics file.
+"""
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+"""
+The content type of the Prometheus text exposition format.
+"""
+
+PREFIX = 'hanabi_'
+"""
+The prefix of every metric's name.
+"""
+
+
+def resident_memory(pid=None):
+    """
+    Get the resident set size of a process.
+
+    Args:
+        pid:
+            The process ID. Defaults to the current process.
+
+    Returns:
+        The number of bytes of the process's memory that are resident,
+        or ``None`` if it can't be read, such as on platforms without
+        ``/proc``.
+    """
+    if pid is None:
+        pid = os.getpid()
+
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+
+    return pages * os.sysconf('SC_PAGE_SIZE')
+
+
+class SimulationMetrics:
+    """
+    Live metrics for a long simulation run, in the Prometheus text
+    format.
+
+    The counts are only updated when a chunk of games completes, so
+    the games themselves are never slowed down. A :class:`MetricsServer`
+    renders the metrics again for each scrape, so the rates and memory
+    are current even between chunks.
+    """
+
+    def __init__(self, path=None, interval=DEFAULT_INTERVAL):
+        """
+        Create metrics with no games played.
+
+        Args:
+            path:
+                An optional file that the metrics are written to, for
+                collectors that read files rather than scraping an
+                endpoint. The file is replaced as a whole, so it never
+                holds a partial update.
+            interval:
+                The minimum number of seconds between writes of the
+                file.
+        """
+        self.path = path
+        self.interval = interval
+
+        self.start = time.perf_counter()
+        self.statistics = stats.ScoreStatistics()
+        self.turns = 0
+        self.worker_stats = collections.defaultdict(lambda: [0, 0, 0.0])
+
+        # Held while the counts are updated or read, since they are
+        # rendered from the server's thread.
+        self._lock = threading.Lock()
+
+        self._written = None
+
+    def add_chunk(self, chunk_result):
+        """
+        Count the games of a completed chunk, and write the metrics file
+        if it is due.
+
+        Args:
+            chunk_result:
+                A :class:`hanabi.simulation.ChunkResult`.
+        """
+        with self._lock:
+            self.statistics.merge(chunk_result.statistics)
+            self.turns += chunk_result.turns
+
+            worker_stats = self.worker_stats[chunk_result.worker]
+            worker_stats[0] += chunk_result.statistics.count
+            worker_stats[1] += chunk_result.turns
+            worker_stats[2] += chunk_result.elapsed
+
+        if self.path is not None:
+            now = time.perf_counter()
+
+            if self._written is None or now - self._written >= self.interval:
+                self.write()
+                self._written = now
+
+    def render(self):
+        """
+        Returns:
+            The metrics in the Prometheus text format.
+        """
+        with self._lock:
+            elapsed = time.perf_counter() - self.start
+            games = self.statistics.count
+            turns = self.turns
+            mean_score = self.statistics.mean if games else 0.0
+            win_rate = self.statistics.win_rate if games else 0.0
+            workers = sorted(
+                (worker, tuple(worker_stats))
+                for worker, worker_stats in self.worker_stats.items()
+            )
+
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append(f'# HELP {PREFIX}{name} {description}')
+            lines.append(f'# TYPE {PREFIX}{name} {kind}')
+
+            for labels, value in samples:
+                lines.append(f'{PREFIX}{name}{labels} {value}')
+
+        def rate(count, seconds):
+            return count / seconds if seconds else 0.0
+
+        metric('games_total', 'counter', 'Games played.', [('', games)])
+        metric(
+            'turns_total', 'counter', 'Turns played.', [('', turns)]
+        )
+        metric(
+            'games_per_second', 'gauge',
+            'Games played per second since the run started.',
+            [('', rate(games, elapsed))],
+        )
+        metric(
+            'turns_per_second', 'gauge',
+            'Turns played per second since the run started.',
+            [('', rate(turns, elapsed))],
+        )
+        metric(
+            'mean_score', 'gauge', 'The mean score of the games played.',
+            [('', mean_score)],
+        )
+        metric(
+            'win_rate', 'gauge', 'The fraction of the games that were won.',
+            [('', win_rate)],
+        )
+
+        metric(
+            'worker_games_per_second', 'gauge',
+            'Games played per second of work by each worker.',
+            [
+                (f'{{worker="{worker}"}}', rate(trials, seconds))
+                for worker, (trials, _, seconds) in workers
+            ],
+        )
+        metric(
+            'worker_turns_per_second', 'gauge',
+            'Turns played per second of work by each worker.',
+            [
+                (f'{{worker="{worker}"}}', rate(turns, seconds))
+                for worker, (_, turns, seconds) in workers
+            ],
+        )
+
+        memory = [('', resident_memory())]
+        memory.extend(
+            (f'{{worker="{worker}"}}', resident_memory(worker))
+            for worker, _ in workers
+            if worker != os.getpid()
+        )
+        metric(
+            'resident_memory_bytes', 'gauge',
+            'The resident memory of the main process and each worker.',
+            [sample for sample in memory if sample[1] is not None],
+        )
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """
+        Write the current metrics to the metrics file.
+        """
+        text = self.render()
+
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            f.write(text)
+
+        os.replace(temporary, self.path)
+
+    def close(self):
+        """
+        Write the final metrics to the metrics file, if there is one.
+        Workers that have already exited are left out of the memory.
+        """
+        if self.path is not None:
+            self.write()
+
+
+class MetricsServer:
+    """
+    Serves metrics over HTTP from a background thread, so they can be
+    scraped by Prometheus while a run is in progress.
+    """
+
+    def __init__(self, metrics, port, host=DEFAULT_HOST):
+        """
+        Start serving metrics.
+
+        Args:
+            metrics:
+                The :class:`SimulationMetrics` to serve.
+            port:
+                The port to listen on. If this is 0, a free port is
+                chosen and stored in :attr:`port`.
+            host:
+                The address to listen on.
+        """
+        class Handler(http.server.BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                body = metrics.render().encode()
+
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Scrapes are frequent, so they aren't logged.
+                pass
+
+        self.server = http.server.HTTPServer((host, port), Handler)
+        self.port = self.server.server_address[1]
+
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stop serving metrics.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join()
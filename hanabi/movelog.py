@@ -0,0 +1,400 @@
+import collections
+import mmap
+import pathlib
+import struct
+
+from hanabi import cards, events, players
+from hanabi.game import Game, Move, MoveType
+
+
+MAGIC = b'HNBL'
+"""
+The bytes every move log starts with.
+"""
+
+VERSION = 1
+"""
+The version of the format written by :class:`MoveLogWriter`. Logs
+written with other versions are rejected when read.
+"""
+
+PLAY = 0
+"""
+The kind of move that plays the card at its value's index.
+"""
+
+DISCARD = 1
+"""
+The kind of move that discards the card at its value's index.
+"""
+
+COLOR_HINT = 2
+"""
+The kind of move that hints the color at its value's index in
+:class:`hanabi.cards.Colors`, or gives a simulated hint if the target is
+:data:`SIMULATED`.
+"""
+
+NUMBER_HINT = 3
+"""
+The kind of move that hints the number one greater than its value.
+"""
+
+SIMULATED = 7
+"""
+The target of a simulated hint, which nobody receives.
+"""
+
+MOVE_EVENTS = (
+    events.Event.BOMB,
+    events.Event.CARD_PLAYED,
+    events.Event.DISCARD,
+    events.Event.HINT_SPENT,
+)
+"""
+The events that describe the moves of a game.
+"""
+
+_HEADER = MAGIC + bytes([VERSION])
+
+_COLORS = list(cards.Colors)
+
+_ENTRY = struct.Struct('<QBbH')
+"""
+The fixed-size start of each game in a log: the seed, the number of
+players, the final score, and the number of moves.
+"""
+
+
+GameLog = collections.namedtuple(
+    'GameLog', ['seed', 'player_count', 'score', 'moves']
+)
+"""
+A game read from a move log. The moves are a bytes object with one
+packed move per turn. See :func:`encode_move`.
+"""
+
+
+def encode_move(kind, target=0, value=0):
+    """
+    Pack a move into a single byte. The kind takes the top two bits,
+    the target the next three, and the value the last three.
+
+    Args:
+        kind:
+            The kind of move, such as :data:`PLAY`.
+        target:
+            The index of the player receiving a hint, or
+            :data:`SIMULATED`. This is 0 for plays and discards.
+        value:
+            The index of the card played or discarded, or the hinted
+            color or number.
+
+    Returns:
+        The packed move.
+    """
+    if not 0 <= target <= 7 or not 0 <= value <= 7:
+        raise ValueError(
+            f'Received a move that does not fit in a byte: target {target}, '
+            f'value {value}.'
+        )
+
+    return kind << 6 | target << 3 | value
+
+
+def decode_move(move):
+    """
+    Unpack a move packed with :func:`encode_move`.
+
+    Args:
+        move:
+            The packed move.
+
+    Returns:
+        A tuple containing the kind of move, the target, and the value.
+    """
+    return move >> 6, move >> 3 & 7, move & 7
+
+
+class MoveRecorder:
+    """
+    A listener that packs each move of a game into a byte, so games can
+    be recorded cheaply enough to leave recording on for every game.
+    """
+
+    def __init__(self):
+        """
+        Create a new recorder with no recorded moves.
+        """
+        self.moves = bytearray()
+
+    def __call__(self, game, event, **details):
+        """
+        Record a move.
+
+        Args:
+            game:
+                The game the move was made in.
+            event:
+                One of the :data:`MOVE_EVENTS`.
+            **details:
+                The details of the event.
+        """
+        if event == events.Event.HINT_SPENT:
+            target = details['target']
+
+            if target is None:
+                move = encode_move(COLOR_HINT, SIMULATED)
+            elif details['color'] is not None:
+                move = encode_move(
+                    COLOR_HINT,
+                    target.player_index,
+                    cards.COLOR_INDICES[details['color']],
+                )
+            else:
+                move = encode_move(
+                    NUMBER_HINT, target.player_index, details['number'] - 1
+                )
+        else:
+            card_index = details['card_index']
+            if card_index is None:
+                raise ValueError(
+                    'Only discards made by index can be recorded.'
+                )
+
+            kind = DISCARD if event == events.Event.DISCARD else PLAY
+            move = encode_move(kind, value=card_index)
+
+        self.moves.append(move)
+
+    @classmethod
+    def attach(cls, game):
+        """
+        Create a recorder and subscribe it to a game's moves.
+
+        Args:
+            game:
+                The game to record.
+
+        Returns:
+            The new recorder.
+        """
+        recorder = cls()
+        game.subscribe(recorder, MOVE_EVENTS)
+
+        return recorder
+
+
+def encode_game(seed, player_count, score, moves):
+    """
+    Encode a game as an entry of a move log.
+
+    Args:
+        seed:
+            The seed the game's deck was shuffled with.
+        player_count:
+            The number of players.
+        score:
+            The final score.
+        moves:
+            The packed moves, such as those of a :class:`MoveRecorder`.
+
+    Returns:
+        The encoded game.
+    """
+    return _ENTRY.pack(seed, player_count, score, len(moves)) + moves
+
+
+def apply_move(game, move):
+    """
+    Make a packed move on behalf of the current player and end their
+    turn.
+
+    Args:
+        game:
+            The game to make the move in.
+        move:
+            The packed move.
+    """
+    kind, target, value = decode_move(move)
+
+    if kind == PLAY:
+        decoded = Move(MoveType.PLAY, value)
+    elif kind == DISCARD:
+        decoded = Move(MoveType.DISCARD, value)
+    elif target == SIMULATED:
+        decoded = Move(MoveType.HINT, None)
+    elif kind == COLOR_HINT:
+        decoded = Move(MoveType.HINT, None, target, color=_COLORS[value])
+    else:
+        decoded = Move(MoveType.HINT, None, target, number=value + 1)
+
+    game.apply_move(decoded)
+    game.end_turn()
+
+
+def replay(entry, turn=None, game_class=Game, player_classes=None):
+    """
+    Rebuild a logged game by dealing its deck again and making its
+    moves. No player logic runs, so this is much faster than playing
+    the game.
+
+    Args:
+        entry:
+            The :class:`GameLog` of the game.
+        turn:
+            The number of moves to make. Defaults to every move, which
+            gives the state the game ended in.
+        game_class:
+            The class of the game, which must have the same rules as the
+            game that was logged.
+        player_classes:
+            The classes of the players to seat in the game. Defaults to
+            :class:`hanabi.players.BasePlayer` for every seat.
+
+    Returns:
+        The game in its state after the given number of moves.
+    """
+    if player_classes is None:
+        player_classes = [players.BasePlayer] * entry.player_count
+
+    game = game_class(player_classes, rng=entry.seed)
+    for move in entry.moves[:turn]:
+        apply_move(game, move)
+
+    return game
+
+
+def read_log(path):
+    """
+    Stream the games in a move log. The log is memory-mapped, so logs
+    of any size can be read. A game that was only partly written when a
+    writer was interrupted is skipped.
+
+    Args:
+        path:
+            The path of the log.
+
+    Returns:
+        An iterator over the :class:`GameLog` of each game, in the order
+        they were written.
+
+    Raises:
+        ValueError:
+            If the file isn't a move log written with the current
+            version of the format.
+    """
+    with open(path, 'rb') as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as data:
+        _check_header(data, path)
+
+        for _, entry in _entries(data):
+            yield entry
+
+
+class MoveLogWriter:
+    """
+    Appends games to a move log.
+    """
+
+    def __init__(self, path):
+        """
+        Open a log for appending, creating it if it doesn't exist. If a
+        previous writer was interrupted part way through writing a game,
+        the log is truncated back to the last complete game.
+
+        Args:
+            path:
+                The path of the log.
+        """
+        path = pathlib.Path(path)
+
+        length = None
+        if path.exists() and path.stat().st_size:
+            with open(path, 'rb') as f, mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                _check_header(data, path)
+
+                length = len(_HEADER)
+                for length, _ in _entries(data):
+                    pass
+
+        self._file = open(path, 'ab')
+
+        if length is None:
+            self._file.write(_HEADER)
+        else:
+            self._file.truncate(length)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, seed, player_count, score, moves):
+        """
+        Add a single game. See :func:`encode_game`.
+        """
+        self.write(encode_game(seed, player_count, score, moves))
+
+    def write(self, data):
+        """
+        Add games that were already encoded, such as a chunk of games
+        encoded with :func:`encode_game` in a worker process.
+
+        Args:
+            data:
+                The encoded games.
+        """
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self):
+        """
+        Close the log.
+        """
+        self._file.close()
+
+
+def _check_header(data, path):
+    """
+    Make sure a log uses the current format.
+
+    Raises:
+        ValueError:
+            If the log's format is different.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'{path} is not a move log.')
+
+    if data[:len(_HEADER)] != _HEADER:
+        raise ValueError(f'The move log at {path} uses a different format.')
+
+
+def _entries(data):
+    """
+    Iterate over the complete games in a log.
+
+    Returns:
+        An iterator over tuples containing the offset just past each
+        game and its :class:`GameLog`.
+    """
+    offset = len(_HEADER)
+    size = len(data)
+
+    while offset + _ENTRY.size <= size:
+        seed, player_count, score, move_count = _ENTRY.unpack_from(
+            data, offset
+        )
+        start = offset + _ENTRY.size
+        offset = start + move_count
+
+        if offset > size:
+            return
+
+        yield offset, GameLog(
+            seed, player_count, score, data[start:offset]
+        )
@@ -1,11 +1,26 @@
 import collections
-import logging
+import copyreg
+import random
+import time
 
-from cards import Deck
-from hanabi.renderers.console import ConsoleRenderer
+from hanabi import knowledge, policy
 
 
-logger = logging.getLogger(__name__)
+def _log(message, *args):
+    """
+    Log a message about a player's decision. The logging module is only
+    imported the first time a message is logged, since most moves are
+    made without logging anything.
+
+    Args:
+        message:
+            The message's format string.
+        *args:
+            The arguments for the format string.
+    """
+    import logging
+
+    logging.getLogger(__name__).info(message, *args)
 
 
 class BasePlayer:
@@ -44,6 +59,21 @@ class BasePlayer:
         """
         self.game.discard_player_card_by_index(self, card_index)
 
+    def give_hint(self, target=None, color=None, number=None):
+        """
+        Give a hint to another player.
+
+        Args:
+            target:
+                The player receiving the hint. If this is not provided,
+                the hint is only simulated.
+            color:
+                The color being hinted, for a color hint.
+            number:
+                The number being hinted, for a number hint.
+        """
+        self.game.give_hint(self, target=target, color=color, number=number)
+
     def play(self, card_index):
         """
         Play the card at the given index.
@@ -74,6 +104,8 @@ class ConsolePlayer(BasePlayer):
         """
         super().__init__(*args, **kwargs)
 
+        from hanabi.renderers.console import ConsoleRenderer
+
         self.renderer = ConsoleRenderer.for_game(self.game)
 
     @staticmethod
@@ -165,7 +197,7 @@ class GodPlayer(BasePlayer):
         # If the game is about to end, attempt to prolong it by giving a
         # hint.
         if len(self.game.deck.cards) == 1 and self.game.hints_remaining > 0:
-            self.game.hints_remaining -= 1
+            self.give_hint()
 
             return
 
@@ -182,17 +214,538 @@ class GodPlayer(BasePlayer):
         # are useless to an omniscient AI, we just simulate using the
         # hint here.
         if self.game.hints_remaining > 0:
-            self.game.hints_remaining -= 1
+            self.give_hint()
 
             return
 
-        logger.info('%s has no useless cards so discarding first card.', self)
+        _log('%s has no useless cards so discarding first card.', self)
 
         # The last heuristic we can apply is to sort cards by descending
         # rarity. This decreases the odds that we toss out the only 5
         # for example.
-        unplayable_indices.sort(
-            key=lambda i: Deck.CARD_COUNT_MAP[cards[i].number], reverse=True
-        )
+        unplayable_indices.sort(key=lambda i: cards[i].copies, reverse=True)
 
         self.discard(unplayable_indices[0])
+
+
+class CompiledGodPlayer(BasePlayer):
+    """
+    A player who makes exactly the same moves as :class:`GodPlayer`, but
+    looks each one up in a decision table instead of working it out.
+
+    Every card in the hand is reduced to a code describing it relative
+    to the stacks, and the codes are combined with whether hints are
+    left and whether the deck has one card left. See
+    :func:`hanabi.policy.god_key`.
+    """
+
+    table = policy.GOD_TABLE
+    """
+    The :class:`hanabi.policy.PolicyTable` the moves are looked up in.
+    """
+
+    def get_move(self):
+        """
+        Make the move :class:`GodPlayer` would make.
+        """
+        game = self.game
+        kind, index = self.table.lookup(
+            policy.god_key(game, game.player_hands[self])
+        )
+
+        if kind == policy.PLAY:
+            game.play_card(self, index)
+        elif kind == policy.DISCARD:
+            game.discard_player_card_by_index(self, index)
+        else:
+            game.give_hint(self)
+
+
+class HintPlayer(BasePlayer):
+    """
+    A player who cannot see their own hand and only knows what they can
+    infer from hints and the other cards in the game.
+    """
+
+    def get_move(self):
+        """
+        Play a card known to be playable. Otherwise, hint a playable card
+        to the next player who holds one, or discard a card known to be
+        useless. Failing all of those, discard the card least likely to
+        be useful, preferring the oldest, out of the cards whose color
+        and number are both unknown, or out of the whole hand if every
+        card's color or number is known.
+        """
+        game = self.game
+        view = knowledge.PublicView(game)
+        possible = view.possibilities(self)
+        playable = view.playable
+
+        for index, mask in enumerate(possible):
+            if not mask & ~playable:
+                self.play(index)
+
+                return
+
+        if game.hints_remaining > 0:
+            hint = self._find_hint(view)
+
+            if hint is not None:
+                self.give_hint(**hint)
+
+                return
+
+        for index, mask in enumerate(possible):
+            if not mask & view.useful:
+                self.discard(index)
+
+                return
+
+        def useful_share(index):
+            mask = possible[index]
+
+            return bin(mask & view.useful).count('1') / bin(mask).count('1')
+
+        # A card whose color or number is known was most likely hinted
+        # because it matters, so those are only discarded once every
+        # card in the hand is one.
+        unhinted = [
+            index for index, mask in enumerate(game.hand_knowledge[self])
+            if not knowledge.is_hinted(mask)
+        ]
+
+        self.discard(min(unhinted or range(len(possible)), key=useful_share))
+
+    def _find_hint(self, view):
+        """
+        Find a hint that tells another player that one of their cards
+        is playable, or failing that, one that narrows down what a
+        playable card could be.
+
+        Args:
+            view:
+                The :class:`hanabi.knowledge.PublicView` of the game.
+
+        Returns:
+            The keyword arguments for :meth:`give_hint`, or ``None`` if
+            no such hint exists. Players are checked in turn order
+            starting with the next player.
+        """
+        game = self.game
+        count = len(game.players)
+        playable = view.playable
+        fallback = None
+
+        for offset in range(1, count):
+            target = game.players[(self.player_index + offset) % count]
+            hand = game.player_hands[target]
+            possible = view.possibilities(target)
+
+            for card, mask in zip(hand, possible):
+                if not knowledge.card_mask(card) & playable:
+                    continue
+
+                # Skip players who already know they can play a card.
+                if not mask & ~playable:
+                    break
+
+                for hint in ({'number': card.number}, {'color': card.color}):
+                    hinted = mask & knowledge.hint_mask(**hint)
+
+                    if not hinted & ~playable:
+                        return dict(hint, target=target)
+
+                    # Otherwise remember the first hint that narrows down
+                    # a playable card, so a second hint can finish the
+                    # job later.
+                    if fallback is None and hinted != mask:
+                        fallback = dict(hint, target=target)
+
+        return fallback
+
+
+MAX_SAMPLE_ATTEMPTS = 1_000
+"""
+The number of times to try sampling a hand consistent with a player's
+knowledge before giving up.
+"""
+
+
+def sample_hand(masks, unseen, rng):
+    """
+    Sample cards for a hand that are consistent with what is known
+    about each card. The unseen cards that are left over form the deck.
+
+    Args:
+        masks:
+            The mask of possible cards for each card in the hand.
+        unseen:
+            The indices of the cards that could be in the hand or the
+            deck, with an entry for each copy.
+        rng:
+            The random number generator to sample with.
+
+    Returns:
+        A tuple containing the card indices for the hand and a shuffled
+        list of the card indices left for the deck.
+    """
+    # Filling the most constrained cards first makes it much less likely
+    # that a sample runs out of candidates.
+    order = sorted(range(len(masks)), key=lambda i: bin(masks[i]).count('1'))
+
+    for _ in range(MAX_SAMPLE_ATTEMPTS):
+        pool = list(unseen)
+        rng.shuffle(pool)
+        hand = [None] * len(masks)
+
+        for slot in order:
+            for position, index in enumerate(pool):
+                if masks[slot] >> index & 1:
+                    hand[slot] = pool.pop(position)
+
+                    break
+            else:
+                break
+        else:
+            return hand, pool
+
+    raise ValueError('No hand is consistent with the given knowledge.')
+
+
+RolloutTask = collections.namedtuple(
+    'RolloutTask',
+    [
+        'state',
+        'seat',
+        'masks',
+        'unseen',
+        'moves',
+        'rollout_class',
+        'game_class',
+        'samples',
+        'seed',
+        'deadline',
+    ],
+)
+"""
+A batch of rollouts for :func:`run_rollouts`. The state is a
+:class:`hanabi.game.GameState` with the seat's hand and the deck left
+empty, since the player making the move can't see them.
+The rollouts are played in games of the game class, so that they follow
+the same rules as the real game.
+"""
+
+
+def run_rollouts(task):
+    """
+    Evaluate moves by sampling the unseen cards and playing out the rest
+    of the game after each move. Every move is evaluated on the same
+    samples.
+
+    Args:
+        task:
+            The :class:`RolloutTask` to run.
+
+    Returns:
+        A tuple containing the total final score for each move and the
+        number of samples taken. At least one sample is always taken,
+        even if the deadline has passed.
+    """
+    rng = random.Random(task.seed)
+    totals = [0] * len(task.moves)
+    samples = 0
+    game = None
+
+    while samples < task.samples and (
+            samples == 0
+            or task.deadline is None
+            or time.time() < task.deadline
+    ):
+        hand, deck = sample_hand(task.masks, task.unseen, rng)
+        hands = list(task.state.hands)
+        hands[task.seat] = tuple(hand)
+        state = task.state._replace(deck=tuple(deck), hands=tuple(hands))
+
+        if game is None:
+            game = task.game_class.from_snapshot(
+                state, [task.rollout_class] * len(hands)
+            )
+
+        for i, move in enumerate(task.moves):
+            game.restore(state)
+            game.apply_move(move)
+            game.end_turn()
+            game.play()
+
+            totals[i] += game.score
+
+        samples += 1
+
+    return totals, samples
+
+
+class _ConfiguredClass(type):
+    """
+    The type of player classes created by
+    :meth:`MonteCarloPlayer.with_options`. They aren't module attributes,
+    so they are pickled as their base class and options instead, which
+    lets configured players be sent to worker processes.
+    """
+
+
+def _configured_class(base, options):
+    """
+    Re-create a configured player class when it is unpickled.
+
+    Args:
+        base:
+            The class the options were applied to.
+        options:
+            A dictionary of the options.
+
+    Returns:
+        A player class with the options.
+    """
+    return base.with_options(**options)
+
+
+copyreg.pickle(
+    _ConfiguredClass,
+    lambda klass: (_configured_class, (klass.__bases__[0], klass._options)),
+)
+
+
+class MonteCarloPlayer(HintPlayer):
+    """
+    A player who cannot see their own hand and chooses moves by
+    sampling hands that are consistent with what they know, then
+    playing out the rest of the game after each possible move with a
+    fast default policy.
+
+    The options are class attributes, so use :meth:`with_options` to
+    create a configured player class.
+    """
+
+    rollouts = 50
+    """
+    The number of hands sampled for each move.
+    """
+
+    rollout_class = CompiledGodPlayer
+    """
+    The player class used to play out the rest of the game. This makes
+    the same moves as :class:`GodPlayer`, only faster.
+    """
+
+    play_threshold = 0.8
+    """
+    The lowest chance of a card being playable for playing it to be
+    considered. Rollouts are played by players who can see every card, so
+    they can't tell a risky play from a safe one and riskier plays have
+    to be ruled out before sampling.
+    """
+
+    time_limit = None
+    """
+    The maximum number of seconds to spend on each move. Sampling stops
+    early once the limit is reached.
+    """
+
+    pool = None
+    """
+    An optional :class:`multiprocessing.pool.Pool` to spread rollouts
+    over.
+    """
+
+    batches = 1
+    """
+    The number of batches to split each move's rollouts into when using
+    a pool. This should usually be the number of processes in the pool.
+    """
+
+    seed = None
+    """
+    An optional seed for the player's sampling. Each seat gets its own
+    random number generator derived from the seed.
+    """
+
+    # The options the class was created with by with_options.
+    _options = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        Create the player's random number generator.
+        """
+        super().__init__(*args, **kwargs)
+
+        if self.seed is None:
+            self.rng = random.Random()
+        else:
+            self.rng = random.Random(f'{self.seed}:{self.player_index}')
+
+    @classmethod
+    def with_options(cls, **options):
+        """
+        Create a player class with different options.
+
+        Args:
+            **options:
+                Values for any of the class's options, such as
+                ``rollouts`` or ``time_limit``.
+
+        Returns:
+            A subclass with the given options. It can be pickled as long
+            as the option values can, so it can be played by worker
+            processes as long as it doesn't use a pool.
+
+        Raises:
+            TypeError:
+                If an option is unknown.
+            ValueError:
+                If fewer than one rollout is requested.
+        """
+        for name in options:
+            if name.startswith('_') or not hasattr(cls, name):
+                raise TypeError(f'Received unexpected option: {name}')
+
+        if options.get('rollouts', cls.rollouts) < 1:
+            raise ValueError('At least one rollout is required.')
+
+        return _ConfiguredClass(
+            cls.__name__, (cls,), dict(options, _options=options)
+        )
+
+    def candidate_moves(self, view, hint=None):
+        """
+        Get the moves worth evaluating. Cards are only played if they
+        are playable with a chance of at least :attr:`play_threshold`,
+        counting each unseen copy of a card the player could be holding.
+
+        Args:
+            view:
+                The :class:`hanabi.knowledge.PublicView` of the game.
+            hint:
+                The keyword arguments for :meth:`give_hint` for the hint
+                the player would give. A hint is only considered if one
+                is provided.
+
+        Returns:
+            A list of :class:`hanabi.game.Move` instances, in the order
+            they are preferred when their outcomes tie. Rollouts play
+            every playable card eventually, so a safe play ties with a
+            hint and should win. A hint keeps every card in the hand, so
+            it wins ties with discards.
+        """
+        from hanabi.game import Move, MoveType
+
+        possible = view.possibilities(self)
+        copies = collections.Counter(view.unseen(self))
+
+        moves = []
+        for index, mask in enumerate(possible):
+            candidates = sum(
+                copies[card.index] for card in knowledge.mask_cards(mask)
+            )
+            playable = sum(
+                copies[card.index]
+                for card in knowledge.mask_cards(mask & view.playable)
+            )
+
+            if playable and playable >= self.play_threshold * candidates:
+                moves.append(Move(MoveType.PLAY, index))
+
+        if hint is not None and self.game.hints_remaining > 0:
+            moves.append(Move(
+                MoveType.HINT,
+                None,
+                hint['target'].player_index,
+                color=hint.get('color'),
+                number=hint.get('number'),
+            ))
+
+        moves += [
+            Move(MoveType.DISCARD, index) for index in range(len(possible))
+        ]
+
+        return moves
+
+    def evaluate(self, view, moves):
+        """
+        Estimate the final score after each move.
+
+        Args:
+            view:
+                The :class:`hanabi.knowledge.PublicView` of the game.
+            moves:
+                The moves to evaluate.
+
+        Returns:
+            A list containing the average final score after each move.
+        """
+        game = self.game
+        state = game.snapshot()
+        hands = list(state.hands)
+        hands[self.player_index] = ()
+
+        deadline = None
+        if self.time_limit is not None:
+            deadline = time.time() + self.time_limit
+
+        # Every batch samples at least once, so there can't be more
+        # batches than rollouts.
+        batches = 1
+        if self.pool is not None:
+            batches = min(self.batches, self.rollouts)
+
+        tasks = [
+            RolloutTask(
+                state=state._replace(deck=(), hands=tuple(hands)),
+                seat=self.player_index,
+                masks=view.possibilities(self),
+                unseen=view.unseen(self),
+                moves=moves,
+                rollout_class=self.rollout_class,
+                game_class=type(self.game),
+                samples=(
+                    self.rollouts // batches
+                    + (batch < self.rollouts % batches)
+                ),
+                seed=self.rng.getrandbits(64),
+                deadline=deadline,
+            )
+            for batch in range(batches)
+        ]
+
+        if self.pool is None:
+            results = map(run_rollouts, tasks)
+        else:
+            results = self.pool.map(run_rollouts, tasks)
+
+        totals = [0] * len(moves)
+        samples = 0
+        for batch_totals, batch_samples in results:
+            totals = [a + b for a, b in zip(totals, batch_totals)]
+            samples += batch_samples
+
+        return [total / samples for total in totals]
+
+    def get_move(self):
+        """
+        Make the move with the best average outcome over the sampled
+        hands. The only hint considered is the one a :class:`HintPlayer`
+        would give, and the rollouts play out that exact hint.
+        """
+        view = knowledge.PublicView(self.game)
+
+        # A card known to be playable is always worth playing, so there
+        # is no need to sample.
+        for index, mask in enumerate(view.possibilities(self)):
+            if not mask & ~view.playable:
+                self.play(index)
+
+                return
+
+        hint = self._find_hint(view)
+        moves = self.candidate_moves(view, hint)
+        scores = self.evaluate(view, moves)
+        self.game.apply_move(moves[scores.index(max(scores))])
@@ -0,0 +1,275 @@
+import collections
+import itertools
+
+from hanabi import cards
+
+
+PLAY = 'play'
+"""
+The kind of decision that plays the card at its index.
+"""
+
+DISCARD = 'discard'
+"""
+The kind of decision that discards the card at its index.
+"""
+
+HINT = 'hint'
+"""
+The kind of decision that gives a simulated hint.
+"""
+
+USELESS = 0
+"""
+The code of a card that can no longer be played. Playable cards are
+coded by their number, and other useful cards by :data:`USEFUL_CODES`.
+See :func:`god_key`.
+"""
+
+USEFUL_CODES = {
+    copies: cards.NUMBERS_PER_COLOR + copies
+    for copies in set(cards.Deck.CARD_COUNT_MAP.values())
+}
+"""
+A map from the number of copies of a card to the code of a useful card
+that is not playable yet.
+"""
+
+CARD_CODES = max(USEFUL_CODES.values()) + 1
+"""
+The number of distinct card codes.
+"""
+
+
+class PolicyTable:
+    """
+    A memoized decision table for a player whose move only depends on a
+    small, canonical description of the game, called its key.
+
+    The first time a key is seen, the decision is computed and stored,
+    so every later turn with the same key is a single lookup. Tables can
+    also be filled in ahead of time with :meth:`precompile`.
+    """
+
+    def __init__(self, decide, max_size=None):
+        """
+        Create an empty table.
+
+        Args:
+            decide:
+                A function that computes the decision for a key.
+            max_size:
+                The maximum number of decisions to keep. If the table is
+                full, the least recently used decision is dropped. There
+                is no limit by default, which is the fastest option when
+                the keys are known to be few.
+        """
+        self.decide = decide
+        self.max_size = max_size
+        self.misses = 0
+
+        if max_size is None:
+            self.decisions = {}
+        else:
+            self.decisions = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self.decisions)
+
+    def lookup(self, key):
+        """
+        Get the decision for a key.
+
+        Args:
+            key:
+                The key describing the game.
+
+        Returns:
+            The decision for the key.
+        """
+        decisions = self.decisions
+
+        try:
+            decision = decisions[key]
+        except KeyError:
+            decision = self._compile(key)
+        else:
+            if self.max_size is not None:
+                decisions.move_to_end(key)
+
+        return decision
+
+    def precompile(self, keys):
+        """
+        Compute and store the decisions for many keys at once.
+
+        Args:
+            keys:
+                An iterable of keys.
+        """
+        for key in keys:
+            if key not in self.decisions:
+                self._compile(key)
+
+    def _compile(self, key):
+        """
+        Compute and store the decision for a key.
+        """
+        self.misses += 1
+        decision = self.decide(key)
+        self.decisions[key] = decision
+
+        if self.max_size is not None and len(self.decisions) > self.max_size:
+            self.decisions.popitem(last=False)
+
+        return decision
+
+
+def god_key(game, hand):
+    """
+    Reduce everything a :class:`hanabi.players.GodPlayer` bases its move
+    on to a single integer.
+
+    Args:
+        game:
+            The game being played.
+        hand:
+            The cards in the player's hand.
+
+    Returns:
+        The key for the player's decision. See :func:`decode_god_key`.
+    """
+    playable_mask = game.playable_mask
+    useful_mask = game.useful_mask
+
+    # The leading 1 keeps hands of different sizes from colliding.
+    key = 1
+    for card in hand:
+        bit = 1 << card.index
+
+        if playable_mask & bit:
+            code = card.number
+        elif useful_mask & bit:
+            code = USEFUL_CODES[card.copies]
+        else:
+            code = USELESS
+
+        key = key * CARD_CODES + code
+
+    return (
+        key * 4
+        + 2 * (game.hints_remaining > 0)
+        + (len(game.deck.cards) == 1)
+    )
+
+
+def encode_god_key(codes, has_hints, last_card):
+    """
+    Build the key for a hand described by its card codes.
+
+    Args:
+        codes:
+            The code of each card in the hand. See :data:`USELESS`.
+        has_hints:
+            A boolean indicating if any hints are left.
+        last_card:
+            A boolean indicating if there is one card left in the deck.
+
+    Returns:
+        The same key as :func:`god_key` gives for the hand.
+    """
+    key = 1
+    for code in codes:
+        key = key * CARD_CODES + code
+
+    return key * 4 + 2 * bool(has_hints) + bool(last_card)
+
+
+def decode_god_key(key):
+    """
+    Split a key from :func:`god_key` back into its parts.
+
+    Args:
+        key:
+            The key.
+
+    Returns:
+        A tuple containing a list of the codes of the cards in the hand,
+        a boolean indicating if any hints are left, and a boolean
+        indicating if there is one card left in the deck.
+    """
+    key, flags = divmod(key, 4)
+
+    codes = []
+    while key > 1:
+        key, code = divmod(key, CARD_CODES)
+        codes.append(code)
+
+    return codes[::-1], bool(flags & 2), bool(flags & 1)
+
+
+def god_decision(key):
+    """
+    Make the same decision as :meth:`hanabi.players.GodPlayer.get_move`
+    for a key.
+
+    Args:
+        key:
+            The key from :func:`god_key`.
+
+    Returns:
+        A tuple containing the kind of move and the index of the card,
+        which is ``None`` for hints.
+    """
+    codes, has_hints, last_card = decode_god_key(key)
+
+    playable = [
+        i for i, code in enumerate(codes)
+        if 1 <= code <= cards.NUMBERS_PER_COLOR
+    ]
+    unplayable = [i for i in range(len(codes)) if i not in playable]
+
+    # Play the lowest playable card.
+    if playable:
+        return PLAY, min(playable, key=lambda i: codes[i])
+
+    # Prolong the game with a hint when the deck is about to run out.
+    if last_card and has_hints:
+        return HINT, None
+
+    for index in unplayable:
+        if codes[index] == USELESS:
+            return DISCARD, index
+
+    if has_hints:
+        return HINT, None
+
+    # Discard the card with the most copies. The codes of useful cards
+    # increase with their number of copies.
+    unplayable.sort(key=lambda i: codes[i], reverse=True)
+
+    return DISCARD, unplayable[0]
+
+
+def god_keys(hand_size):
+    """
+    List every key for a hand size.
+
+    Args:
+        hand_size:
+            The number of cards in the hand.
+
+    Returns:
+        An iterator over the keys.
+    """
+    for codes in itertools.product(range(CARD_CODES), repeat=hand_size):
+        for has_hints in (False, True):
+            for last_card in (False, True):
+                yield encode_god_key(codes, has_hints, last_card)
+
+
+GOD_TABLE = PolicyTable(god_decision)
+"""
+The shared decision table of :class:`hanabi.players.CompiledGodPlayer`.
+It is filled in as new keys are seen.
+"""
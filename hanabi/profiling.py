@@ -0,0 +1,335 @@
+import collections
+import contextlib
+import cProfile
+import os
+import signal
+import time
+
+from hanabi import cards, players
+from hanabi import game as game_module
+
+
+GOD_PLAYER_BRANCHES = (
+    'play',
+    'endgame hint',
+    'useless discard',
+    'hint',
+    'rarity discard',
+)
+"""
+The decisions a :class:`hanabi.players.GodPlayer` can make, in the
+order it checks them.
+"""
+
+DEFAULT_SAMPLE_INTERVAL = 0.001
+"""
+The default number of seconds of CPU time between stack samples.
+"""
+
+
+class PhaseTimer:
+    """
+    Accumulates the time spent in and the number of calls to each phase
+    of a simulation.
+
+    Phases are timed inclusively, so the time spent dealing in
+    ``Game.__init__`` includes setting up the deck.
+    """
+
+    def __init__(self):
+        """
+        Create a new timer with no recorded phases.
+        """
+        self.calls = collections.Counter()
+        self.totals = collections.Counter()
+
+    def add(self, phase, elapsed):
+        """
+        Record a single call to a phase.
+
+        Args:
+            phase:
+                The name of the phase.
+            elapsed:
+                The number of seconds the call took.
+        """
+        self.calls[phase] += 1
+        self.totals[phase] += elapsed
+
+    def merge(self, other):
+        """
+        Add the calls recorded by another timer to this timer.
+
+        Args:
+            other:
+                The timer to merge into this one.
+        """
+        self.calls.update(other.calls)
+        self.totals.update(other.totals)
+
+    def report(self, elapsed=None):
+        """
+        Describe the recorded phases.
+
+        Args:
+            elapsed:
+                The total run time. If provided, each phase's share of
+                it is included.
+
+        Returns:
+            A list of lines describing each phase, starting with the
+            phase that took the most time.
+        """
+        lines = []
+        for phase, total in self.totals.most_common():
+            calls = self.calls[phase]
+            line = (
+                f'{phase:<36} {calls:>10,} calls {total:>9.3f}s '
+                f'{total / calls * 1e6:>9.2f}us/call'
+            )
+
+            if elapsed:
+                line += f' {total / elapsed:>7.2%}'
+
+            lines.append(line)
+
+        return lines
+
+    def timed(self, phase, func):
+        """
+        Wrap a function so that every call to it is recorded.
+
+        Args:
+            phase:
+                The name of the phase the calls are recorded under.
+            func:
+                The function to time.
+
+        Returns:
+            The wrapped function.
+        """
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - start)
+
+        wrapper.__wrapped__ = func
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def instrument(self):
+        """
+        Time the phases of every game played inside the context. The
+        timed functions are patched on their classes, so this only
+        affects games played in the current process.
+
+        The phases are:
+
+        * Creating the deck with ``Deck.full_shuffled_deck``.
+        * Dealing in ``Game.__init__``.
+        * Checking ``Game.is_finished``.
+        * ``GodPlayer.get_move``, split up by the branch that decided
+          the move. See :data:`GOD_PLAYER_BRANCHES`.
+        """
+        patches = [
+            (
+                cards.Deck,
+                'full_shuffled_deck',
+                classmethod(self.timed(
+                    'Deck.full_shuffled_deck',
+                    cards.Deck.full_shuffled_deck.__func__,
+                )),
+            ),
+            (
+                game_module.Game,
+                '__init__',
+                self.timed('Game.__init__', game_module.Game.__init__),
+            ),
+            (
+                game_module.Game,
+                'is_finished',
+                property(self.timed(
+                    'Game.is_finished', game_module.Game.is_finished.fget,
+                )),
+            ),
+            (
+                players.GodPlayer,
+                'get_move',
+                self._time_branches(players.GodPlayer.get_move),
+            ),
+        ]
+
+        originals = [
+            (owner, name, owner.__dict__[name]) for owner, name, _ in patches
+        ]
+
+        try:
+            for owner, name, patched in patches:
+                setattr(owner, name, patched)
+
+            yield self
+        finally:
+            for owner, name, original in originals:
+                setattr(owner, name, original)
+
+    def _time_branches(self, get_move):
+        """
+        Wrap ``GodPlayer.get_move`` so that its calls are recorded under
+        the branch that decided the move.
+
+        The branch is worked out from the move that was made and the
+        state of the game before it, following the same order of checks
+        as the player.
+
+        Args:
+            get_move:
+                The original method.
+
+        Returns:
+            The wrapped method.
+        """
+        def wrapper(player):
+            game = player.game
+            deck_size = len(game.deck.cards)
+            hints = game.hints_remaining
+            useful = {
+                card: game.is_card_useful(card)
+                for card in game.player_hands[player]
+            }
+            discards = len(game.discards)
+            # A bomb is discarded, so plays are told apart from discards
+            # by the number of cards played and bombs.
+            played = (game.score + game.bombs, game.bombs)
+
+            start = time.perf_counter()
+            get_move(player)
+            elapsed = time.perf_counter() - start
+
+            if (game.score + game.bombs, game.bombs) != played:
+                branch = 'play'
+            elif len(game.discards) == discards:
+                if deck_size == 1 and hints > 0:
+                    branch = 'endgame hint'
+                else:
+                    branch = 'hint'
+            elif useful[game.discards[-1]]:
+                branch = 'rarity discard'
+            else:
+                branch = 'useless discard'
+
+            self.add(f'GodPlayer.get_move ({branch})', elapsed)
+
+        wrapper.__wrapped__ = get_move
+
+        return wrapper
+
+
+class StackSampler:
+    """
+    A sampling profiler that records the Python call stack at a fixed
+    interval of CPU time. The samples can be written out as collapsed
+    stacks for flame graph tools.
+
+    This uses ``SIGPROF``, so it is only available on Unix and must be
+    started from the main thread.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Create a new sampler.
+
+        Args:
+            interval:
+                The number of seconds of CPU time between samples.
+        """
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._previous_handler = None
+
+    def __enter__(self):
+        """
+        Start sampling.
+        """
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Stop sampling.
+        """
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+
+    def _sample(self, signum, frame):
+        """
+        Record the stack that was interrupted by the timer.
+        """
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.basename(code.co_filename)
+            stack.append(f'{code.co_name} ({filename}:{code.co_firstlineno})')
+            frame = frame.f_back
+
+        self.stacks[';'.join(reversed(stack))] += 1
+
+    def write_collapsed(self, file):
+        """
+        Write the samples in the collapsed stack format, with one line
+        for each distinct stack followed by its number of samples.
+
+        Args:
+            file:
+                The text file to write to.
+        """
+        for stack, count in sorted(self.stacks.items()):
+            file.write(f'{stack} {count}\n')
+
+
+@contextlib.contextmanager
+def profile(phases=False, cprofile_path=None, collapsed_path=None):
+    """
+    Profile the code run inside the context in any combination of ways.
+
+    Args:
+        phases:
+            A boolean indicating if the phases of each game should be
+            timed with a :class:`PhaseTimer`.
+        cprofile_path:
+            If provided, the code is profiled with :mod:`cProfile` and
+            the stats are saved to this path for :mod:`pstats`.
+        collapsed_path:
+            If provided, the stack is sampled with a
+            :class:`StackSampler` and the collapsed stacks are written
+            to this path.
+
+    Returns:
+        A context manager that gives the :class:`PhaseTimer`, or
+        ``None`` if the phases aren't timed.
+    """
+    with contextlib.ExitStack() as stack:
+        timer = None
+        if phases:
+            timer = stack.enter_context(PhaseTimer().instrument())
+
+        if collapsed_path is not None:
+            sampler = stack.enter_context(StackSampler())
+
+            def write_samples():
+                with open(collapsed_path, 'w') as f:
+                    sampler.write_collapsed(f)
+
+            stack.callback(write_samples)
+
+        if cprofile_path is not None:
+            profiler = cProfile.Profile()
+            stack.callback(profiler.dump_stats, cprofile_path)
+            stack.callback(profiler.disable)
+            profiler.enable()
+
+        yield timer
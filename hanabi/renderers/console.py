@@ -1,4 +1,5 @@
 import itertools
+import weakref
 
 
 class ConsoleRenderer:
@@ -7,13 +8,28 @@ class ConsoleRenderer:
     """
     COLUMN_WIDTH = 16
 
-    game_renderers = {}
+    game_renderers = weakref.WeakKeyDictionary()
 
     def __init__(self, game):
         """
         Create a new console renderer.
+
+        The renderer only holds a weak reference to the game, so a game
+        is not kept alive by its entry in :attr:`game_renderers`.
+        """
+        self._game = weakref.ref(game)
+
+        # A map from each rendered section to the state it was rendered
+        # from and the rendered string.
+        self._cache = {}
+
+    @property
+    def game(self):
+        """
+        Returns:
+            The game being rendered.
         """
-        self.game = game
+        return self._game()
 
     @staticmethod
     def buffer_section(rendered):
@@ -29,6 +45,37 @@ class ConsoleRenderer:
         """
         return f'\n\n{rendered}\n\n'
 
+    def _cached(self, key, state, render, *args):
+        """
+        Get a rendered section, only rendering it again if the part of
+        the game's state it shows has changed since it was last
+        rendered.
+
+        Args:
+            key:
+                A key identifying the section. It must not reference the
+                game or its players.
+            state:
+                A cheap, comparable summary of everything the section
+                shows. It must not reference the game or its players.
+            render:
+                The function that renders the section.
+            *args:
+                The arguments to pass to the render function.
+
+        Returns:
+            The rendered section.
+        """
+        cached = self._cache.get(key)
+
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        rendered = render(*args)
+        self._cache[key] = (state, rendered)
+
+        return rendered
+
     @classmethod
     def for_game(cls, game):
         """
@@ -48,6 +95,21 @@ class ConsoleRenderer:
         return cls.game_renderers[game]
 
     def render_discards(self):
+        """
+        Render the cards that have been discarded. The result is
+        reused until another card is discarded.
+
+        Returns:
+            A string representation of the discarded cards.
+        """
+        # The discards are shown sorted, so only their counts matter.
+        return self._cached(
+            'discards',
+            tuple(self.game.discard_counts),
+            self._render_discards,
+        )
+
+    def _render_discards(self):
         """
         Render the cards that have been discarded.
 
@@ -76,6 +138,23 @@ class ConsoleRenderer:
         return self.buffer_section(ret_str)
 
     def render_game_info(self):
+        """
+        Render a basic overview of the game. The result is reused
+        until the score, the size of the deck, or the turns remaining
+        change.
+
+        Returns:
+            A string containing a basic overview of the game.
+        """
+        game = self.game
+
+        return self._cached(
+            'game_info',
+            (game.score, len(game.deck.cards), game.turns_remaining),
+            self._render_game_info,
+        )
+
+    def _render_game_info(self):
         """
         Render a basic overview of the game.
 
@@ -94,6 +173,32 @@ class ConsoleRenderer:
         return self.buffer_section(ret_str)
 
     def render_other_hands(self, player):
+        """
+        Render the hands of all other players. The result is reused
+        until one of the other players' hands changes.
+
+        Args:
+            player:
+                The current player. The current player's hand will not
+                be included in the output.
+
+        Returns:
+            A string representation of the other players' hands.
+        """
+        hands = tuple(
+            tuple(card.index for card in self.game.player_hands[other])
+            for other in self.game.players
+            if other is not player
+        )
+
+        return self._cached(
+            ('other_hands', player.player_index),
+            hands,
+            self._render_other_hands,
+            player,
+        )
+
+    def _render_other_hands(self, player):
         """
         Render the hands of all other players.
 
@@ -118,6 +223,20 @@ class ConsoleRenderer:
         return self.buffer_section(ret_str)
 
     def render_stacks(self):
+        """
+        Render the stacks of cards that have been played. The result
+        is reused until another card is played.
+
+        Returns:
+            A string representation of the stacks of played cards.
+        """
+        return self._cached(
+            'stacks',
+            tuple(self.game.stacks.items()),
+            self._render_stacks,
+        )
+
+    def _render_stacks(self):
         """
         Render the stacks of cards that have been played.
 
@@ -0,0 +1,385 @@
+import json
+import pathlib
+
+import numpy as np
+
+from hanabi import cards, stats
+
+
+FORMAT_VERSION = 1
+"""
+The version of the on-disk layout of a result store.
+"""
+
+RECORD_DTYPE = np.dtype([
+    ('seed', '<u8'),
+    ('player_count', 'u1'),
+    ('score', 'i1'),
+    ('bombs', 'u1'),
+    ('hints', 'u1'),
+    ('turns', '<u2'),
+    ('dead_colors', 'u1'),
+    ('last_draw_turn', '<i2'),
+])
+"""
+The fixed-width record kept for each game. Each field is stored in its
+own column file.
+
+* ``seed``: The seed the game's deck was shuffled with, or the index of
+  its deal for games dealt from a :class:`hanabi.deals.DealPool`.
+* ``player_count``: The number of players.
+* ``score``: The final score.
+* ``bombs``: The number of bombs set off.
+* ``hints``: The number of hints left at the end of the game.
+* ``turns``: The number of turns played.
+* ``dead_colors``: A bitmask of the colors that could no longer be
+  completed, with bit ``i`` for the ``i``-th color in
+  :class:`hanabi.cards.Colors`.
+* ``last_draw_turn``: The turn in which the last card was drawn, or
+  :data:`NO_DRAW`.
+"""
+
+NO_DRAW = -1
+"""
+The ``last_draw_turn`` of games in which no card was drawn after the
+deal.
+"""
+
+DEFAULT_BUFFER_SIZE = 65_536
+"""
+The default number of records a writer buffers before appending them to
+the column files.
+"""
+
+AGGREGATE_BLOCK_SIZE = 1 << 22
+"""
+The number of records processed at a time when aggregating a store, so
+that memory use stays bounded for stores of any size.
+"""
+
+_META_FILE = 'meta.json'
+
+
+def dead_colors(game):
+    """
+    Args:
+        game:
+            The game to check.
+
+    Returns:
+        A bitmask of the colors that can no longer be completed because
+        every copy of one of their unplayed cards was discarded.
+    """
+    return sum(
+        1 << index
+        for index, color in enumerate(cards.Colors)
+        if game.dead_from[color] <= cards.NUMBERS_PER_COLOR
+    )
+
+
+def empty_records(count):
+    """
+    Args:
+        count:
+            The number of records.
+
+    Returns:
+        An uninitialized array of records.
+    """
+    return np.empty(count, RECORD_DTYPE)
+
+
+def game_record(game, seed):
+    """
+    Describe a finished game as a record.
+
+    Args:
+        game:
+            The finished game.
+        seed:
+            The seed the game's deck was shuffled with.
+
+    Returns:
+        A tuple of the fields in :data:`RECORD_DTYPE`.
+    """
+    last_draw_turn = game.last_draw_turn
+    if last_draw_turn is None:
+        last_draw_turn = NO_DRAW
+
+    return (
+        seed,
+        len(game.players),
+        game.score,
+        game.bombs,
+        game.hints_remaining,
+        game.turns_played,
+        dead_colors(game),
+        last_draw_turn,
+    )
+
+
+def _column_path(directory, field):
+    """
+    Get the path of a field's column file.
+    """
+    return directory / f'{field}.bin'
+
+
+class ResultWriter:
+    """
+    Appends game records to the column files of a result store. Records
+    are buffered and written in blocks, so the writer should be closed
+    or used as a context manager to write the final block.
+    """
+
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE):
+        """
+        Open a store for appending, creating it if it doesn't exist.
+
+        If a previous writer was interrupted part way through appending
+        a block, the columns are truncated back to the last complete
+        record.
+
+        Args:
+            path:
+                The directory of the store.
+            buffer_size:
+                The number of records to buffer between writes.
+        """
+        self.directory = pathlib.Path(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        meta_path = self.directory / _META_FILE
+        if meta_path.exists():
+            _check_meta(meta_path)
+        else:
+            with open(meta_path, 'w') as f:
+                json.dump(_meta(), f)
+
+        length = _stored_length(self.directory)
+        self._files = {}
+        for field in RECORD_DTYPE.names:
+            column = open(_column_path(self.directory, field), 'ab')
+            column.truncate(length * RECORD_DTYPE[field].itemsize)
+            self._files[field] = column
+
+        self._buffer = empty_records(buffer_size)
+        self._buffered = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, record):
+        """
+        Add a single record.
+
+        Args:
+            record:
+                A tuple of the fields in :data:`RECORD_DTYPE`, such as
+                one from :func:`game_record`.
+        """
+        self._buffer[self._buffered] = record
+        self._buffered += 1
+
+        if self._buffered == len(self._buffer):
+            self.flush()
+
+    def extend(self, records):
+        """
+        Add an array of records.
+
+        Args:
+            records:
+                An array with the dtype :data:`RECORD_DTYPE`.
+        """
+        self.flush()
+        self._write(records)
+
+    def flush(self):
+        """
+        Write any buffered records to the column files.
+        """
+        if self._buffered:
+            self._write(self._buffer[:self._buffered])
+            self._buffered = 0
+
+    def close(self):
+        """
+        Write any buffered records and close the column files.
+        """
+        self.flush()
+
+        for column in self._files.values():
+            column.close()
+
+    def _write(self, records):
+        """
+        Append records to every column file.
+        """
+        for field, column in self._files.items():
+            column.write(np.ascontiguousarray(records[field]).tobytes())
+            column.flush()
+
+
+class ResultStore:
+    """
+    Read-only access to a result store, with every column memory-mapped
+    so that stores much larger than memory can be analyzed.
+    """
+
+    def __init__(self, path):
+        """
+        Open a store.
+
+        Args:
+            path:
+                The directory of the store.
+        """
+        self.directory = pathlib.Path(path)
+        _check_meta(self.directory / _META_FILE)
+
+        self.length = _stored_length(self.directory)
+        self._columns = {}
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, field):
+        """
+        Get a column.
+
+        Args:
+            field:
+                The name of one of the fields in :data:`RECORD_DTYPE`.
+
+        Returns:
+            A read-only array of the field's values for every record.
+        """
+        if field not in RECORD_DTYPE.names:
+            raise KeyError(field)
+
+        if field not in self._columns:
+            dtype = RECORD_DTYPE[field]
+
+            if self.length:
+                column = np.memmap(
+                    _column_path(self.directory, field),
+                    dtype=dtype,
+                    mode='r',
+                    shape=(self.length,),
+                )
+            else:
+                column = np.empty(0, dtype)
+
+            self._columns[field] = column
+
+        return self._columns[field]
+
+    def blocks(self, field, block_size=AGGREGATE_BLOCK_SIZE):
+        """
+        Iterate over a column in blocks.
+
+        Args:
+            field:
+                The name of the field.
+            block_size:
+                The number of records in each block.
+
+        Returns:
+            An iterator over arrays of the column's values.
+        """
+        column = self[field]
+
+        for start in range(0, self.length, block_size):
+            yield column[start:start + block_size]
+
+    def histogram(self, field, block_size=AGGREGATE_BLOCK_SIZE):
+        """
+        Count the records with each value of a field.
+
+        Args:
+            field:
+                The name of an integer field with small values, such as
+                ``score`` or ``turns``.
+            block_size:
+                The number of records counted at a time.
+
+        Returns:
+            A dictionary mapping each value that occurs to its number of
+            records.
+        """
+        offset = 0
+        if RECORD_DTYPE[field].kind == 'i':
+            offset = -np.iinfo(RECORD_DTYPE[field]).min
+
+        counts = np.zeros(0, np.int64)
+        for block in self.blocks(field, block_size):
+            block_counts = np.bincount(block.astype(np.int64) + offset)
+
+            if len(block_counts) > len(counts):
+                counts = np.pad(counts, (0, len(block_counts) - len(counts)))
+            counts[:len(block_counts)] += block_counts
+
+        return {
+            value - offset: int(count)
+            for value, count in enumerate(counts)
+            if count
+        }
+
+    def score_statistics(self, block_size=AGGREGATE_BLOCK_SIZE):
+        """
+        Returns:
+            The :class:`hanabi.stats.ScoreStatistics` of every game in
+            the store.
+        """
+        return stats.ScoreStatistics.from_histogram(
+            self.histogram('score', block_size)
+        )
+
+
+def _meta():
+    """
+    Returns:
+        The metadata describing the current format.
+    """
+    return {
+        'version': FORMAT_VERSION,
+        'fields': [
+            [name, RECORD_DTYPE[name].str] for name in RECORD_DTYPE.names
+        ],
+    }
+
+
+def _check_meta(path):
+    """
+    Make sure a store uses the current format.
+
+    Raises:
+        ValueError:
+            If the store's format is different.
+    """
+    with open(path) as f:
+        meta = json.load(f)
+
+    if meta != _meta():
+        raise ValueError(
+            f'The result store at {path.parent} uses a different format.'
+        )
+
+
+def _stored_length(directory):
+    """
+    Returns:
+        The number of complete records in a store. This is the length of
+        the shortest column, since the columns are written one at a time.
+    """
+    lengths = []
+    for field in RECORD_DTYPE.names:
+        path = _column_path(directory, field)
+        size = path.stat().st_size if path.exists() else 0
+        lengths.append(size // RECORD_DTYPE[field].itemsize)
+
+    return min(lengths)
@@ -0,0 +1,297 @@
+import collections
+import struct
+
+from hanabi import cards, knowledge, players
+from hanabi.game import Game, GameState
+
+
+MAGIC = b'HNB'
+"""
+The bytes every encoded state starts with.
+"""
+
+VERSION = 1
+"""
+The version of the format written by :func:`encode_state`. States
+written with other versions are rejected when decoded.
+"""
+
+_HEADER = struct.Struct('<3sBBBB5sBBbBHh')
+"""
+The fixed-size start of an encoded state: the magic bytes, the version,
+the number of players, the size of the deck, the number of discards,
+the stacks, the hints, the bombs, the turns remaining, the current
+player, the turns played, and the turn of the last draw.
+"""
+
+_NONE = -1
+"""
+The value stored for fields that are ``None``.
+"""
+
+
+def encode_state(state):
+    """
+    Encode a game state in the compact binary format.
+
+    The format is a fixed-size header followed by the size of each
+    hand, then one byte for each card in the deck, the hands, and the
+    discards, and finally four bytes for what is known about each card
+    in the hands.
+
+    Args:
+        state:
+            The :class:`hanabi.game.GameState` to encode.
+
+    Returns:
+        The encoded state.
+    """
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(state.hands),
+        len(state.deck),
+        len(state.discards),
+        bytes(state.stacks),
+        state.hints,
+        state.bombs,
+        _NONE if state.turns_remaining is None else state.turns_remaining,
+        state.current_player,
+        state.turns_played,
+        _NONE if state.last_draw_turn is None else state.last_draw_turn,
+    )
+    hand_cards = [index for hand in state.hands for index in hand]
+    hand_knowledge = [mask for masks in state.knowledge for mask in masks]
+
+    return b''.join([
+        header,
+        bytes(len(hand) for hand in state.hands),
+        bytes(state.deck),
+        bytes(hand_cards),
+        bytes(state.discards),
+        struct.pack(f'<{len(hand_knowledge)}I', *hand_knowledge),
+    ])
+
+
+def decode_state(data, game_class=Game):
+    """
+    Decode a game state encoded with :func:`encode_state`.
+
+    Args:
+        data:
+            The encoded state.
+        game_class:
+            The class of the game the state is for. Its limits on hints
+            and bombs are used to check the state.
+
+    Returns:
+        The decoded :class:`hanabi.game.GameState`.
+
+    Raises:
+        ValueError:
+            If the data isn't a state encoded with the current version
+            of the format, or doesn't describe a possible game.
+    """
+    data = memoryview(data)
+
+    if len(data) < _HEADER.size:
+        raise ValueError('The encoded state is truncated.')
+
+    (
+        magic,
+        version,
+        player_count,
+        deck_size,
+        discard_count,
+        stacks,
+        hints,
+        bombs,
+        turns_remaining,
+        current_player,
+        turns_played,
+        last_draw_turn,
+    ) = _HEADER.unpack_from(data)
+
+    if magic != MAGIC:
+        raise ValueError('The data is not an encoded game state.')
+
+    if version != VERSION:
+        raise ValueError(
+            f'Received unsupported format version {version}, expected '
+            f'{VERSION}.'
+        )
+
+    offset = _HEADER.size
+    hand_sizes = bytes(data[offset:offset + player_count])
+    offset += player_count
+
+    hand_card_count = sum(hand_sizes)
+    # Each card in a hand takes one byte and four more for what is
+    # known about it.
+    expected = offset + deck_size + 5 * hand_card_count + discard_count
+    if len(hand_sizes) != player_count or len(data) != expected:
+        raise ValueError('The encoded state has the wrong length.')
+
+    card_count = deck_size + hand_card_count + discard_count
+    card_bytes = data[offset:offset + card_count]
+    if len(card_bytes) and max(card_bytes) >= len(cards.ALL_CARDS):
+        raise ValueError('The encoded state contains an unknown card.')
+
+    deck = tuple(data[offset:offset + deck_size])
+    offset += deck_size
+
+    hands = []
+    for size in hand_sizes:
+        hands.append(tuple(data[offset:offset + size]))
+        offset += size
+
+    discards = tuple(data[offset:offset + discard_count])
+    offset += discard_count
+
+    masks = struct.unpack_from(f'<{hand_card_count}I', data, offset)
+
+    _check_counters(
+        game_class,
+        player_count,
+        stacks,
+        hints,
+        bombs,
+        turns_remaining,
+        current_player,
+        last_draw_turn,
+    )
+    _check_cards(card_bytes, stacks)
+
+    if any(mask > knowledge.ALL_CARDS_MASK for mask in masks):
+        raise ValueError('The encoded state contains unknown knowledge.')
+
+    hand_knowledge = []
+    start = 0
+    for size in hand_sizes:
+        hand_knowledge.append(masks[start:start + size])
+        start += size
+
+    return GameState(
+        deck=deck,
+        hands=tuple(hands),
+        stacks=tuple(stacks),
+        discards=discards,
+        hints=hints,
+        bombs=bombs,
+        turns_remaining=None if turns_remaining == _NONE else turns_remaining,
+        current_player=current_player,
+        knowledge=tuple(hand_knowledge),
+        turns_played=turns_played,
+        last_draw_turn=None if last_draw_turn == _NONE else last_draw_turn,
+    )
+
+
+def _check_counters(
+        game_class,
+        player_count,
+        stacks,
+        hints,
+        bombs,
+        turns_remaining,
+        current_player,
+        last_draw_turn,
+):
+    """
+    Check that the counters of a decoded state are within the limits of
+    the game.
+
+    Raises:
+        ValueError:
+            If any of the counters is out of range.
+    """
+    if any(height > cards.NUMBERS_PER_COLOR for height in stacks):
+        raise ValueError('The encoded state contains an invalid stack.')
+
+    if hints > game_class.MAX_HINTS:
+        raise ValueError(
+            f'The encoded state has {hints} hints, but at most '
+            f'{game_class.MAX_HINTS} are allowed.'
+        )
+
+    if bombs > game_class.MAX_BOMBS:
+        raise ValueError(
+            f'The encoded state has {bombs} bombs, but at most '
+            f'{game_class.MAX_BOMBS} are allowed.'
+        )
+
+    if not 0 <= current_player < player_count:
+        raise ValueError(
+            f'The encoded state has current player {current_player} in a '
+            f'game with {player_count} players.'
+        )
+
+    if turns_remaining < _NONE or last_draw_turn < _NONE:
+        raise ValueError('The encoded state contains a negative turn.')
+
+
+def _check_cards(card_bytes, stacks):
+    """
+    Check that the cards of a decoded state, together with the cards on
+    the stacks, could have come from a single full deck.
+
+    Raises:
+        ValueError:
+            If any card appears more often than a full deck holds it.
+    """
+    counts = collections.Counter(card_bytes)
+    for color_index, height in enumerate(stacks):
+        start = color_index * cards.NUMBERS_PER_COLOR
+        counts.update(range(start, start + height))
+
+    for index, count in counts.items():
+        if count > cards.ALL_CARDS[index].copies:
+            raise ValueError(
+                f'The encoded state contains {count} copies of '
+                f'{cards.ALL_CARDS[index]}.'
+            )
+
+
+def encode(game):
+    """
+    Encode the complete state of a game. The players aren't included,
+    so the game can be rebuilt in another process with any players.
+
+    Args:
+        game:
+            The game to encode.
+
+    Returns:
+        The encoded state.
+    """
+    return encode_state(game.snapshot())
+
+
+def decode(data, player_classes=None, game_class=Game):
+    """
+    Rebuild a game from its encoded state.
+
+    Args:
+        data:
+            The state encoded with :func:`encode`.
+        player_classes:
+            The classes of the players to seat in the game. Defaults to
+            :class:`hanabi.players.BasePlayer` for every seat, which is
+            enough for searching with :meth:`hanabi.game.Game.make_move`.
+        game_class:
+            The class of the game to create.
+
+    Returns:
+        A new game in the encoded state.
+    """
+    state = decode_state(data, game_class)
+
+    if player_classes is None:
+        player_classes = [players.BasePlayer] * len(state.hands)
+
+    if len(player_classes) != len(state.hands):
+        raise ValueError(
+            f'Received {len(player_classes)} player classes for a game with '
+            f'{len(state.hands)} players.'
+        )
+
+    return game_class.from_snapshot(state, player_classes)
@@ -0,0 +1,820 @@
+import asyncio
+import collections
+import itertools
+import json
+import time
+
+from hanabi import cards, events, knowledge, players, simulation
+from hanabi.game import Game, Move, MoveType
+
+
+MAX_LINE_LENGTH = 1024
+"""
+The longest line, in bytes, that a client may send. Longer lines close
+the connection, which bounds the memory used to buffer each client.
+"""
+
+PLAYER_COUNTS = range(2, 6)
+"""
+The numbers of players a table may be created for.
+"""
+
+COMMANDS = {
+    'DISCARD': MoveType.DISCARD,
+    'HINT': MoveType.HINT,
+    'PLAY': MoveType.PLAY,
+}
+"""
+A map from the commands clients send to the moves they make.
+"""
+
+HINT_COLORS = {color.value: color for color in cards.Colors}
+"""
+A map from the names clients use for colors in hints to the colors.
+"""
+
+MOVE_HELP = (
+    'Moves must be PLAY <index>, DISCARD <index>, HINT, '
+    'HINT <player> COLOR <color>, or HINT <player> NUMBER <number>.'
+)
+"""
+The error sent to clients for a malformed move.
+"""
+
+class RemotePlayer(players.BasePlayer):
+    """
+    A seat occupied by a client connected to a :class:`Server`. The
+    table makes the client's moves as they arrive, so the player is
+    never asked for a move by the game.
+    """
+
+    def get_move(self):
+        """
+        Remote players are driven by their :class:`Table`.
+        """
+        raise RuntimeError('Remote players make moves through their table.')
+
+
+def parse_move(line):
+    """
+    Parse a move sent by a client.
+
+    Args:
+        line:
+            A line such as ``PLAY 2``, ``DISCARD 0``, ``HINT`` for a
+            simulated hint, ``HINT 1 COLOR red``, or ``HINT 1 NUMBER 5``.
+
+    Returns:
+        The :class:`hanabi.game.Move` described by the line, or ``None``
+        if the line is not a valid move.
+    """
+    command, *args = line.split() or ['']
+    move_type = COMMANDS.get(command.upper())
+
+    if move_type is None:
+        return None
+
+    if move_type == MoveType.HINT:
+        if not args:
+            return Move(move_type, None)
+
+        return _parse_hint(args)
+
+    if len(args) != 1 or not args[0].isdigit():
+        return None
+
+    return Move(move_type, int(args[0]))
+
+
+def _parse_hint(args):
+    """
+    Parse the arguments of a hint for another player.
+
+    Args:
+        args:
+            The words following ``HINT``.
+
+    Returns:
+        The hint :class:`hanabi.game.Move` described by the arguments,
+        or ``None`` if they are not valid. Its target is the seat of the
+        player receiving the hint.
+    """
+    if len(args) != 3 or not args[0].isdigit():
+        return None
+
+    target, kind, value = int(args[0]), args[1].upper(), args[2].lower()
+
+    if kind == 'COLOR' and value in HINT_COLORS:
+        return Move(MoveType.HINT, None, target, color=HINT_COLORS[value])
+
+    if (
+            kind == 'NUMBER'
+            and value.isdigit()
+            and 1 <= int(value) <= cards.NUMBERS_PER_COLOR
+    ):
+        return Move(MoveType.HINT, None, target, number=int(value))
+
+    return None
+
+
+def describe_knowledge(mask):
+    """
+    Describe what a player knows about a card.
+
+    Args:
+        mask:
+            The mask of the cards the card could be.
+
+    Returns:
+        A JSON serializable dictionary with the colors and numbers the
+        card could have.
+    """
+    possible = knowledge.mask_cards(mask)
+
+    return {
+        'colors': [
+            color.value for color in cards.Colors
+            if any(card.color == color for card in possible)
+        ],
+        'numbers': sorted({card.number for card in possible}),
+    }
+
+
+class Table:
+    """
+    A single game hosted by a server. Clients occupy the first seats and
+    bots fill the remaining ones.
+    """
+
+    def __init__(
+            self,
+            table_id,
+            player_count,
+            humans,
+            bot_class=players.GodPlayer,
+            rng=None,
+    ):
+        """
+        Create a new table waiting for its clients.
+
+        Args:
+            table_id:
+                The identifier of the table within its server.
+            player_count:
+                The number of players in the game.
+            humans:
+                The number of seats taken by clients.
+            bot_class:
+                The class of the players filling the remaining seats.
+            rng:
+                An optional random number generator or seed for the
+                deal.
+        """
+        self.id = table_id
+        self.game = Game(
+            [RemotePlayer] * humans + [bot_class] * (player_count - humans),
+            rng=rng,
+        )
+        self.writers = [None] * humans
+        self.task = None
+
+        # The future that the next move from a client will resolve. It
+        # is only set while waiting for the current player.
+        self._pending = None
+
+        self.game.subscribe(self._broadcast)
+
+    @property
+    def is_finished(self):
+        """
+        Returns:
+            A boolean indicating if the table's game is over.
+        """
+        return self.task is not None and self.task.done()
+
+    @property
+    def is_full(self):
+        """
+        Returns:
+            A boolean indicating if every client seat is taken.
+        """
+        return all(writer is not None for writer in self.writers)
+
+    def abort(self, reason):
+        """
+        Stop the game and disconnect every client.
+
+        Args:
+            reason:
+                A message sent to the clients explaining why the game
+                was stopped.
+        """
+        if self.task is not None:
+            self.task.cancel()
+
+        for seat in range(len(self.writers)):
+            self.send(seat, {'type': 'error', 'message': reason})
+
+        self.close()
+
+    def close(self):
+        """
+        Disconnect every client.
+        """
+        for writer in self.writers:
+            if writer is not None:
+                writer.close()
+
+    def describe(self, seat):
+        """
+        Describe the game as seen by a seat.
+
+        Args:
+            seat:
+                The seat to describe the game for. The cards in the
+                seat's own hand are hidden, but what every player has
+                been told about their cards is included.
+
+        Returns:
+            A JSON serializable dictionary describing the game.
+        """
+        game = self.game
+
+        return {
+            'bombs': game.bombs,
+            'deck': len(game.deck.cards),
+            'discards': [str(card) for card in game.discards],
+            'hand_size': len(game.player_hands[game.players[seat]]),
+            'hands': {
+                other.player_index: [str(card) for card in hand]
+                for other, hand in game.describe_other_hands(
+                    game.players[seat]
+                ).items()
+            },
+            'hints': game.hints_remaining,
+            'knowledge': {
+                player.player_index: [
+                    describe_knowledge(mask)
+                    for mask in game.hand_knowledge[player]
+                ]
+                for player in game.players
+            },
+            'score': game.score,
+            'stacks': {
+                color.value: game.stacks.get(color, 0)
+                for color in cards.Colors
+            },
+            'turns_remaining': game.turns_remaining,
+        }
+
+    def receive(self, seat, line):
+        """
+        Handle a move sent by a client.
+
+        Args:
+            seat:
+                The seat of the client that sent the move.
+            line:
+                The line sent by the client.
+
+        Returns:
+            An error message if the move could not be made, otherwise
+            ``None``.
+        """
+        if self._pending is None or self.game.current_player_index != seat:
+            return 'It is not your turn.'
+
+        move = parse_move(line)
+        if move is None:
+            return MOVE_HELP
+
+        if move.target is not None:
+            error = self._check_hint(seat, move)
+            if error is not None:
+                return error
+        elif move not in self.game.legal_moves():
+            return 'That move is not legal.'
+
+        self._pending.set_result(move)
+        self._pending = None
+
+        return None
+
+    def _check_hint(self, seat, hint):
+        """
+        Check that a client's hint can be given.
+
+        Args:
+            seat:
+                The seat of the client giving the hint.
+            hint:
+                The hint :class:`hanabi.game.Move`.
+
+        Returns:
+            An error message if the hint can't be given, otherwise
+            ``None``.
+        """
+        game = self.game
+
+        if game.hints_remaining <= 0:
+            return 'There are no hints left.'
+
+        if hint.target == seat or hint.target >= len(game.players):
+            return 'Hints must be given to another player.'
+
+        mask = knowledge.hint_mask(color=hint.color, number=hint.number)
+        hand = game.player_hands[game.players[hint.target]]
+        if not any(knowledge.card_mask(card) & mask for card in hand):
+            return 'A hint must apply to at least one card.'
+
+        return None
+
+    async def run(self):
+        """
+        Play the game, waiting for clients on their turns.
+
+        Returns:
+            The final score.
+        """
+        game = self.game
+        loop = asyncio.get_event_loop()
+
+        while not game.is_finished:
+            seat = game.current_player_index
+
+            if seat < len(self.writers):
+                self._pending = loop.create_future()
+                self.send(seat, {'type': 'turn', 'state': self.describe(seat)})
+                game.apply_move(await self._pending)
+            else:
+                game.players[seat].get_move()
+
+            game.end_turn()
+
+            # Waiting for the clients to read what was sent bounds the
+            # memory buffered for each of them. Yielding afterwards lets
+            # other tables run between bot moves.
+            await self._drain()
+            await asyncio.sleep(0)
+
+        game.emit(events.Event.GAME_OVER, score=game.score)
+        await self._drain()
+        self.close()
+
+        return game.score
+
+    def send(self, seat, message):
+        """
+        Send a message to a client.
+
+        Args:
+            seat:
+                The seat of the client.
+            message:
+                A JSON serializable message.
+        """
+        writer = self.writers[seat]
+
+        if writer is not None and not writer.transport.is_closing():
+            writer.write(json.dumps(message).encode() + b'\n')
+
+    def _broadcast(self, game, event, **details):
+        """
+        Send an event in the game to every client. Cards drawn by a
+        client are hidden from them.
+        """
+        message = {'type': 'event', 'event': event.value}
+
+        if 'player' in details:
+            message['seat'] = details['player'].player_index
+
+        for key in [
+                'card_index', 'card_indices', 'number', 'score',
+                'turns_remaining',
+        ]:
+            if details.get(key) is not None:
+                message[key] = details[key]
+
+        if details.get('target') is not None:
+            message['target'] = details['target'].player_index
+
+        if details.get('color') is not None:
+            message['color'] = details['color'].value
+
+        for seat in range(len(self.writers)):
+            if 'card' in details and not (
+                    event == events.Event.DRAW and message['seat'] == seat
+            ):
+                self.send(seat, dict(message, card=str(details['card'])))
+            else:
+                self.send(seat, message)
+
+    async def _drain(self):
+        """
+        Wait for the data sent to each client to be flushed.
+        """
+        for writer in self.writers:
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+
+class Server:
+    """
+    An asyncio server hosting many games at once.
+
+    Clients connect and send ``JOIN <players> <humans>`` to be seated at
+    a table for the given number of players with the given number of
+    client seats. Once a table's client seats are filled, its game
+    starts, with bots taking the remaining seats. Each client is sent a
+    JSON message on every line, and a ``turn`` message when they should
+    send a move.
+    """
+
+    def __init__(self, bot_class=players.GodPlayer, seed=0):
+        """
+        Create a new server.
+
+        Args:
+            bot_class:
+                The class of the players filling the seats not taken by
+                clients.
+            seed:
+                The seed that each table's deal is derived from.
+        """
+        self.bot_class = bot_class
+        self.games_played = 0
+        self.seed = seed
+        self.tables = {}
+
+        self._table_ids = itertools.count()
+
+        # Tables waiting for clients, keyed by the number of players and
+        # the number of client seats.
+        self._waiting = {}
+
+    async def handle_client(self, reader, writer):
+        """
+        Serve a single client connection.
+
+        Args:
+            reader:
+                The stream to read the client's lines from.
+            writer:
+                The stream to write messages to the client.
+        """
+        table = None
+        seat = None
+
+        try:
+            while table is None or not table.is_finished:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The client sent a line longer than the limit.
+                    break
+                except ConnectionError:
+                    break
+
+                if not line:
+                    break
+
+                line = line.decode(errors='replace')
+
+                if table is None:
+                    table, seat = self._join(line, writer)
+                    if table is None:
+                        await self._drain(writer)
+
+                    continue
+
+                error = table.receive(seat, line)
+                if error is not None:
+                    table.send(seat, {'type': 'error', 'message': error})
+
+                    # Errors are sent in reply to the client's own lines,
+                    # so a client that sends bad lines without reading the
+                    # replies is stopped from sending more until it does.
+                    await self._drain(writer)
+        finally:
+            if table is not None and not table.is_finished:
+                self._remove(table)
+                table.abort(f'Player {seat} left the game.')
+
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """
+        Start listening for clients.
+
+        Args:
+            host:
+                The host to listen on.
+            port:
+                The TCP port to listen on. Port 0 picks a free port.
+            path:
+                If provided, listen on a Unix socket at this path
+                instead of TCP.
+
+        Returns:
+            The started :class:`asyncio.AbstractServer`.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(
+                self.handle_client, path, limit=MAX_LINE_LENGTH
+            )
+
+        return await asyncio.start_server(
+            self.handle_client, host, port, limit=MAX_LINE_LENGTH
+        )
+
+    def _join(self, line, writer):
+        """
+        Seat a client at a table.
+
+        Args:
+            line:
+                The client's ``JOIN`` line.
+            writer:
+                The stream to write messages to the client.
+
+        Returns:
+            A tuple containing the table and seat, or ``(None, None)``
+            if the line was not a valid ``JOIN`` command.
+        """
+        command, *args = line.split() or ['']
+
+        try:
+            player_count, humans = (int(arg) for arg in args)
+        except ValueError:
+            player_count = humans = 0
+
+        if (
+                command.upper() != 'JOIN'
+                or player_count not in PLAYER_COUNTS
+                or not 1 <= humans <= player_count
+        ):
+            writer.write(json.dumps({
+                'type': 'error',
+                'message': 'Send JOIN <players> <humans> to join a game.',
+            }).encode() + b'\n')
+
+            return None, None
+
+        key = (player_count, humans)
+        table = self._waiting.get(key)
+        if table is None:
+            table_id = next(self._table_ids)
+            table = Table(
+                table_id,
+                player_count,
+                humans,
+                bot_class=self.bot_class,
+                rng=simulation.derive_seed(self.seed, table_id),
+            )
+            self._waiting[key] = table
+            self.tables[table_id] = table
+
+        seat = table.writers.index(None)
+        table.writers[seat] = writer
+        table.send(seat, {
+            'type': 'seat',
+            'players': player_count,
+            'seat': seat,
+            'table': table.id,
+        })
+
+        if table.is_full:
+            del self._waiting[key]
+            table.task = asyncio.ensure_future(table.run())
+            table.task.add_done_callback(lambda _: self._finish(table))
+
+        return table, seat
+
+    @staticmethod
+    async def _drain(writer):
+        """
+        Wait for the data sent to a client to be flushed.
+
+        Args:
+            writer:
+                The stream to the client.
+        """
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def _finish(self, table):
+        """
+        Forget about a table once its game has ended.
+        """
+        self._remove(table)
+
+        if table.task.cancelled():
+            return
+
+        if table.task.exception() is not None:
+            table.abort('The game stopped unexpectedly.')
+
+            return
+
+        self.games_played += 1
+
+    def _remove(self, table):
+        """
+        Stop tracking a table.
+        """
+        self.tables.pop(table.id, None)
+
+        for key, waiting in list(self._waiting.items()):
+            if waiting is table:
+                del self._waiting[key]
+
+
+LoadResult = collections.namedtuple(
+    'LoadResult', ['games', 'moves', 'elapsed']
+)
+"""
+The outcome of a load test.
+"""
+
+
+async def play_client(connect, player_count, humans):
+    """
+    Play a game as a client that gives hints while it can and otherwise
+    discards its oldest card.
+
+    Args:
+        connect:
+            A coroutine function that opens a connection to the server
+            and returns a reader and writer.
+        player_count:
+            The number of players in the game.
+        humans:
+            The number of client seats in the game.
+
+    Returns:
+        A tuple containing the number of moves made and the final
+        score.
+    """
+    reader, writer = await connect()
+    writer.write(f'JOIN {player_count} {humans}\n'.encode())
+
+    moves = 0
+    score = None
+
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            message = json.loads(line)
+
+            if message['type'] == 'error':
+                raise RuntimeError(message['message'])
+
+            if message['type'] == 'turn':
+                if message['state']['hints'] > 0:
+                    writer.write(b'HINT\n')
+                else:
+                    writer.write(b'DISCARD 0\n')
+
+                moves += 1
+            elif message.get('event') == events.Event.GAME_OVER.value:
+                score = message['score']
+    finally:
+        writer.close()
+
+    return moves, score
+
+
+async def load_test(connect, tables, player_count=4, humans=1):
+    """
+    Play many games at once against a server.
+
+    Args:
+        connect:
+            A coroutine function that opens a connection to the server
+            and returns a reader and writer.
+        tables:
+            The number of games to play concurrently.
+        player_count:
+            The number of players in each game.
+        humans:
+            The number of client seats in each game.
+
+    Returns:
+        A :class:`LoadResult` describing the games played.
+    """
+    start = time.perf_counter()
+
+    results = await asyncio.gather(*(
+        play_client(connect, player_count, humans)
+        for _ in range(tables * humans)
+    ))
+
+    elapsed = time.perf_counter() - start
+
+    return LoadResult(
+        games=tables,
+        moves=sum(moves for moves, _ in results),
+        elapsed=elapsed,
+    )
+
+
+def main():
+    """
+    Run a server, or a load test against one, from the command line.
+    """
+    import argparse
+    import resource
+
+    parser = argparse.ArgumentParser(
+        description='Host many games of Hanabi over a line protocol.'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', default=7777, type=int)
+    parser.add_argument(
+        '--unix', default=None,
+        help='Use a Unix socket at this path instead of TCP.',
+    )
+    parser.add_argument(
+        '--bot-class', default='GodPlayer',
+        help='The name of the player class in hanabi.players that fills '
+             'empty seats.',
+    )
+    parser.add_argument(
+        '--seed', default=0, type=int,
+        help='The seed that the deals are derived from.',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.required = True
+
+    subparsers.add_parser('serve', help='Run a server.')
+
+    load_parser = subparsers.add_parser(
+        'load',
+        help='Play many concurrent games against a server.',
+    )
+    load_parser.add_argument(
+        '--tables', default=200, type=int,
+        help='The number of games to play at once.',
+    )
+    load_parser.add_argument('--players', default=4, type=int)
+    load_parser.add_argument(
+        '--humans', default=1, type=int,
+        help='The number of client seats at each table.',
+    )
+    load_parser.add_argument(
+        '--in-process', action='store_true',
+        help='Start a server in this process to test against.',
+    )
+    args = parser.parse_args()
+
+    async def connect():
+        if args.unix is not None:
+            return await asyncio.open_unix_connection(
+                args.unix, limit=2 ** 20
+            )
+
+        return await asyncio.open_connection(
+            args.host, args.port, limit=2 ** 20
+        )
+
+    loop = asyncio.get_event_loop()
+
+    if args.command == 'serve' or args.in_process:
+        server = Server(
+            bot_class=getattr(players, args.bot_class),
+            seed=args.seed,
+        )
+        listener = loop.run_until_complete(server.start(
+            host=args.host, port=args.port, path=args.unix
+        ))
+
+        if args.unix is None:
+            args.host, args.port = listener.sockets[0].getsockname()[:2]
+
+    if args.command == 'serve':
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+
+        return
+
+    result = loop.run_until_complete(load_test(
+        connect, args.tables, player_count=args.players, humans=args.humans
+    ))
+    peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f'Played {result.games:,} games in {result.elapsed:.2f} seconds.')
+    print(f'\tClient moves: {result.moves / result.elapsed:,.0f}/second')
+    print(f'\tPeak memory: {peak_memory / 1024:,.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
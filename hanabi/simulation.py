@@ -0,0 +1,567 @@
+import collections
+import hashlib
+import itertools
+import multiprocessing
+import os
+import time
+
+from hanabi import game as game_module
+from hanabi import players, stats
+
+
+DEFAULT_CHUNK_SIZE = 1_000
+"""
+The default number of trials in each chunk of work handed to a worker.
+"""
+
+MIN_PRECISION_TRIALS = 100
+"""
+The default minimum number of trials before a precision target can stop
+a run. A handful of games often have identical scores by chance, which
+gives a confidence interval of zero width.
+"""
+
+TASKS_PER_WORKER = 2
+"""
+The number of chunks queued for each worker at a time. Chunks are only
+created as they are needed, so a run can be stopped early without
+building its remaining work.
+"""
+
+
+def derive_seed(run_seed, index):
+    """
+    Derive an independent seed from a run seed and an index.
+
+    Args:
+        run_seed:
+            The seed for the entire run.
+        index:
+            The index of the unit of work (such as a trial) being
+            seeded.
+
+    Returns:
+        A 64-bit integer seed that depends only on the run seed and the
+        index.
+    """
+    digest = hashlib.blake2b(
+        f'{run_seed}:{index}'.encode(), digest_size=8
+    ).digest()
+
+    return int.from_bytes(digest, 'little')
+
+
+class SimulationResult:
+    """
+    The merged outcome of a batch of simulated games.
+    """
+
+    def __init__(self):
+        """
+        Create a new, empty result.
+        """
+        self.elapsed = 0.0
+        self.statistics = stats.ScoreStatistics()
+        self.worker_stats = collections.defaultdict(lambda: [0, 0.0])
+
+    @property
+    def average_score(self):
+        """
+        Returns:
+            The mean score across all trials.
+        """
+        return self.statistics.mean
+
+    @property
+    def histogram(self):
+        """
+        Returns:
+            A counter mapping each score to the number of trials that
+            ended with it.
+        """
+        return self.statistics.histogram
+
+    @property
+    def total_score(self):
+        """
+        Returns:
+            The sum of the scores of every trial.
+        """
+        return self.statistics.total
+
+    @property
+    def trials(self):
+        """
+        Returns:
+            The number of trials played.
+        """
+        return self.statistics.count
+
+    @property
+    def win_percentage(self):
+        """
+        Returns:
+            The percentage of trials that ended in a win.
+        """
+        return self.statistics.win_rate * 100
+
+    @property
+    def wins(self):
+        """
+        Returns:
+            The number of trials that ended in a win.
+        """
+        return self.statistics.wins
+
+    def add_chunk(self, chunk_result):
+        """
+        Merge the result of a single chunk into this result.
+
+        Args:
+            chunk_result:
+                A :class:`ChunkResult` produced by :func:`run_chunk`.
+        """
+        self.statistics.merge(chunk_result.statistics)
+
+        worker_stats = self.worker_stats[chunk_result.worker]
+        worker_stats[0] += chunk_result.statistics.count
+        worker_stats[1] += chunk_result.elapsed
+
+    def worker_throughput(self):
+        """
+        Returns:
+            A dictionary mapping each worker's identifier to the number
+            of trials it completed per second of work.
+        """
+        return {
+            worker: trials / elapsed if elapsed else 0.0
+            for worker, (trials, elapsed) in self.worker_stats.items()
+        }
+
+
+def build_game(
+        run_seed, trial, player_classes, game_class=None, deals=None
+):
+    """
+    Create the game played for a specific trial of a run. The deal only
+    depends on the run seed and the trial's index, so any trial can be
+    re-created to inspect or replay it.
+
+    Args:
+        run_seed:
+            The seed for the entire run.
+        trial:
+            The index of the trial within the run.
+        player_classes:
+            The classes used to represent each player.
+        game_class:
+            The class of the game, for games played with different
+            rules. Defaults to :class:`hanabi.game.Game`.
+        deals:
+            An optional :class:`hanabi.deals.DealPool`. If provided, the
+            trial's deal is the pool's deal with the same index, and the
+            run seed is not used.
+
+    Returns:
+        A new game with the trial's deal.
+    """
+    if game_class is None:
+        game_class = game_module.Game
+
+    if deals is not None:
+        return game_class(player_classes, deck=deals.deck(trial))
+
+    return game_class(player_classes, rng=derive_seed(run_seed, trial))
+
+
+ChunkResult = collections.namedtuple(
+    'ChunkResult',
+    [
+        'index',
+        'statistics',
+        'elapsed',
+        'worker',
+        'records',
+        'moves',
+        'turns',
+    ],
+)
+"""
+The outcome of a chunk of trials. The records are an array of
+:data:`hanabi.results.RECORD_DTYPE` with one record for each game in
+trial order, or ``None`` if the chunk was not recorded. Likewise, the
+moves are the chunk's games encoded with
+:func:`hanabi.movelog.encode_game`, or ``None`` if they were not logged.
+The turns are the total number of turns played in the chunk's games.
+"""
+
+
+def run_chunk(task):
+    """
+    Play a chunk of games. This is the unit of work executed by each
+    worker process.
+
+    Args:
+        task:
+            A tuple containing the chunk index, the index of the chunk's
+            first trial, the number of trials in the chunk, the run
+            seed, the player class, the number of players, whether to
+            record each game, whether to deal from the process's
+            :class:`hanabi.deals.DealPool`, whether to stop each game
+            once it can't be won, and whether to log each game's moves.
+
+    Returns:
+        A :class:`ChunkResult` describing the games played.
+    """
+    (
+        index,
+        first_trial,
+        trials,
+        seed,
+        player_class,
+        player_count,
+        record,
+        pooled,
+        win_only,
+        log_moves,
+    ) = task
+
+    statistics = stats.ScoreStatistics()
+    player_classes = [player_class] * player_count
+
+    deal_pool = None
+    if pooled:
+        from hanabi import deals
+
+        deal_pool = deals.attached()
+
+    records = None
+    if record:
+        from hanabi import results
+
+        records = results.empty_records(trials)
+
+    moves = None
+    if log_moves:
+        from hanabi import movelog
+
+        moves = bytearray()
+
+    turns = 0
+    start = time.perf_counter()
+
+    for i, trial in enumerate(range(first_trial, first_trial + trials)):
+        game = build_game(seed, trial, player_classes, deals=deal_pool)
+
+        if moves is not None:
+            recorder = movelog.MoveRecorder.attach(game)
+
+        game.play(win_only)
+
+        # The bound is the score of a finished game, and otherwise the
+        # best score a game stopped early could have reached.
+        statistics.add(game.max_score if win_only else game.score)
+        turns += game.turns_played
+
+        if records is not None:
+            game_seed = trial if pooled else derive_seed(seed, trial)
+            records[i] = results.game_record(game, game_seed)
+
+        if moves is not None:
+            moves += movelog.encode_game(
+                derive_seed(seed, trial),
+                player_count,
+                game.score,
+                recorder.moves,
+            )
+
+    elapsed = time.perf_counter() - start
+
+    if moves is not None:
+        moves = bytes(moves)
+
+    return ChunkResult(
+        index, statistics, elapsed, os.getpid(), records, moves, turns
+    )
+
+
+def build_tasks(
+        trials,
+        seed,
+        player_class,
+        player_count,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        record=False,
+        pooled=False,
+        win_only=False,
+        log_moves=False,
+):
+    """
+    Split a run into chunks of trials.
+
+    Args:
+        trials:
+            The total number of trials to run, or ``None`` to keep
+            producing chunks indefinitely.
+        seed:
+            The seed for the entire run.
+        player_class:
+            The class used for every player.
+        player_count:
+            The number of players in each game.
+        chunk_size:
+            The maximum number of trials in each chunk.
+        record:
+            A boolean indicating if a record should be kept of each
+            game.
+        pooled:
+            A boolean indicating if the games are dealt from the deal
+            pool that the workers are attached to.
+        win_only:
+            A boolean indicating if each game stops as soon as it can no
+            longer be won.
+        log_moves:
+            A boolean indicating if the moves of each game should be
+            logged.
+
+    Returns:
+        An iterator over tasks that can be passed to :func:`run_chunk`.
+    """
+    for index in itertools.count():
+        start = index * chunk_size
+
+        if trials is not None and start >= trials:
+            return
+
+        size = chunk_size
+        if trials is not None:
+            size = min(size, trials - start)
+
+        yield (
+            index,
+            start,
+            size,
+            seed,
+            player_class,
+            player_count,
+            record,
+            pooled,
+            win_only,
+            log_moves,
+        )
+
+
+def run_chunks(
+        tasks, workers=1, func=run_chunk, initializer=None, initargs=()
+):
+    """
+    Run chunks of trials, spreading them over a pool of processes.
+
+    Only a few chunks per worker are queued at a time, so the tasks may
+    be an unbounded iterator. Closing the returned generator stops the
+    pool.
+
+    Args:
+        tasks:
+            An iterable of tasks to pass to the chunk function.
+        workers:
+            The number of worker processes to use. If this is 1, the
+            chunks are run in the current process.
+        func:
+            The function that runs a single chunk. It must be importable
+            by the worker processes.
+        initializer:
+            An optional function called with the initial arguments in
+            each worker process before it runs any chunks. If there is a
+            single worker, it is called in the current process.
+        initargs:
+            The arguments for the initializer.
+
+    Returns:
+        A generator yielding the result of each task, in the same order
+        as the tasks. By default, these are :class:`ChunkResult`
+        instances.
+    """
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+
+        for task in tasks:
+            yield func(task)
+
+        return
+
+    pool = multiprocessing.Pool(workers, initializer, initargs)
+    pending = collections.deque()
+    tasks = iter(tasks)
+
+    try:
+        for task in itertools.islice(tasks, workers * TASKS_PER_WORKER):
+            pending.append(pool.apply_async(func, (task,)))
+
+        while pending:
+            chunk_result = pending.popleft().get()
+
+            for task in itertools.islice(tasks, 1):
+                pending.append(pool.apply_async(func, (task,)))
+
+            yield chunk_result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run_trials(
+        trials,
+        player_class=players.GodPlayer,
+        player_count=4,
+        workers=1,
+        seed=0,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        progress=None,
+        precision=None,
+        metric='win_rate',
+        min_trials=MIN_PRECISION_TRIALS,
+        writer=None,
+        deals=None,
+        win_only=False,
+        move_log=None,
+        metrics=None,
+):
+    """
+    Run a number of games, spreading them over a pool of processes.
+
+    Each trial's deal is derived from the run seed and the trial's
+    index, so the merged result is identical for any number of workers
+    and any chunk size.
+
+    Args:
+        trials:
+            The maximum number of games to play, or ``None`` for no
+            limit. A limit is required if no precision is given.
+        player_class:
+            The class used for every player.
+        player_count:
+            The number of players in each game.
+        workers:
+            The number of worker processes to use. If this is 1, the
+            games are played in the current process.
+        seed:
+            The seed for the entire run.
+        chunk_size:
+            The maximum number of trials in each chunk.
+        progress:
+            An optional callable that receives the number of trials in
+            each chunk as it completes.
+        precision:
+            If provided, the run stops as soon as the half-width of the
+            95% confidence interval for the chosen metric drops below
+            this value. The check is made after each chunk in order, so
+            the stopping point does not depend on the number of workers.
+        metric:
+            The metric that the precision applies to. Either ``'mean'``
+            for the mean score or ``'win_rate'`` for the win rate.
+        min_trials:
+            The minimum number of games to play before stopping early.
+            See :data:`MIN_PRECISION_TRIALS`.
+        writer:
+            An optional :class:`hanabi.results.ResultWriter` that a
+            record of each game is appended to, in trial order.
+        deals:
+            An optional :class:`hanabi.deals.DealPool` to deal each trial
+            from instead of shuffling a deck for it. The pool is shared
+            with the workers when they start, and must have a deal for
+            every trial.
+        win_only:
+            A boolean indicating if only the number of wins matters. If
+            it does, each game stops as soon as it can no longer be won
+            and counts as a loss with the best score it could have
+            reached, which skips most of the turns of lost games. The
+            win rate is exact, but the scores are only upper bounds.
+        move_log:
+            An optional :class:`hanabi.movelog.MoveLogWriter` that the
+            moves of each game are appended to, in trial order. Games
+            are logged with the seed their deck was shuffled with, so
+            they can't be dealt from a pool.
+        metrics:
+            An optional :class:`hanabi.metrics.SimulationMetrics` that
+            is updated as each chunk completes.
+
+    Returns:
+        A :class:`SimulationResult` containing the merged results.
+    """
+    if trials is None and precision is None:
+        raise ValueError(
+            'Either a number of trials or a precision is required.'
+        )
+
+    if win_only:
+        if writer is not None or move_log is not None:
+            raise ValueError('Games stopped early cannot be recorded.')
+
+        if precision is not None and metric != 'win_rate':
+            raise ValueError(
+                'Only the win rate can be measured when games are stopped '
+                'early.'
+            )
+
+    initializer = None
+    initargs = ()
+    if deals is not None:
+        from hanabi import deals as deals_module
+
+        if trials is None or trials > len(deals):
+            raise ValueError('The deal pool must have a deal for each trial.')
+
+        if move_log is not None:
+            raise ValueError('Games dealt from a pool cannot be logged.')
+
+        initializer = deals_module.attach
+        initargs = (deals.array, deals.count)
+
+    tasks = build_tasks(
+        trials,
+        seed,
+        player_class,
+        player_count,
+        chunk_size,
+        record=writer is not None,
+        pooled=deals is not None,
+        win_only=win_only,
+        log_moves=move_log is not None,
+    )
+    result = SimulationResult()
+
+    start = time.perf_counter()
+
+    chunk_results = run_chunks(
+        tasks, workers, initializer=initializer, initargs=initargs
+    )
+    try:
+        for chunk_result in chunk_results:
+            result.add_chunk(chunk_result)
+
+            if writer is not None:
+                writer.extend(chunk_result.records)
+
+            if move_log is not None:
+                move_log.write(chunk_result.moves)
+
+            if metrics is not None:
+                metrics.add_chunk(chunk_result)
+
+            if progress is not None:
+                progress(chunk_result.statistics.count)
+
+            if (
+                    precision is not None
+                    and result.trials >= min_trials
+                    and result.statistics.half_width(metric) < precision
+            ):
+                break
+    finally:
+        chunk_results.close()
+
+    result.elapsed = time.perf_counter() - start
+
+    return result
@@ -0,0 +1,574 @@
+import collections
+import random
+
+from hanabi import cards
+from hanabi.game import Game
+
+
+PLAY = 0
+DISCARD = 1
+HINT = 2
+
+DEFAULT_MAX_NODES = 100000
+"""
+The number of states a search may expand before giving up, unless told
+otherwise. Most deals need far fewer, but a few, mostly unwinnable two
+player deals, would otherwise take minutes. At this budget, a search
+gives up after a few seconds.
+"""
+
+SolverResult = collections.namedtuple(
+    'SolverResult', ['score', 'exact', 'nodes']
+)
+"""
+The outcome of solving a deal. If ``exact`` is false, the node budget
+ran out and ``score`` is the best score found, which is a lower bound on
+the maximum achievable score.
+"""
+
+
+class NodeBudgetExceeded(Exception):
+    """
+    Raised internally when a search visits more nodes than allowed.
+    """
+
+
+class Solver:
+    """
+    Find the maximum score achievable for a deal when every player knows
+    every card, including the order of the deck.
+
+    The solver follows the same rules as :class:`hanabi.game.Game` and
+    searches every sequence of plays, discards, and hints with a
+    transposition table keyed by Zobrist hashes, which are updated
+    incrementally as moves are made and undone. Bombs are never
+    considered since setting one off only lowers the score and uses up
+    a card. The search is pruned in a few ways:
+
+    * Hands are treated as multisets, so identical cards and the order
+      of cards in a hand never produce separate moves.
+    * If a hand contains a card that can never be played, that is the
+      only card considered for discarding, since keeping it instead of
+      another card can never help.
+    * The search of a state stops as soon as a line reaches the upper
+      bound on its score, which counts the cards that can still be
+      reached in each color and the turns left to play them. Cards that
+      can never be played in time, such as the last card in the deck or
+      cards held by players without another turn, are excluded.
+    """
+
+    def __init__(self, deck, player_count, game_class=Game, seed=0):
+        """
+        Prepare to solve a deal.
+
+        Args:
+            deck:
+                The deck to deal from. Like :class:`hanabi.cards.Deck`,
+                cards are drawn from the end of the list. The deck is
+                not modified.
+            player_count:
+                The number of players in the game.
+            game_class:
+                The game class whose rules the solver follows.
+            seed:
+                The seed for the Zobrist keys.
+        """
+        if isinstance(deck, cards.Deck):
+            deck = deck.cards
+
+        self.deck = [card.index for card in deck]
+        self.game_class = game_class
+        self.player_count = player_count
+        self.hint_giving_numbers = set(game_class.HINT_GIVING_NUMBERS)
+
+        card_count = len(cards.ALL_CARDS)
+        colors = len(cards.Colors)
+        self.colors = [
+            cards.COLOR_INDICES[card.color] for card in cards.ALL_CARDS
+        ]
+        self.numbers = [card.number for card in cards.ALL_CARDS]
+
+        # The cards left in the deck that could still be played for
+        # every possible deck size. The last card in the deck can never
+        # be played, since the player who draws it does not get another
+        # turn.
+        self.deck_counts = [[0] * card_count, [0] * card_count]
+        for index in self.deck[1:]:
+            counts = self.deck_counts[-1].copy()
+            counts[index] += 1
+            self.deck_counts.append(counts)
+
+        # The position of the copy of each card that will be drawn first
+        # for every possible deck size, or -1 if no playable copy is
+        # left in the deck.
+        self.next_copies = [[-1] * card_count, [-1] * card_count]
+        for position, index in enumerate(self.deck[1:], start=1):
+            positions = self.next_copies[-1].copy()
+            positions[index] = position
+            self.next_copies.append(positions)
+
+        rng = random.Random(seed)
+        max_copies = max(cards.Deck.CARD_COUNT_MAP.values())
+
+        def keys(*shape):
+            if len(shape) == 1:
+                return [rng.getrandbits(64) for _ in range(shape[0])]
+
+            return [keys(*shape[1:]) for _ in range(shape[0])]
+
+        self.hand_keys = keys(player_count, card_count, max_copies + 1)
+        self.stack_keys = keys(colors, cards.NUMBERS_PER_COLOR + 1)
+        self.hint_keys = keys(game_class.MAX_HINTS + 1)
+        self.deck_keys = keys(len(self.deck) + 1)
+        self.turn_keys = keys(player_count + 2)
+        self.player_keys = keys(player_count)
+
+        self.table = {}
+        self.nodes = 0
+        self.max_nodes = None
+        self.best_found = 0
+
+        self._reset()
+
+    def _reset(self):
+        """
+        Deal the cards and set up the initial state of the game.
+        """
+        card_count = len(cards.ALL_CARDS)
+
+        self.hands = [[0] * card_count for _ in range(self.player_count)]
+        self.held = [0] * card_count
+        self.stacks = [0] * len(cards.Colors)
+        self.deck_size = len(self.deck)
+        self.hints = self.game_class.MAX_HINTS
+        self.turns_remaining = None
+        self.player = 0
+        self.score = 0
+
+        self.hash = (
+            self.hint_keys[self.hints]
+            ^ self.turn_keys[0]
+            ^ self.player_keys[0]
+        )
+        for color in range(len(cards.Colors)):
+            self.hash ^= self.stack_keys[color][0]
+
+        for _ in range(self.game_class.CARDS_PER_PLAYER):
+            for player in range(self.player_count):
+                self._take_card(player)
+
+        self.hash ^= self.deck_keys[self.deck_size]
+
+    def _take_card(self, player):
+        """
+        Move the top card of the deck into a player's hand.
+
+        Args:
+            player:
+                The player receiving the card.
+
+        Returns:
+            The index of the card.
+        """
+        self.deck_size -= 1
+        card = self.deck[self.deck_size]
+        self._add_card(player, card)
+
+        return card
+
+    def _return_card(self, player, card):
+        """
+        Put a card from a player's hand back on top of the deck.
+
+        Args:
+            player:
+                The player holding the card.
+            card:
+                The index of the card.
+        """
+        self._remove_card(player, card)
+        self.deck_size += 1
+
+    def _remove_card(self, player, card):
+        """
+        Remove a card from a player's hand.
+        """
+        hand = self.hands[player]
+        self.hash ^= self.hand_keys[player][card][hand[card]]
+        hand[card] -= 1
+        self.held[card] -= 1
+
+    def _add_card(self, player, card):
+        """
+        Add a card to a player's hand.
+        """
+        hand = self.hands[player]
+        hand[card] += 1
+        self.held[card] += 1
+        self.hash ^= self.hand_keys[player][card][hand[card]]
+
+    def _set_hints(self, hints):
+        """
+        Set the number of available hints.
+        """
+        self.hash ^= self.hint_keys[self.hints] ^ self.hint_keys[hints]
+        self.hints = hints
+
+    def _set_turns_remaining(self, turns_remaining):
+        """
+        Set the number of turns left in the final round.
+        """
+        old = 0 if self.turns_remaining is None else self.turns_remaining + 1
+        new = 0 if turns_remaining is None else turns_remaining + 1
+
+        self.hash ^= self.turn_keys[old] ^ self.turn_keys[new]
+        self.turns_remaining = turns_remaining
+
+    def _set_player(self, player):
+        """
+        Set the player whose turn it is.
+        """
+        self.hash ^= self.player_keys[self.player] ^ self.player_keys[player]
+        self.player = player
+
+    def _set_stack(self, color, height):
+        """
+        Set the height of a color's stack.
+        """
+        self.hash ^= (
+            self.stack_keys[color][self.stacks[color]]
+            ^ self.stack_keys[color][height]
+        )
+        self.score += height - self.stacks[color]
+        self.stacks[color] = height
+
+    @property
+    def is_finished(self):
+        """
+        Returns:
+            A boolean indicating if the game is over.
+        """
+        return (
+            self.score == len(cards.Colors) * cards.NUMBERS_PER_COLOR
+            or self.deck_size == 0 and self.turns_remaining == 0
+        )
+
+    def _reachable(self):
+        """
+        Determine how high each stack could still be built.
+
+        Returns:
+            A list containing the highest number each color's stack can
+            reach with the cards in the deck and the hands of players
+            who still get a turn.
+        """
+        if self.deck_size:
+            available = [
+                deck_count + held
+                for deck_count, held in zip(
+                    self.deck_counts[self.deck_size], self.held
+                )
+            ]
+        else:
+            available = [0] * len(self.held)
+
+            for offset in range(self.turns_remaining):
+                hand = self.hands[(self.player + offset) % self.player_count]
+
+                for card, count in enumerate(hand):
+                    available[card] += count
+
+        reachable = []
+        for color, height in enumerate(self.stacks):
+            start = color * cards.NUMBERS_PER_COLOR
+            while (
+                    height < cards.NUMBERS_PER_COLOR
+                    and available[start + height]
+            ):
+                height += 1
+
+            reachable.append(height)
+
+        return reachable
+
+    def _upper_bound(self, reachable):
+        """
+        Get an upper bound on the final score from the current state.
+
+        Args:
+            reachable:
+                The highest reachable number for each color.
+
+        Returns:
+            The upper bound.
+        """
+        needed = sum(reachable) - self.score
+
+        if not self.deck_size:
+            return self.score + min(needed, self.turns_remaining)
+
+        final_turns = self.player_count - 1
+        bound = min(needed, self.deck_size + final_turns)
+
+        # A card that is still in the deck can only be played after it
+        # is drawn, and so can every higher card of its color. Once the
+        # card at a given position is drawn, there are only as many
+        # plays left as there are cards below it plus the final round.
+        next_copies = self.next_copies[self.deck_size]
+        waiting = []
+        for color, height in enumerate(self.stacks):
+            start = color * cards.NUMBERS_PER_COLOR
+            for card in range(start + height, start + reachable[color]):
+                if not self.held[card]:
+                    waiting.append((next_copies[card], color, card - start))
+
+        waiting.sort()
+        first_waiting = reachable.copy()
+        waiting_plays = 0
+
+        for position, color, number in waiting:
+            if number < first_waiting[color]:
+                waiting_plays += first_waiting[color] - number
+                first_waiting[color] = number
+
+                bound = min(
+                    bound,
+                    needed - waiting_plays
+                    + min(waiting_plays, position + final_turns),
+                )
+
+        return self.score + bound
+
+    def _moves(self, reachable):
+        """
+        List the moves worth considering for the current player, with
+        the most promising moves first.
+
+        Args:
+            reachable:
+                The highest reachable number for each color.
+
+        Returns:
+            A list of ``(move type, card index)`` tuples.
+        """
+        plays = []
+        dead = []
+        useful = []
+
+        for card, count in enumerate(self.hands[self.player]):
+            if not count:
+                continue
+
+            color = self.colors[card]
+            number = self.numbers[card]
+
+            if number == self.stacks[color] + 1:
+                plays.append((number, card))
+            elif number <= self.stacks[color] or number > reachable[color]:
+                dead.append(card)
+            else:
+                useful.append((-cards.ALL_CARDS[card].copies, card))
+
+        moves = [(PLAY, card) for _, card in sorted(plays)]
+
+        # Prefer stalling with a hint when the deck is about to run out.
+        if self.hints and self.deck_size == 1:
+            moves.append((HINT, None))
+
+        if dead:
+            moves.append((DISCARD, dead[0]))
+
+        if self.hints and self.deck_size != 1:
+            moves.append((HINT, None))
+
+        if not dead:
+            moves.extend((DISCARD, card) for _, card in sorted(useful))
+
+            # Playable cards may also be discarded, such as when
+            # another copy is held by a player who can play it first.
+            moves.extend((DISCARD, card) for _, card in sorted(plays))
+
+        return moves
+
+    def _make(self, move):
+        """
+        Make a move for the current player and advance the turn.
+
+        Args:
+            move:
+                The move to make.
+
+        Returns:
+            The information needed to undo the move.
+        """
+        kind, card = move
+        player = self.player
+        previous = (self.hints, self.turns_remaining, player)
+        drew = False
+
+        if kind == HINT:
+            self._set_hints(self.hints - 1)
+        else:
+            self._remove_card(player, card)
+
+            if kind == PLAY:
+                color = self.colors[card]
+                self._set_stack(color, self.stacks[color] + 1)
+
+                if self.numbers[card] in self.hint_giving_numbers:
+                    self._set_hints(
+                        min(self.hints + 1, self.game_class.MAX_HINTS)
+                    )
+            else:
+                self._set_hints(min(self.hints + 1, self.game_class.MAX_HINTS))
+
+            if self.deck_size:
+                self.hash ^= self.deck_keys[self.deck_size]
+                self._take_card(player)
+                self.hash ^= self.deck_keys[self.deck_size]
+                drew = True
+
+                if not self.deck_size and self.turns_remaining is None:
+                    self._set_turns_remaining(self.player_count)
+
+        if self.turns_remaining is not None:
+            self._set_turns_remaining(self.turns_remaining - 1)
+
+        self._set_player((player + 1) % self.player_count)
+
+        return move, drew, previous
+
+    def _unmake(self, undo):
+        """
+        Undo a move made with :meth:`_make`.
+
+        Args:
+            undo:
+                The information returned when the move was made.
+        """
+        (kind, card), drew, (hints, turns_remaining, player) = undo
+
+        self._set_player(player)
+        self._set_turns_remaining(turns_remaining)
+        self._set_hints(hints)
+
+        if drew:
+            self.hash ^= self.deck_keys[self.deck_size]
+            self._return_card(player, self.deck[self.deck_size])
+            self.hash ^= self.deck_keys[self.deck_size]
+
+        if kind != HINT:
+            if kind == PLAY:
+                color = self.colors[card]
+                self._set_stack(color, self.stacks[color] - 1)
+
+            self._add_card(player, card)
+
+    def _search(self, floor):
+        """
+        Find the best final score reachable from the current state.
+
+        Args:
+            floor:
+                A score the caller can already reach. If the best score
+                from this state is no better, an upper bound that does
+                not exceed the floor may be returned instead.
+
+        Returns:
+            The best final score, or an upper bound on it that is no
+            greater than the floor.
+        """
+        if self.is_finished:
+            if self.score > self.best_found:
+                self.best_found = self.score
+
+            return self.score
+
+        key = self.hash
+        entry = self.table.get(key)
+        if entry is not None:
+            value, exact = entry
+
+            if exact or value <= floor:
+                return value
+
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise NodeBudgetExceeded()
+
+        reachable = self._reachable()
+        bound = self._upper_bound(reachable)
+        if entry is not None:
+            bound = min(bound, entry[0])
+
+        if bound <= floor:
+            self.table[key] = (bound, False)
+
+            return bound
+
+        best = self.score
+
+        for move in self._moves(reachable):
+            if best >= bound:
+                break
+
+            undo = self._make(move)
+            value = self._search(max(floor, best))
+            self._unmake(undo)
+
+            if value > best:
+                best = value
+
+        # A result above the floor can only come from a child that was
+        # searched exactly. Otherwise, it is only an upper bound.
+        self.table[key] = (best, best > floor)
+
+        return best
+
+    def solve(self, max_nodes=DEFAULT_MAX_NODES):
+        """
+        Find the maximum achievable score for the deal.
+
+        Args:
+            max_nodes:
+                The limit on the number of states to expand, or ``None``
+                to search until the deal is solved.
+
+        Returns:
+            A :class:`SolverResult` describing the outcome. It is marked
+            as inexact if the budget ran out.
+        """
+        self.max_nodes = max_nodes
+        self.nodes = 0
+
+        try:
+            score = self._search(-1)
+        except NodeBudgetExceeded:
+            self.table.clear()
+            self._reset()
+
+            return SolverResult(self.best_found, False, self.nodes)
+
+        return SolverResult(score, True, self.nodes)
+
+
+def solve(deck, player_count, game_class=Game, max_nodes=DEFAULT_MAX_NODES):
+    """
+    Find the maximum score achievable for a deal with full knowledge.
+
+    Args:
+        deck:
+            The deck to deal from, which is not modified.
+        player_count:
+            The number of players in the game.
+        game_class:
+            The game class whose rules are followed.
+        max_nodes:
+            The limit on the number of states to expand, or ``None`` to
+            search until the deal is solved.
+
+    Returns:
+        A :class:`SolverResult` describing the outcome. It is marked as
+        inexact if the budget ran out.
+    """
+    return Solver(deck, player_count, game_class).solve(max_nodes)
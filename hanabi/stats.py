@@ -0,0 +1,312 @@
+import collections
+import math
+
+
+DEFAULT_Z = 1.96
+"""
+The standard normal quantile used for confidence intervals by default,
+giving 95% confidence.
+"""
+
+WINNING_SCORE = 25
+"""
+The score that counts as a win.
+"""
+
+
+def t_quantile(z, degrees_of_freedom):
+    """
+    Approximate the Student's t quantile with the same tail probability
+    as a standard normal quantile, using the Cornish-Fisher expansion.
+    The approximation is accurate to about three decimal places for five
+    or more degrees of freedom.
+
+    Args:
+        z:
+            The standard normal quantile.
+        degrees_of_freedom:
+            The degrees of freedom of the t distribution.
+
+    Returns:
+        The corresponding quantile of the t distribution.
+    """
+    if degrees_of_freedom < 1:
+        return math.inf
+
+    v = degrees_of_freedom
+    terms = (
+        (z ** 3 + z) / 4,
+        (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96,
+        (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384,
+        (
+            79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3
+            - 945 * z
+        ) / 92160,
+    )
+
+    return z + sum(term / v ** power for power, term in enumerate(terms, 1))
+
+
+class ScoreStatistics:
+    """
+    Streaming statistics over the scores of many games.
+
+    Only running sums and a histogram of scores are kept, so memory use
+    does not grow with the number of games. Since scores are integers,
+    the sums are exact and merging statistics gives the same result in
+    any order.
+    """
+
+    def __init__(self):
+        """
+        Create statistics with no recorded games.
+        """
+        self.count = 0
+        self.histogram = collections.Counter()
+        self.total = 0
+        self.total_squares = 0
+
+    @classmethod
+    def from_histogram(cls, histogram):
+        """
+        Create statistics from counts of each score.
+
+        Args:
+            histogram:
+                A mapping from each score to the number of games that
+                ended with it.
+
+        Returns:
+            The statistics of the games.
+        """
+        statistics = cls()
+        for score, count in histogram.items():
+            statistics.count += count
+            statistics.histogram[score] += count
+            statistics.total += score * count
+            statistics.total_squares += score * score * count
+
+        return statistics
+
+    def add(self, score):
+        """
+        Record the score of a single game.
+
+        Args:
+            score:
+                The game's final score.
+        """
+        self.count += 1
+        self.histogram[score] += 1
+        self.total += score
+        self.total_squares += score * score
+
+    def merge(self, other):
+        """
+        Add the games recorded by other statistics to these statistics.
+
+        Args:
+            other:
+                The statistics to merge in.
+        """
+        self.count += other.count
+        self.histogram.update(other.histogram)
+        self.total += other.total
+        self.total_squares += other.total_squares
+
+    @property
+    def mean(self):
+        """
+        Returns:
+            The mean score.
+        """
+        if not self.count:
+            return 0.0
+
+        return self.total / self.count
+
+    @property
+    def variance(self):
+        """
+        Returns:
+            The sample variance of the scores.
+        """
+        if self.count < 2:
+            return 0.0
+
+        n = self.count
+
+        return (n * self.total_squares - self.total ** 2) / (n * (n - 1))
+
+    @property
+    def wins(self):
+        """
+        Returns:
+            The number of games that were won.
+        """
+        return self.histogram[WINNING_SCORE]
+
+    @property
+    def win_rate(self):
+        """
+        Returns:
+            The fraction of games that were won.
+        """
+        if not self.count:
+            return 0.0
+
+        return self.wins / self.count
+
+    def mean_interval(self, z=DEFAULT_Z):
+        """
+        Get a normal approximation confidence interval for the mean
+        score.
+
+        Args:
+            z:
+                The standard normal quantile for the confidence level.
+
+        Returns:
+            A tuple containing the lower and upper bounds. The interval
+            is unbounded until there are at least two scores, since the
+            spread of the scores can't be estimated before then.
+        """
+        if self.count < 2:
+            return -math.inf, math.inf
+
+        half_width = z * math.sqrt(self.variance / self.count)
+
+        return self.mean - half_width, self.mean + half_width
+
+    def win_rate_interval(self, z=DEFAULT_Z):
+        """
+        Get a Wilson score confidence interval for the win rate.
+
+        Args:
+            z:
+                The standard normal quantile for the confidence level.
+
+        Returns:
+            A tuple containing the lower and upper bounds.
+        """
+        if not self.count:
+            return 0.0, 1.0
+
+        n = self.count
+        p = self.win_rate
+        denominator = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denominator
+        half_width = z * math.sqrt(
+            p * (1 - p) / n + z * z / (4 * n * n)
+        ) / denominator
+
+        return center - half_width, center + half_width
+
+    def half_width(self, metric, z=DEFAULT_Z):
+        """
+        Get the half-width of a confidence interval.
+
+        Args:
+            metric:
+                Either ``'mean'`` for the mean score or ``'win_rate'``
+                for the win rate.
+            z:
+                The standard normal quantile for the confidence level.
+
+        Returns:
+            Half the width of the requested interval.
+        """
+        if metric == 'mean':
+            lower, upper = self.mean_interval(z)
+        elif metric == 'win_rate':
+            lower, upper = self.win_rate_interval(z)
+        else:
+            raise ValueError(f'Received unexpected metric: {metric}')
+
+        return (upper - lower) / 2
+
+
+class DifferenceStatistics:
+    """
+    Streaming statistics over paired differences, such as the difference
+    between the scores of two strategies playing the same deal.
+
+    As with :class:`ScoreStatistics`, only exact integer sums are kept.
+    """
+
+    def __init__(self):
+        """
+        Create statistics with no recorded differences.
+        """
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+
+    def add(self, difference):
+        """
+        Record a single paired difference.
+
+        Args:
+            difference:
+                The difference between the paired observations.
+        """
+        self.count += 1
+        self.total += difference
+        self.total_squares += difference * difference
+
+    def merge(self, other):
+        """
+        Add the differences recorded by other statistics to these
+        statistics.
+
+        Args:
+            other:
+                The statistics to merge in.
+        """
+        self.count += other.count
+        self.total += other.total
+        self.total_squares += other.total_squares
+
+    @property
+    def mean(self):
+        """
+        Returns:
+            The mean difference.
+        """
+        if not self.count:
+            return 0.0
+
+        return self.total / self.count
+
+    @property
+    def variance(self):
+        """
+        Returns:
+            The sample variance of the differences.
+        """
+        if self.count < 2:
+            return 0.0
+
+        n = self.count
+
+        return (n * self.total_squares - self.total ** 2) / (n * (n - 1))
+
+    def mean_interval(self, z=DEFAULT_Z):
+        """
+        Get the paired t confidence interval for the mean difference.
+
+        Args:
+            z:
+                The standard normal quantile for the confidence level.
+                It is converted to the matching t quantile.
+
+        Returns:
+            A tuple containing the lower and upper bounds.
+        """
+        if self.count < 2:
+            return -math.inf, math.inf
+
+        t = t_quantile(z, self.count - 1)
+        half_width = t * math.sqrt(self.variance / self.count)
+
+        return self.mean - half_width, self.mean + half_width
@@ -0,0 +1,543 @@
+import collections
+import functools
+import hashlib
+import itertools
+import json
+import os
+import pathlib
+import time
+
+from hanabi import cards, players, simulation, stats
+from hanabi import game as game_module
+
+
+RULE_PARAMETERS = (
+    'CARDS_PER_PLAYER',
+    'HINT_GIVING_NUMBERS',
+    'MAX_BOMBS',
+    'MAX_HINTS',
+)
+"""
+The class constants of :class:`hanabi.game.Game` that a sweep can vary.
+"""
+
+DEFAULT_CACHE_DIR = '.sweep-cache'
+"""
+The default directory that chunk results are cached in.
+"""
+
+CACHE_FORMAT = 1
+"""
+The version of the cached chunk format. Changing it invalidates every
+cached result.
+"""
+
+
+SweepConfig = collections.namedtuple(
+    'SweepConfig', ['player_class', 'player_count', 'rules']
+)
+"""
+A single cell of a sweep. The player class is given by its name in
+:mod:`hanabi.players`, and the rules are a sorted tuple of
+``(name, value)`` pairs overriding the constants in
+:data:`RULE_PARAMETERS`.
+"""
+
+
+def normalize_rule(name, value):
+    """
+    Put a rule's value in the form used by sweep configurations, so that
+    equal rules always have equal, hashable values.
+
+    Args:
+        name:
+            The name of the rule, from :data:`RULE_PARAMETERS`.
+        value:
+            The value of the rule.
+
+    Returns:
+        The normalized value.
+    """
+    if name not in RULE_PARAMETERS:
+        raise ValueError(f'Received unexpected rule: {name}')
+
+    if name == 'HINT_GIVING_NUMBERS':
+        return tuple(sorted(value))
+
+    return int(value)
+
+
+def build_grid(player_classes, player_counts, **rule_values):
+    """
+    Build every combination of player class, player count, and rules.
+
+    Args:
+        player_classes:
+            The names of the player classes in :mod:`hanabi.players`.
+        player_counts:
+            The numbers of players.
+        **rule_values:
+            For any of the rules in :data:`RULE_PARAMETERS`, a list of
+            the values to try. Rules that aren't given keep the value
+            from :class:`hanabi.game.Game`.
+
+    Returns:
+        A list of :class:`SweepConfig` instances.
+    """
+    names = sorted(rule_values)
+    value_lists = [
+        [normalize_rule(name, value) for value in rule_values[name]]
+        for name in names
+    ]
+
+    return [
+        SweepConfig(player_class, player_count, tuple(zip(names, values)))
+        for player_class in player_classes
+        for player_count in player_counts
+        for values in itertools.product(*value_lists)
+    ]
+
+
+def validate_config(config):
+    """
+    Make sure a configuration describes a game that can be played.
+
+    Args:
+        config:
+            The :class:`SweepConfig` to check.
+
+    Raises:
+        ValueError:
+            If the game can't be played with the configuration's rules
+            and number of players.
+    """
+    game_class = game_class_for(config.rules)
+    hand_size = game_class.CARDS_PER_PLAYER
+    dealt = hand_size * config.player_count
+
+    if config.player_count < 2:
+        raise ValueError(
+            f'Received {config.player_count} players, but at least 2 are '
+            f'required.'
+        )
+
+    if hand_size < 1:
+        raise ValueError(f'Received a hand size of {hand_size}.')
+
+    # The game only ends on its own once the last card is drawn, so at
+    # least one card has to be left after the deal.
+    if dealt >= len(cards.FULL_DECK):
+        raise ValueError(
+            f'Dealing {hand_size} cards to each of {config.player_count} '
+            f'players takes {dealt} cards, but there must be fewer than '
+            f'the {len(cards.FULL_DECK)} in the deck.'
+        )
+
+    if game_class.MAX_BOMBS < 1:
+        raise ValueError('At least one bomb must be allowed.')
+
+    if game_class.MAX_HINTS < 0:
+        raise ValueError('The number of hints cannot be negative.')
+
+    for number in game_class.HINT_GIVING_NUMBERS:
+        if not 1 <= number <= cards.NUMBERS_PER_COLOR:
+            raise ValueError(
+                f'Received a hint-giving number of {number}, which is not '
+                f'a card number.'
+            )
+
+
+@functools.lru_cache(maxsize=None)
+def game_class_for(rules):
+    """
+    Get a game class that is played with different rules.
+
+    Args:
+        rules:
+            A tuple of ``(name, value)`` pairs for the rules to
+            override.
+
+    Returns:
+        A subclass of :class:`hanabi.game.Game`, or the class itself if
+        no rules are overridden.
+    """
+    if not rules:
+        return game_module.Game
+
+    return type('Game', (game_module.Game,), dict(rules))
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    """
+    Get a hash of the package's source code. Any change to the code
+    could change the results, so it is part of every cache key.
+
+    Returns:
+        A hex digest of the package's Python files, excluding tests.
+    """
+    package = pathlib.Path(__file__).parent
+    digest = hashlib.blake2b(digest_size=16)
+
+    for path in sorted(package.rglob('*.py')):
+        relative = path.relative_to(package)
+        if relative.parts[0] == 'test':
+            continue
+
+        digest.update(str(relative).encode())
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Results for chunks of trials, stored on disk as one JSON file per
+    chunk.
+
+    A chunk's key includes its configuration, the version of the code,
+    the run seed, and the range of trials it covers, so a result is
+    only reused for exactly the same games.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR):
+        """
+        Create a cache in a directory. The directory is created when
+        the first result is stored.
+
+        Args:
+            directory:
+                The directory the results are stored in.
+        """
+        self.directory = pathlib.Path(directory)
+
+    def key(self, config, seed, first_trial, trials):
+        """
+        Get the key for a chunk's result.
+
+        Args:
+            config:
+                The :class:`SweepConfig` the chunk was played with.
+            seed:
+                The seed for the entire run.
+            first_trial:
+                The index of the chunk's first trial.
+            trials:
+                The number of trials in the chunk.
+
+        Returns:
+            A string identifying the chunk.
+        """
+        description = json.dumps([
+            CACHE_FORMAT,
+            code_version(),
+            config.player_class,
+            config.player_count,
+            [list(rule) for rule in config.rules],
+            seed,
+            first_trial,
+            trials,
+        ])
+
+        return hashlib.blake2b(
+            description.encode(), digest_size=16
+        ).hexdigest()
+
+    def get(self, key):
+        """
+        Load a chunk's result.
+
+        Args:
+            key:
+                The chunk's key.
+
+        Returns:
+            The chunk's :class:`hanabi.stats.ScoreStatistics`, or
+            ``None`` if it is not cached.
+        """
+        try:
+            with open(self.directory / f'{key}.json') as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return stats.ScoreStatistics.from_histogram(dict(data['histogram']))
+
+    def put(self, key, statistics):
+        """
+        Store a chunk's result. The file is written under a temporary
+        name and then renamed, so an interrupted sweep never leaves a
+        partial result behind.
+
+        Args:
+            key:
+                The chunk's key.
+            statistics:
+                The chunk's :class:`hanabi.stats.ScoreStatistics`.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        path = self.directory / f'{key}.json'
+        temporary = self.directory / f'{key}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(
+                {'histogram': sorted(statistics.histogram.items())}, f
+            )
+
+        os.replace(temporary, path)
+
+
+SweepResult = collections.namedtuple(
+    'SweepResult', ['statistics', 'computed', 'cached', 'elapsed']
+)
+"""
+The outcome of a sweep. The statistics map each :class:`SweepConfig` to
+its :class:`hanabi.stats.ScoreStatistics`, and the number of chunks that
+were computed and loaded from the cache are given separately.
+"""
+
+
+def run_chunk(task):
+    """
+    Play a chunk of games for a single configuration.
+
+    Args:
+        task:
+            A tuple containing the cache key, the configuration, the
+            index of the chunk's first trial, the number of trials in
+            the chunk, and the run seed.
+
+    Returns:
+        A tuple containing the cache key, the configuration, and the
+        chunk's :class:`hanabi.stats.ScoreStatistics`.
+    """
+    key, config, first_trial, trials, seed = task
+
+    game_class = game_class_for(config.rules)
+    player_classes = (
+        [getattr(players, config.player_class)] * config.player_count
+    )
+    statistics = stats.ScoreStatistics()
+
+    for trial in range(first_trial, first_trial + trials):
+        game = simulation.build_game(
+            seed, trial, player_classes, game_class=game_class
+        )
+        game.play()
+
+        statistics.add(game.score)
+
+    return key, config, statistics
+
+
+def run_sweep(
+        configs,
+        trials,
+        seed=0,
+        workers=1,
+        chunk_size=simulation.DEFAULT_CHUNK_SIZE,
+        cache=None,
+        progress=None,
+):
+    """
+    Play the same deals with every configuration in a sweep.
+
+    Each configuration's trials are split into chunks at multiples of
+    the chunk size, and only the chunks missing from the cache are
+    played. Re-running an interrupted sweep or increasing its number of
+    trials reuses every finished chunk, as long as the seed and chunk
+    size stay the same. Only a final partial chunk is played again when
+    the number of trials grows.
+
+    Args:
+        configs:
+            The :class:`SweepConfig` instances to play, such as those
+            from :func:`build_grid`.
+        trials:
+            The number of trials for each configuration.
+        seed:
+            The seed for the entire run. Every configuration is played
+            on the same deals.
+        workers:
+            The number of worker processes to use.
+        chunk_size:
+            The maximum number of trials in each chunk.
+        cache:
+            An optional :class:`ResultCache` to reuse and store chunks.
+        progress:
+            An optional callable that receives the number of trials in
+            each chunk as it completes, including cached chunks.
+
+    Returns:
+        A :class:`SweepResult`.
+
+    Raises:
+        ValueError:
+            If any configuration can't be played. Every configuration
+            is checked before any games are played.
+    """
+    for config in configs:
+        validate_config(config)
+
+    start = time.perf_counter()
+
+    statistics = {config: stats.ScoreStatistics() for config in configs}
+    tasks = []
+    cached = 0
+
+    for config in statistics:
+        for _, first_trial, size, *_ in simulation.build_tasks(
+                trials, seed, None, None, chunk_size
+        ):
+            key = None
+            if cache is not None:
+                key = cache.key(config, seed, first_trial, size)
+                chunk_statistics = cache.get(key)
+
+                if chunk_statistics is not None:
+                    statistics[config].merge(chunk_statistics)
+                    cached += 1
+
+                    if progress is not None:
+                        progress(size)
+
+                    continue
+
+            tasks.append((key, config, first_trial, size, seed))
+
+    for key, config, chunk_statistics in simulation.run_chunks(
+            tasks, workers, run_chunk
+    ):
+        statistics[config].merge(chunk_statistics)
+
+        if cache is not None:
+            cache.put(key, chunk_statistics)
+
+        if progress is not None:
+            progress(chunk_statistics.count)
+
+    return SweepResult(
+        statistics, len(tasks), cached, time.perf_counter() - start
+    )
+
+
+def main():
+    """
+    Run a sweep from the command line.
+    """
+    import argparse
+
+    from tqdm import tqdm
+
+    parser = argparse.ArgumentParser(
+        description='Simulate Hanabi over a grid of players and rules.'
+    )
+    parser.add_argument(
+        '--player-class', default=['GodPlayer'], nargs='+',
+        help='The names of the player classes in hanabi.players to use.',
+    )
+    parser.add_argument(
+        '--players', default=[4], nargs='+', type=int,
+        help='The numbers of players in each game.',
+    )
+    parser.add_argument(
+        '--cards-per-player', nargs='+', type=int,
+        help='The hand sizes to try.',
+    )
+    parser.add_argument(
+        '--hint-giving-numbers', nargs='+',
+        help='The sets of numbers that give a hint when played, each as a '
+             'comma-separated list. Use "" for none.',
+    )
+    parser.add_argument(
+        '--max-bombs', nargs='+', type=int,
+        help='The numbers of bombs that end the game to try.',
+    )
+    parser.add_argument(
+        '--max-hints', nargs='+', type=int,
+        help='The maximum numbers of hints to try.',
+    )
+    parser.add_argument(
+        '--trials', default=10_000, type=int,
+        help='The number of games to play with each configuration.',
+    )
+    parser.add_argument(
+        '--workers', default=1, type=int,
+        help='The number of worker processes to spread the games over.',
+    )
+    parser.add_argument(
+        '--chunk-size', default=simulation.DEFAULT_CHUNK_SIZE, type=int,
+        help='The number of games in each unit of work and cached result.',
+    )
+    parser.add_argument(
+        '--seed', default=0, type=int,
+        help='The seed for the run. Cached results are only reused for the '
+             'same seed.',
+    )
+    parser.add_argument(
+        '--cache-dir', default=DEFAULT_CACHE_DIR,
+        help='The directory to cache chunk results in.',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Play every chunk without reading or writing the cache.',
+    )
+    args = parser.parse_args()
+
+    rule_values = {}
+    if args.cards_per_player:
+        rule_values['CARDS_PER_PLAYER'] = args.cards_per_player
+    if args.hint_giving_numbers:
+        rule_values['HINT_GIVING_NUMBERS'] = [
+            [int(number) for number in value.split(',') if number]
+            for value in args.hint_giving_numbers
+        ]
+    if args.max_bombs:
+        rule_values['MAX_BOMBS'] = args.max_bombs
+    if args.max_hints:
+        rule_values['MAX_HINTS'] = args.max_hints
+
+    for name in args.player_class:
+        if not hasattr(players, name):
+            parser.error(f'unknown player class: {name}')
+
+    configs = build_grid(args.player_class, args.players, **rule_values)
+    for config in configs:
+        try:
+            validate_config(config)
+        except ValueError as e:
+            parser.error(str(e))
+
+    cache = None if args.no_cache else ResultCache(args.cache_dir)
+
+    with tqdm(total=args.trials * len(configs)) as progress_bar:
+        result = run_sweep(
+            configs,
+            args.trials,
+            seed=args.seed,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            cache=cache,
+            progress=progress_bar.update,
+        )
+
+    print(
+        f'Swept {len(configs):,} configurations in {result.elapsed:.2f} '
+        f'seconds ({result.computed:,} chunks played, {result.cached:,} '
+        f'cached).'
+    )
+
+    for config, statistics in result.statistics.items():
+        rules = ', '.join(f'{name}={value}' for name, value in config.rules)
+        low, high = statistics.win_rate_interval()
+        print(
+            f'\t{config.player_class} x{config.player_count}'
+            f'{" (" + rules + ")" if rules else ""}: '
+            f'average score {statistics.mean:.2f}, '
+            f'wins {statistics.win_rate:.2%} [{low:.2%}, {high:.2%}]'
+        )
+
+
+if __name__ == '__main__':
+    main()
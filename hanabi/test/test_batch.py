@@ -0,0 +1,45 @@
+import collections
+import random
+
+import numpy as np
+import pytest
+
+from hanabi import batch, cards
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+
+
+@pytest.mark.parametrize('player_count', range(2, 6))
+def test_batch_matches_game(player_count):
+    """
+    Playing a batch of deals should produce the same score for each deal
+    as playing it with the regular game engine and god players.
+    """
+    rng = random.Random(player_count)
+    decks = [cards.Deck.full_shuffled_deck(rng) for _ in range(100)]
+    deals = batch.deals_from_decks(decks)
+
+    expected = []
+    for deal in deals:
+        game = Game(
+            [GodPlayer] * player_count,
+            deck=cards.Deck.from_indices(deal),
+        )
+        game.play()
+
+        expected.append(game.score)
+
+    scores = batch.BatchGame(deals, player_count).play()
+
+    assert scores.tolist() == expected
+
+
+def test_random_deals_are_full_decks():
+    """
+    Each generated deal should contain every card of a full deck.
+    """
+    deals = batch.random_deals(10, np.random.default_rng(0))
+    expected = collections.Counter(card.index for card in cards.FULL_DECK)
+
+    assert deals.shape == (10, len(cards.FULL_DECK))
+    assert all(collections.Counter(deal.tolist()) == expected for deal in deals)
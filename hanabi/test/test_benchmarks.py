@@ -0,0 +1,53 @@
+from hanabi.benchmarks import suite
+
+
+def _results(**ops):
+    """
+    Build benchmark results with the given throughput for each name.
+    """
+    return {
+        'benchmarks': {
+            name: {'iterations': 1, 'ops_per_second': value}
+            for name, value in ops.items()
+        }
+    }
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    """
+    Only benchmarks that slowed down by more than the tolerance should
+    be reported.
+    """
+    baseline = _results(fast=100.0, slow=100.0)
+    current = _results(fast=95.0, slow=80.0, new=10.0)
+
+    regressions = suite.compare(baseline, current, tolerance=0.1)
+
+    assert [regression.name for regression in regressions] == ['slow']
+
+
+def test_compare_flags_missing_benchmarks():
+    """
+    A benchmark in the baseline that is missing from the current run
+    should fail the comparison.
+    """
+    baseline = _results(kept=100.0, removed=100.0)
+    current = _results(kept=100.0)
+
+    regressions = suite.compare(baseline, current)
+
+    assert regressions == [suite.Regression('removed', 100.0, None, None)]
+
+
+def test_run_records_throughput(tmp_path):
+    """
+    Running a benchmark should record its throughput in a format that
+    survives a round trip through a file.
+    """
+    benchmark = suite.Benchmark('noop', lambda iterations: 0.5, 10)
+    path = tmp_path / 'results.json'
+
+    suite.save(suite.run([benchmark], repeat=1), path)
+    results = suite.load(path)
+
+    assert results['benchmarks']['noop']['ops_per_second'] == 20
@@ -0,0 +1,48 @@
+import collections
+import pickle
+import random
+
+from hanabi import cards
+
+
+def test_card_is_interned():
+    """
+    Creating a card with the same color and number should always return
+    the same instance.
+    """
+    card = cards.Card(cards.Colors.RED, 3)
+
+    assert cards.Card(cards.Colors.RED, 3) is card
+    assert pickle.loads(pickle.dumps(card)) is card
+
+
+def test_card_from_index():
+    """
+    Each card should be retrievable from its compact index.
+    """
+    for index, card in enumerate(cards.ALL_CARDS):
+        assert card.index == index
+        assert cards.Card.from_index(index) is card
+
+
+def test_full_shuffled_deck_contents():
+    """
+    A full deck should contain the expected number of copies of each
+    card and should not share its list with the template.
+    """
+    deck = cards.Deck.full_shuffled_deck()
+    counts = collections.Counter(deck.cards)
+
+    assert deck.cards is not cards.FULL_DECK
+    assert len(deck.cards) == 50
+    assert all(counts[card] == card.copies for card in cards.ALL_CARDS)
+
+
+def test_full_shuffled_deck_seeded():
+    """
+    Shuffling with the same seed should produce the same deck.
+    """
+    first = cards.Deck.full_shuffled_deck(42)
+    second = cards.Deck.full_shuffled_deck(random.Random(42))
+
+    assert first.cards == second.cards
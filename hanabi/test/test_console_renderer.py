@@ -0,0 +1,90 @@
+import gc
+import weakref
+
+from hanabi import cards
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+from hanabi.renderers.console import ConsoleRenderer
+
+
+def test_renders_are_cached_until_game_changes():
+    """
+    Rendering a section twice without changing the game should reuse
+    the result, and any change to the game should render it again.
+    """
+    game = Game([GodPlayer] * 3, rng=0)
+    renderer = ConsoleRenderer(game)
+    player = game.players[0]
+
+    discards = renderer.render_discards()
+    hands = renderer.render_other_hands(player)
+    assert renderer.render_discards() is discards
+    assert renderer.render_other_hands(player) is hands
+
+    player.discard(0)
+
+    assert renderer.render_discards() != discards
+    assert renderer.render_other_hands(game.players[1]) != hands
+    assert renderer.render_discards() == ConsoleRenderer(
+        game
+    ).render_discards()
+
+
+def test_sections_are_cached_separately():
+    """
+    A move should only render the sections it changed again. A discard
+    leaves the stacks alone, and a hint leaves the discards and hands
+    alone.
+    """
+    game = Game([GodPlayer] * 3, rng=0)
+    renderer = ConsoleRenderer(game)
+    player = game.players[0]
+
+    stacks = renderer.render_stacks()
+    discards = renderer.render_discards()
+
+    player.discard(0)
+
+    assert renderer.render_stacks() is stacks
+    assert renderer.render_discards() is not discards
+
+    discards = renderer.render_discards()
+    hands = renderer.render_other_hands(game.players[1])
+    game.give_hint(player)
+
+    assert renderer.render_discards() is discards
+    assert renderer.render_other_hands(game.players[1]) is hands
+
+
+def test_own_hand_does_not_invalidate_other_hands():
+    """
+    A player's own hand isn't shown to them, so changes to it should
+    reuse their rendering of the other hands.
+    """
+    game = Game([GodPlayer] * 3, rng=0)
+    renderer = ConsoleRenderer(game)
+    player = game.players[0]
+
+    hands = renderer.render_other_hands(player)
+    player.discard(0)
+
+    assert renderer.render_other_hands(player) is hands
+
+
+def test_renderer_registry_does_not_keep_games_alive():
+    """
+    Once a game is no longer referenced, it and its renderer should be
+    freed.
+    """
+    game = Game([GodPlayer] * 2, deck=cards.Deck.full_shuffled_deck(2))
+    renderer = ConsoleRenderer.for_game(game)
+    renderer.render_other_hands(game.players[0])
+    game_ref = weakref.ref(game)
+
+    assert ConsoleRenderer.for_game(game) is renderer
+
+    del game
+    gc.collect()
+
+    assert game_ref() is None
+    assert renderer.game is None
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from hanabi import batch, cards, deals, simulation
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+
+
+def test_generate_is_reproducible():
+    """
+    Pools generated with the same seed should have the same deals, no
+    matter how they are batched.
+    """
+    first = deals.DealPool.generate(10, seed=3)
+    second = deals.DealPool.generate(10, seed=3, batch_size=4)
+
+    assert len(first) == 10
+    assert np.array_equal(first.deals, second.deals)
+
+
+def test_deals_are_full_decks():
+    """
+    Every deal should contain each card of a full deck exactly once.
+    """
+    pool = deals.DealPool.generate(20, seed=0)
+
+    for row in pool.deals:
+        assert sorted(row) == sorted(batch.FULL_DECK_INDICES)
+
+
+def test_deck_matches_deal():
+    """
+    A deck built from a deal should have the deal's cards in order.
+    """
+    pool = deals.DealPool.generate(3, seed=1)
+    deck = pool.deck(2)
+
+    assert [card.index for card in deck.cards] == list(pool.deals[2])
+    assert isinstance(deck.cards[0], cards.Card)
+
+
+def test_attached_requires_pool(monkeypatch):
+    """
+    Getting the attached pool should fail if there isn't one.
+    """
+    monkeypatch.setattr(deals, '_attached', None)
+
+    with pytest.raises(RuntimeError):
+        deals.attached()
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_run_trials_with_pool(workers):
+    """
+    Trials dealt from a pool should play each trial's deal, whatever the
+    number of workers.
+    """
+    pool = deals.DealPool.generate(30, seed=2)
+
+    result = simulation.run_trials(
+        30, seed=0, workers=workers, chunk_size=7, deals=pool
+    )
+
+    expected = []
+    for trial in range(30):
+        game = Game([GodPlayer] * 4, deck=pool.deck(trial))
+        game.play()
+        expected.append(game.score)
+
+    assert result.trials == 30
+    assert result.total_score == sum(expected)
+
+
+def test_run_trials_pool_too_small():
+    """
+    A pool without a deal for every trial should be rejected.
+    """
+    pool = deals.DealPool.generate(5, seed=0)
+
+    with pytest.raises(ValueError):
+        simulation.run_trials(6, deals=pool)
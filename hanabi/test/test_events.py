@@ -0,0 +1,70 @@
+import logging
+
+from hanabi import cards, events
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+
+
+def test_events_describe_game():
+    """
+    The recorded events should be consistent with the outcome of the
+    game.
+    """
+    game = Game([GodPlayer] * 3, rng=7)
+    recorder = events.ReplayRecorder()
+    statistics = events.StatisticsListener()
+    game.subscribe(recorder)
+    game.subscribe(statistics)
+
+    game.play()
+
+    recorded = [event for event, _ in recorder.events]
+
+    assert recorded[-1] == events.Event.GAME_OVER
+    assert recorded.count(events.Event.LAST_CARD_DRAWN) == int(
+        game.deck.is_empty
+    )
+    assert statistics.counts[events.Event.CARD_PLAYED] == (
+        game.score + game.bombs
+    )
+    assert statistics.counts[events.Event.DRAW] == (
+        len(cards.FULL_DECK)
+        - len(game.players) * Game.CARDS_PER_PLAYER
+        - len(game.deck.cards)
+    )
+    assert statistics.scores == {game.score: 1}
+
+
+def test_subscribe_to_specific_events():
+    """
+    A listener subscribed to specific events should only receive those
+    events, and should receive nothing after unsubscribing.
+    """
+    game = Game([GodPlayer] * 2, rng=3)
+    recorder = events.ReplayRecorder()
+    game.subscribe(recorder, [events.Event.HINT_SPENT])
+
+    while not recorder.events:
+        for player in game.players:
+            player.get_move()
+
+    assert {event for event, _ in recorder.events} == {
+        events.Event.HINT_SPENT
+    }
+
+    game.unsubscribe(recorder)
+
+    assert not game.listeners
+
+
+def test_logging_listener(caplog):
+    """
+    The logging listener should log events when its level is enabled.
+    """
+    game = Game([GodPlayer] * 2, rng=1)
+    game.subscribe(events.LoggingListener(), [events.Event.GAME_OVER])
+
+    with caplog.at_level(logging.INFO):
+        game.play()
+
+    assert f'with a score of {game.score}' in caplog.text
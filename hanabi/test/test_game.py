@@ -1,7 +1,11 @@
+import collections
+import random
+
 import pytest
 
-import cards
-from game import Game
+from hanabi import cards
+from hanabi.game import Game, Move, MoveType
+from hanabi.players import GodPlayer
 
 
 @pytest.mark.parametrize('card_value', range(1, 6))
@@ -12,7 +16,9 @@ def test_is_card_useful_already_played(card_value, played_value):
     color, it should no longer be useful.
     """
     game = Game([])
-    game.stacks[cards.Colors.BLUE] = played_value
+    for number in range(1, played_value + 1):
+        game.record_play(cards.Card(cards.Colors.BLUE, number))
+
     card = cards.Card(cards.Colors.BLUE, card_value)
 
     expected = card_value > played_value
@@ -28,6 +34,198 @@ def test_is_card_useful_killed_by_discard(killed_value):
     """
     game = Game([])
     for _ in range(cards.Deck.CARD_COUNT_MAP[killed_value]):
-        game.discards.append(cards.Card(cards.Colors.BLUE, killed_value))
+        game.record_discard(cards.Card(cards.Colors.BLUE, killed_value))
 
     assert not game.is_card_useful(cards.Card(cards.Colors.BLUE, 5))
+
+
+def _check_derived_state(game):
+    """
+    Compare the game's incrementally maintained state against the same
+    values computed from scratch.
+    """
+    discard_counts = collections.Counter(card.index for card in game.discards)
+    assert game.discard_counts == [
+        discard_counts[index] for index in range(len(cards.ALL_CARDS))
+    ]
+
+    for card in cards.ALL_CARDS:
+        lower_numbers_killed = any(
+            discard_counts[cards.Card(card.color, number).index]
+            == cards.Deck.CARD_COUNT_MAP[number]
+            for number in range(1, card.number)
+        )
+        useful = (
+            card.number > game.stacks[card.color]
+            and not lower_numbers_killed
+        )
+        critical = useful and card.copies - discard_counts[card.index] == 1
+
+        assert game.is_card_useful(card) == useful
+        assert game.is_critical(card) == critical
+
+    assert game.score == sum(game.stacks.values()) - game.bombs
+    assert game._reachable_cards == sum(
+        game.dead_from[color] - 1 for color in cards.Colors
+    )
+
+    assert game.playable_mask == sum(
+        1 << card.index for card in cards.ALL_CARDS
+        if game.is_playable(card)
+    )
+    assert game.useful_mask == sum(
+        1 << card.index for card in cards.ALL_CARDS
+        if game.is_card_useful(card)
+    )
+    assert game.played_mask == sum(
+        1 << card.index for card in cards.ALL_CARDS
+        if card.number <= game.stacks[card.color]
+    )
+    for player in game.players:
+        assert len(game.hand_knowledge[player]) == len(
+            game.player_hands[player]
+        )
+    assert game.is_finished == (
+        game.bombs >= game.MAX_BOMBS
+        or all(game.stacks[color] == 5 for color in cards.Colors)
+        or game.deck.is_empty and game.turns_remaining == 0
+    )
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_derived_state_matches_recomputation(seed):
+    """
+    The derived state maintained as moves are made should always match
+    the state computed from scratch.
+    """
+    random.seed(seed)
+    game = Game([GodPlayer for _ in range(3)])
+
+    _check_derived_state(game)
+
+    while not game.is_finished:
+        game.players[game.current_player_index].get_move()
+        game.end_turn()
+
+        _check_derived_state(game)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_make_unmake_restores_state(seed):
+    """
+    Undoing a sequence of random moves should restore every
+    intermediate state exactly, including the derived state.
+    """
+    rng = random.Random(seed)
+    game = Game([GodPlayer] * 3, rng=seed)
+    snapshots = []
+
+    while not game.is_finished:
+        snapshots.append(game.snapshot())
+        game.make_move(rng.choice(game.legal_moves()))
+        _check_derived_state(game)
+
+    while snapshots:
+        game.unmake_move()
+
+        assert game.snapshot() == snapshots.pop()
+        _check_derived_state(game)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_max_score_bounds_final_score(seed):
+    """
+    The score bound should never increase as moves are made, should
+    never be below the final score, and should be equal to it once the
+    game is finished.
+    """
+    rng = random.Random(seed)
+    game = Game([GodPlayer] * 2, rng=seed)
+    bounds = [game.max_score]
+
+    while not game.is_finished:
+        game.make_move(rng.choice(game.legal_moves()))
+        bounds.append(game.max_score)
+
+    assert bounds == sorted(bounds, reverse=True)
+    assert bounds[-1] == game.score
+
+
+@pytest.mark.parametrize('player_count', [2, 4])
+def test_play_win_only_stops_lost_games(player_count):
+    """
+    Playing for a win only should stop each lost game early without
+    changing which games are won.
+    """
+    saved_turns = 0
+
+    for seed in range(30):
+        game = Game([GodPlayer] * player_count, rng=seed)
+        game.play()
+
+        stopped = Game([GodPlayer] * player_count, rng=seed)
+        stopped.play(win_only=True)
+
+        assert stopped.can_win == game.can_win
+        assert stopped.max_score >= game.score
+        assert stopped.is_finished or not stopped.can_win
+        saved_turns += game.turns_played - stopped.turns_played
+
+    assert saved_turns > 0
+
+
+def test_snapshot_round_trip():
+    """
+    A game created from a snapshot should be in the same state as the
+    original and play out identically.
+    """
+    game = Game([GodPlayer] * 3, rng=3)
+    for _ in range(10):
+        game.players[game.current_player_index].get_move()
+        game.end_turn()
+
+    copy = Game.from_snapshot(game.snapshot(), [GodPlayer] * 3)
+    _check_derived_state(copy)
+    assert copy.snapshot() == game.snapshot()
+
+    game.play()
+    copy.play()
+
+    assert copy.snapshot() == game.snapshot()
+
+
+def test_make_unmake_real_hint():
+    """
+    Real hints should be offered as moves, and undoing one should
+    restore what its target knew.
+    """
+    game = Game([GodPlayer] * 3, rng=4)
+    target = game.players[1]
+    color = game.player_hands[target][0].color
+    move = Move(MoveType.HINT, None, 1, color=color)
+    before = game.snapshot()
+
+    assert move in game.legal_moves()
+    assert Move(MoveType.HINT, None, 0, color=color) not in game.legal_moves()
+
+    game.make_move(move)
+
+    assert game.hand_knowledge[target] != list(before.knowledge[1])
+    assert game.hints_remaining == Game.MAX_HINTS - 1
+
+    game.unmake_move()
+
+    assert game.snapshot() == before
+
+
+def test_legal_moves_without_hints():
+    """
+    Hints should only be offered while there are hints remaining.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    assert Move(MoveType.HINT, None) in game.legal_moves()
+
+    game.hints_remaining = 0
+
+    assert Move(MoveType.HINT, None) not in game.legal_moves()
+    assert len(game.legal_moves()) == 2 * game.CARDS_PER_PLAYER
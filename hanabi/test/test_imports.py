@@ -0,0 +1,62 @@
+import json
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+"""
+The directory containing the package, which the imports are run from.
+"""
+
+CORE_MODULES = ['hanabi.game', 'hanabi.players', 'hanabi.simulation']
+"""
+The modules that headless games and worker processes need.
+"""
+
+LAZY_MODULES = ['hanabi.renderers', 'logging', 'numpy', 'tqdm']
+"""
+Modules that must only be imported when a feature that needs them is
+used.
+"""
+
+
+def _imported_modules(module):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        The names of the modules that were loaded by the import.
+    """
+    script = (
+        'import json, sys; '
+        'before = set(sys.modules); '
+        f'import {module}; '
+        'print(json.dumps(sorted(set(sys.modules) - before)))'
+    )
+    process = subprocess.run(
+        [sys.executable, '-c', script],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+        cwd=str(ROOT),
+    )
+
+    return json.loads(process.stdout)
+
+
+@pytest.mark.parametrize('module', CORE_MODULES)
+def test_core_import_is_lean(module):
+    """
+    Importing the core should not load the renderer, the progress bar,
+    or any other optional extras.
+    """
+    imported = _imported_modules(module)
+
+    assert module in imported
+
+    for name in imported:
+        for lazy in LAZY_MODULES:
+            assert name != lazy and not name.startswith(lazy + '.'), name
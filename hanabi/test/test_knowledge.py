@@ -0,0 +1,175 @@
+import pytest
+
+from hanabi import cards, knowledge
+from hanabi.game import Game
+from hanabi.players import GodPlayer, HintPlayer
+
+
+def _hand(game, player, *card_specs):
+    """
+    Replace a player's hand with the given cards.
+    """
+    game.player_hands[player] = [
+        cards.Card(color, number) for color, number in card_specs
+    ]
+    game.hand_knowledge[player] = [knowledge.ALL_CARDS_MASK] * len(
+        card_specs
+    )
+
+
+def test_hint_updates_knowledge():
+    """
+    A hint should narrow the touched cards down to the hinted color and
+    rule the color out for every other card.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    giver, target = game.players
+    _hand(
+        game,
+        target,
+        (cards.Colors.RED, 1),
+        (cards.Colors.BLUE, 1),
+        (cards.Colors.RED, 4),
+        (cards.Colors.WHITE, 2),
+    )
+
+    touched = game.give_hint(giver, target=target, color=cards.Colors.RED)
+
+    red = knowledge.COLOR_MASKS[cards.Colors.RED]
+    assert touched == [0, 2]
+    assert game.hand_knowledge[target] == [
+        red,
+        knowledge.ALL_CARDS_MASK & ~red,
+        red,
+        knowledge.ALL_CARDS_MASK & ~red,
+    ]
+    assert game.hints_remaining == game.MAX_HINTS - 1
+
+    game.give_hint(giver, target=target, number=1)
+
+    assert knowledge.mask_cards(game.hand_knowledge[target][0]) == [
+        cards.Card(cards.Colors.RED, 1)
+    ]
+
+
+@pytest.mark.parametrize('hint', [
+    {'color': cards.Colors.YELLOW},
+    {'color': cards.Colors.RED, 'number': 1},
+    {},
+])
+def test_invalid_hints(hint):
+    """
+    Hints must name exactly one color or number that applies to at
+    least one of the target's cards.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    giver, target = game.players
+    _hand(game, target, (cards.Colors.RED, 1), (cards.Colors.BLUE, 2))
+
+    with pytest.raises(ValueError):
+        game.give_hint(giver, target=target, **hint)
+
+    with pytest.raises(ValueError):
+        game.give_hint(giver, target=giver, number=1)
+
+    assert game.hints_remaining == game.MAX_HINTS
+
+
+def test_possibilities_rule_out_visible_cards():
+    """
+    Cards whose copies are all visible to a player should be ruled out
+    of their own hand, while copies they hold themselves should not.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    first, second = game.players
+    five = cards.Card(cards.Colors.GREEN, 5)
+    _hand(game, first, (cards.Colors.RED, 5), (cards.Colors.GREEN, 5))
+    _hand(game, second, (cards.Colors.BLUE, 5), (cards.Colors.BLUE, 1))
+
+    first_view = knowledge.possibilities(game, first)
+    second_view = knowledge.possibilities(game, second)
+
+    blue_five = 1 << cards.Card(cards.Colors.BLUE, 5).index
+    assert all(not mask & blue_five for mask in first_view)
+    assert all(mask & knowledge.card_mask(five) for mask in first_view)
+    assert all(not mask & knowledge.card_mask(five) for mask in second_view)
+    assert all(mask & blue_five for mask in second_view)
+
+
+def test_possibilities_use_known_cards_in_hand():
+    """
+    If a player knows they hold the last copy of a card, none of their
+    other cards can be that card.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    giver, target = game.players
+    _hand(game, giver, (cards.Colors.WHITE, 2))
+    _hand(game, target, (cards.Colors.RED, 2), (cards.Colors.RED, 1))
+    red_two = cards.Card(cards.Colors.RED, 2)
+    game.record_discard(red_two)
+    game.hand_knowledge[target][0] = knowledge.card_mask(red_two)
+
+    # Only one red 2 is unaccounted for and the target knows it is the
+    # first card they hold.
+    masks = knowledge.possibilities(game, target)
+
+    assert masks[0] == knowledge.card_mask(red_two)
+    assert not masks[1] & knowledge.card_mask(red_two)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_possibilities_contain_actual_cards(seed):
+    """
+    Inference from hints and visible cards should never rule out the
+    card a player actually holds.
+    """
+    game = Game([HintPlayer] * 3, rng=seed)
+
+    while not game.is_finished:
+        for player in game.players:
+            masks = knowledge.possibilities(game, player)
+            for card, mask in zip(game.player_hands[player], masks):
+                assert mask & knowledge.card_mask(card)
+
+        game.players[game.current_player_index].get_move()
+        game.end_turn()
+
+    assert game.bombs == 0
+
+
+def test_is_hinted():
+    """
+    A card is hinted once its color or number is known, but not when
+    hints only ruled some cards out.
+    """
+    red = knowledge.COLOR_MASKS[cards.Colors.RED]
+    ones = knowledge.NUMBER_MASKS[1]
+
+    assert knowledge.is_hinted(red)
+    assert knowledge.is_hinted(ones & ~red)
+    assert not knowledge.is_hinted(knowledge.ALL_CARDS_MASK)
+    assert not knowledge.is_hinted(knowledge.ALL_CARDS_MASK & ~red)
+
+
+def test_hint_player_keeps_hinted_cards():
+    """
+    A hint player should discard a card that wasn't hinted, even if a
+    hint about another card ruled some cards out for it.
+    """
+    game = Game([HintPlayer] * 2, rng=0)
+    player, other = game.players
+    _hand(
+        game,
+        player,
+        (cards.Colors.RED, 5),
+        (cards.Colors.BLUE, 3),
+        (cards.Colors.GREEN, 3),
+        (cards.Colors.WHITE, 3),
+    )
+    game.give_hint(other, target=player, color=cards.Colors.RED)
+    game.hints_remaining = 0
+
+    player.get_move()
+
+    assert game.discards == [cards.Card(cards.Colors.BLUE, 3)]
+    assert cards.Card(cards.Colors.RED, 5) in game.player_hands[player]
@@ -0,0 +1,116 @@
+import time
+import urllib.request
+
+from hanabi import metrics, simulation
+
+
+def _samples(text):
+    """
+    Parse the samples in metrics in the Prometheus text format.
+    """
+    return {
+        name: float(value)
+        for name, value in (
+            line.rsplit(' ', 1)
+            for line in text.splitlines()
+            if not line.startswith('#')
+        )
+    }
+
+
+def test_metrics_follow_run(tmp_path):
+    """
+    The metrics should count every game and turn of a run, agree with
+    its result, and be written to the metrics file when it finishes.
+    """
+    path = tmp_path / 'metrics.prom'
+    run_metrics = metrics.SimulationMetrics(path, interval=0)
+
+    result = simulation.run_trials(
+        20, seed=1, chunk_size=5, metrics=run_metrics
+    )
+    run_metrics.close()
+
+    samples = _samples(path.read_text())
+
+    assert samples['hanabi_games_total'] == 20
+    assert samples['hanabi_turns_total'] == run_metrics.turns > 0
+    assert samples['hanabi_mean_score'] == result.average_score
+    assert samples['hanabi_win_rate'] == result.statistics.win_rate
+    assert samples['hanabi_games_per_second'] > 0
+    assert any(name.startswith('hanabi_worker_games') for name in samples)
+
+
+def test_resident_memory():
+    """
+    The resident memory of the current process should be positive where
+    it can be read.
+    """
+    memory = metrics.resident_memory()
+
+    assert memory is None or memory > 0
+
+
+def test_server_serves_metrics():
+    """
+    The server should serve the latest metrics over HTTP.
+    """
+    run_metrics = metrics.SimulationMetrics()
+
+    with metrics.MetricsServer(run_metrics, 0) as server:
+        simulation.run_trials(5, seed=2, metrics=run_metrics)
+
+        url = f'http://{metrics.DEFAULT_HOST}:{server.port}/metrics'
+        with urllib.request.urlopen(url) as response:
+            content_type = response.headers['Content-Type']
+            text = response.read().decode()
+
+    assert content_type == metrics.CONTENT_TYPE
+    assert _samples(text)['hanabi_games_total'] == 5
+
+
+def test_server_renders_on_scrape():
+    """
+    Rates should be computed when scraped rather than frozen at the last
+    completed chunk.
+    """
+    run_metrics = metrics.SimulationMetrics()
+
+    with metrics.MetricsServer(run_metrics, 0) as server:
+        simulation.run_trials(5, seed=2, metrics=run_metrics)
+        url = f'http://{metrics.DEFAULT_HOST}:{server.port}/metrics'
+
+        rates = []
+        for _ in range(2):
+            with urllib.request.urlopen(url) as response:
+                samples = _samples(response.read().decode())
+
+            rates.append(samples['hanabi_games_per_second'])
+            time.sleep(0.05)
+
+    assert rates[0] > rates[1] > 0
+
+
+def test_metrics_only_render_when_written(tmp_path, monkeypatch):
+    """
+    Completed chunks should only render the metrics when a metrics file
+    is due to be written.
+    """
+    renders = []
+    render = metrics.SimulationMetrics.render
+    monkeypatch.setattr(
+        metrics.SimulationMetrics, 'render',
+        lambda self: renders.append(self) or render(self),
+    )
+
+    unwritten = metrics.SimulationMetrics()
+    simulation.run_trials(10, seed=3, chunk_size=2, metrics=unwritten)
+    unwritten.close()
+
+    assert renders == []
+
+    written = metrics.SimulationMetrics(tmp_path / 'metrics.prom')
+    simulation.run_trials(10, seed=3, chunk_size=2, metrics=written)
+    written.close()
+
+    assert renders == [written, written]
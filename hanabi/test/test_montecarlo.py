@@ -0,0 +1,205 @@
+import multiprocessing
+import pickle
+import random
+
+import pytest
+
+from hanabi import cards, knowledge, simulation
+from hanabi.game import Game, Move, MoveType
+from hanabi.players import (
+    GodPlayer,
+    MonteCarloPlayer,
+    RolloutTask,
+    run_rollouts,
+    sample_hand,
+)
+
+
+class CountingGame(Game):
+    """
+    A game that counts how many games of its class are created.
+    """
+
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        type(self).created += 1
+        super().__init__(*args, **kwargs)
+
+
+def _task(game, samples=10, seed=0, deadline=None):
+    """
+    Build a rollout task for the first player of a game the same way a
+    Monte Carlo player does.
+    """
+    player = game.players[0]
+    view = knowledge.PublicView(game)
+    state = game.snapshot()
+    hands = ((),) + state.hands[1:]
+
+    return RolloutTask(
+        state=state._replace(deck=(), hands=hands),
+        seat=0,
+        masks=view.possibilities(player),
+        unseen=view.unseen(player),
+        moves=[Move(MoveType.DISCARD, 0), Move(MoveType.HINT, None)],
+        rollout_class=GodPlayer,
+        game_class=type(game),
+        samples=samples,
+        seed=seed,
+        deadline=deadline,
+    )
+
+
+def test_sample_hand_respects_masks():
+    """
+    Every sampled card should be possible for its slot, and the hand
+    and deck together should use each unseen copy exactly once.
+    """
+    red = knowledge.COLOR_MASKS[cards.Colors.RED]
+    ones = knowledge.NUMBER_MASKS[1]
+    masks = [red, ones, knowledge.ALL_CARDS_MASK]
+    unseen = [card.index for card in cards.FULL_DECK]
+    rng = random.Random(0)
+
+    for _ in range(100):
+        hand, deck = sample_hand(masks, unseen, rng)
+
+        for mask, index in zip(masks, hand):
+            assert mask >> index & 1
+        assert sorted(hand + deck) == sorted(unseen)
+
+
+def test_sample_hand_impossible():
+    """
+    If no hand fits the masks, sampling should fail.
+    """
+    red_one = cards.Card(cards.Colors.RED, 1)
+    mask = knowledge.card_mask(red_one)
+
+    with pytest.raises(ValueError):
+        sample_hand([mask, mask], [red_one.index], random.Random(0))
+
+
+def test_run_rollouts_deterministic():
+    """
+    Rollouts with the same seed should have the same outcome.
+    """
+    task = _task(Game([GodPlayer] * 3, rng=0))
+
+    totals, samples = run_rollouts(task)
+
+    assert (totals, samples) == run_rollouts(task)
+    assert samples == 10
+    assert len(totals) == 2
+
+
+def test_run_rollouts_deadline():
+    """
+    A deadline that has already passed should still allow one sample.
+    """
+    task = _task(Game([GodPlayer] * 3, rng=0), samples=100, deadline=0)
+
+    _, samples = run_rollouts(task)
+
+    assert samples == 1
+
+
+def test_with_options_unknown():
+    """
+    Unknown options should be rejected.
+    """
+    with pytest.raises(TypeError):
+        MonteCarloPlayer.with_options(rolouts=10)
+
+
+def test_with_options_requires_rollouts():
+    """
+    A player must sample at least one hand for each move.
+    """
+    with pytest.raises(ValueError):
+        MonteCarloPlayer.with_options(rollouts=0)
+
+
+def test_with_options_pickles():
+    """
+    A configured player class should survive pickling with its options,
+    so it can be played by worker processes.
+    """
+    klass = MonteCarloPlayer.with_options(rollouts=4, seed=1)
+    klass = klass.with_options(play_threshold=0.9)
+
+    copy = pickle.loads(pickle.dumps(klass))
+
+    assert copy.__name__ == 'MonteCarloPlayer'
+    assert issubclass(copy, MonteCarloPlayer)
+    assert (copy.rollouts, copy.seed, copy.play_threshold) == (4, 1, 0.9)
+
+
+def test_monte_carlo_workers():
+    """
+    A configured player should give the same results in worker processes
+    as in the current process.
+    """
+    klass = MonteCarloPlayer.with_options(rollouts=2, seed=1)
+
+    serial = simulation.run_trials(
+        2, player_class=klass, player_count=2, seed=0, chunk_size=1
+    )
+    parallel = simulation.run_trials(
+        2, player_class=klass, player_count=2, workers=2, seed=0,
+        chunk_size=1,
+    )
+
+    assert serial.histogram == parallel.histogram
+
+
+def test_monte_carlo_game():
+    """
+    A game with Monte Carlo players should be played to the end, and
+    seeded players should play the same game every time.
+    """
+    klass = MonteCarloPlayer.with_options(rollouts=4, seed=1)
+
+    scores = []
+    for _ in range(2):
+        game = Game([klass] * 2, rng=0)
+        game.play()
+        scores.append((game.score, game.bombs, game.hints_remaining))
+
+    assert scores[0] == scores[1]
+    assert game.is_finished
+
+
+def test_monte_carlo_pool():
+    """
+    Spreading the rollouts over a pool should sample every rollout.
+    """
+    moves = [Move(MoveType.DISCARD, 0)]
+
+    with multiprocessing.Pool(2) as pool:
+        klass = MonteCarloPlayer.with_options(
+            rollouts=5, batches=2, pool=pool, seed=0,
+        )
+        game = Game([klass] * 3, rng=0)
+        view = knowledge.PublicView(game)
+        scores = game.players[0].evaluate(view, moves)
+
+    assert len(scores) == 1
+    assert 0 <= scores[0] <= 25
+
+
+def test_rollouts_use_game_class():
+    """
+    Rollouts should be played with the same rules as the game the player
+    is seated in.
+    """
+    klass = MonteCarloPlayer.with_options(rollouts=4, seed=2)
+    game = CountingGame([klass] * 2, rng=0)
+    CountingGame.created = 0
+
+    game.players[0].evaluate(
+        knowledge.PublicView(game), [Move(MoveType.DISCARD, 0)]
+    )
+
+    assert CountingGame.created == 1
@@ -0,0 +1,127 @@
+import pytest
+
+from hanabi import movelog, simulation
+from hanabi.game import Game
+from hanabi.players import GodPlayer, HintPlayer
+
+
+def _record(player_class, player_count, seed):
+    """
+    Play a game while recording its moves, keeping a snapshot from
+    before each move.
+    """
+    game = Game([player_class] * player_count, rng=seed)
+    recorder = movelog.MoveRecorder.attach(game)
+    snapshots = []
+
+    while not game.is_finished:
+        snapshots.append(game.snapshot())
+        game.players[game.current_player_index].get_move()
+        game.end_turn()
+
+    snapshots.append(game.snapshot())
+    entry = movelog.GameLog(
+        seed, player_count, game.score, bytes(recorder.moves)
+    )
+
+    return entry, snapshots
+
+
+@pytest.mark.parametrize('kind', [
+    movelog.PLAY, movelog.DISCARD, movelog.COLOR_HINT, movelog.NUMBER_HINT
+])
+@pytest.mark.parametrize('target', [0, 3, movelog.SIMULATED])
+@pytest.mark.parametrize('value', [0, 4, 7])
+def test_move_round_trip(kind, target, value):
+    """
+    Every move should fit in a single byte and unpack to the same kind,
+    target, and value.
+    """
+    move = movelog.encode_move(kind, target, value)
+
+    assert 0 <= move <= 255
+    assert movelog.decode_move(move) == (kind, target, value)
+
+
+def test_encode_move_out_of_range():
+    """
+    Moves that don't fit in a byte should be rejected.
+    """
+    with pytest.raises(ValueError):
+        movelog.encode_move(movelog.PLAY, value=8)
+
+
+@pytest.mark.parametrize('player_class', [GodPlayer, HintPlayer])
+@pytest.mark.parametrize('seed', range(3))
+def test_replay_every_turn(player_class, seed):
+    """
+    Replaying a recorded game should rebuild its exact state at every
+    turn, including what the players were told about their cards.
+    """
+    entry, snapshots = _record(player_class, 3, seed)
+
+    assert len(entry.moves) == len(snapshots) - 1
+
+    for turn in range(0, len(snapshots), 7):
+        assert movelog.replay(entry, turn).snapshot() == snapshots[turn]
+
+    game = movelog.replay(entry)
+    assert game.snapshot() == snapshots[-1]
+    assert game.score == entry.score
+
+
+def test_writer_and_reader(tmp_path):
+    """
+    Games should be read back in the order they were written, and a
+    game that was only partly written should be dropped when the log is
+    reopened.
+    """
+    path = tmp_path / 'games.log'
+    entries = [_record(GodPlayer, 2, seed)[0] for seed in range(3)]
+
+    with movelog.MoveLogWriter(path) as writer:
+        for entry in entries[:2]:
+            writer.append(*entry)
+
+    with open(path, 'ab') as f:
+        f.write(movelog.encode_game(*entries[2])[:-5])
+
+    assert list(movelog.read_log(path)) == entries[:2]
+
+    with movelog.MoveLogWriter(path) as writer:
+        writer.append(*entries[2])
+
+    assert list(movelog.read_log(path)) == entries
+
+
+def test_read_log_rejects_other_files(tmp_path):
+    """
+    Files that aren't move logs should be rejected.
+    """
+    path = tmp_path / 'games.log'
+    path.write_bytes(b'not a log')
+
+    with pytest.raises(ValueError):
+        list(movelog.read_log(path))
+
+
+def test_run_trials_logs_moves(tmp_path):
+    """
+    A logged run should write every game in trial order, each of which
+    replays to its final score.
+    """
+    path = tmp_path / 'games.log'
+
+    with movelog.MoveLogWriter(path) as writer:
+        result = simulation.run_trials(
+            12, player_count=2, seed=4, chunk_size=5, move_log=writer
+        )
+
+    entries = list(movelog.read_log(path))
+
+    assert [entry.seed for entry in entries] == [
+        simulation.derive_seed(4, trial) for trial in range(12)
+    ]
+    assert sum(entry.score for entry in entries) == result.total_score
+    for entry in entries:
+        assert movelog.replay(entry).score == entry.score
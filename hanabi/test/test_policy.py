@@ -0,0 +1,92 @@
+import pytest
+
+from hanabi import policy
+from hanabi.game import Game
+from hanabi.players import CompiledGodPlayer, GodPlayer
+
+
+@pytest.mark.parametrize('player_count', [2, 3, 4, 5])
+def test_compiled_god_player_matches(player_count):
+    """
+    The compiled player should make exactly the same moves as the
+    original on every turn.
+    """
+    for seed in range(30):
+        game = Game([GodPlayer] * player_count, rng=seed)
+        compiled = Game([CompiledGodPlayer] * player_count, rng=seed)
+
+        while not game.is_finished:
+            game.players[game.current_player_index].get_move()
+            game.end_turn()
+            compiled.players[compiled.current_player_index].get_move()
+            compiled.end_turn()
+
+            assert compiled.snapshot() == game.snapshot()
+
+        assert compiled.is_finished
+
+
+def test_key_round_trip():
+    """
+    Decoding a key should give back the parts it was built from.
+    """
+    codes = [0, 3, 8, 6, 0]
+
+    for has_hints in (False, True):
+        for last_card in (False, True):
+            key = policy.encode_god_key(codes, has_hints, last_card)
+
+            assert policy.decode_god_key(key) == (codes, has_hints, last_card)
+
+
+def test_god_key_matches_encoding():
+    """
+    The key of a game's hand should match encoding its codes directly.
+    """
+    game = Game([GodPlayer] * 3, rng=4)
+    player = game.players[0]
+    hand = game.player_hands[player]
+
+    codes = []
+    for card in hand:
+        if game.is_playable(card):
+            codes.append(card.number)
+        elif game.is_card_useful(card):
+            codes.append(policy.USEFUL_CODES[card.copies])
+        else:
+            codes.append(policy.USELESS)
+
+    assert policy.god_key(game, hand) == policy.encode_god_key(
+        codes, game.hints_remaining > 0, len(game.deck.cards) == 1
+    )
+
+
+def test_precompile_every_key():
+    """
+    Every key for a hand size should have a valid decision.
+    """
+    table = policy.PolicyTable(policy.god_decision)
+    table.precompile(policy.god_keys(3))
+
+    assert len(table) == policy.CARD_CODES ** 3 * 4
+    for kind, index in table.decisions.values():
+        if kind == policy.HINT:
+            assert index is None
+        else:
+            assert 0 <= index < 3
+
+
+def test_table_lru_eviction():
+    """
+    A table with a maximum size should drop the least recently used
+    decision.
+    """
+    table = policy.PolicyTable(lambda key: key * 2, max_size=2)
+
+    assert table.lookup(1) == 2
+    assert table.lookup(2) == 4
+    table.lookup(1)
+    table.lookup(3)
+
+    assert list(table.decisions) == [1, 3]
+    assert table.misses == 3
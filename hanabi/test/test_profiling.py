@@ -0,0 +1,92 @@
+import pstats
+
+from hanabi import cards, profiling, simulation
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+
+
+def test_phase_timer_counts_phases():
+    """
+    Every game and every move should be recorded under its phase, with
+    each move in one of the player's branches.
+    """
+    timer = profiling.PhaseTimer()
+
+    with timer.instrument():
+        result = simulation.run_trials(20, seed=1)
+
+    turns = sum(
+        count
+        for phase, count in timer.calls.items()
+        if phase.startswith('GodPlayer.get_move')
+    )
+    branches = {
+        phase[len('GodPlayer.get_move ('):-1]
+        for phase in timer.calls
+        if phase.startswith('GodPlayer.get_move')
+    }
+
+    assert timer.calls['Game.__init__'] == 20
+    assert timer.calls['Deck.full_shuffled_deck'] == 20
+    assert timer.calls['Game.is_finished'] >= turns
+    assert branches <= set(profiling.GOD_PLAYER_BRANCHES)
+    assert 'play' in branches
+    assert len(timer.report(result.elapsed)) == len(timer.calls)
+
+
+def test_phase_timer_does_not_change_results():
+    """
+    Instrumenting a run should not change its outcome, and the original
+    methods should be restored afterwards.
+    """
+    expected = simulation.run_trials(20, seed=2).statistics.histogram
+
+    with profiling.PhaseTimer().instrument():
+        result = simulation.run_trials(20, seed=2)
+
+    assert result.statistics.histogram == expected
+    assert not hasattr(Game.__init__, '__wrapped__')
+    assert not hasattr(GodPlayer.get_move, '__wrapped__')
+    assert not hasattr(cards.Deck.full_shuffled_deck, '__wrapped__')
+
+
+def test_phase_timer_merge():
+    """
+    Merging timers should add up their calls and times.
+    """
+    first = profiling.PhaseTimer()
+    first.add('a', 1.0)
+    second = profiling.PhaseTimer()
+    second.add('a', 2.0)
+    second.add('b', 0.5)
+
+    first.merge(second)
+
+    assert first.calls == {'a': 2, 'b': 1}
+    assert first.totals == {'a': 3.0, 'b': 0.5}
+
+
+def test_profile_writes_files(tmp_path):
+    """
+    The cProfile stats and collapsed stacks should be written when the
+    profiled code finishes.
+    """
+    stats_path = tmp_path / 'run.prof'
+    collapsed_path = tmp_path / 'run.collapsed'
+
+    with profiling.profile(
+            phases=True,
+            cprofile_path=str(stats_path),
+            collapsed_path=str(collapsed_path),
+    ) as timer:
+        simulation.run_trials(200, seed=3)
+
+    assert timer.calls['Game.__init__'] == 200
+
+    stats = pstats.Stats(str(stats_path))
+    assert any(name == 'run_chunk' for _, _, name in stats.stats)
+
+    for line in collapsed_path.read_text().splitlines():
+        stack, count = line.rsplit(' ', 1)
+        assert int(count) > 0
+        assert stack
@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+
+from hanabi import cards, results, simulation
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+
+
+def test_game_record():
+    """
+    The record of a game should describe how it ended.
+    """
+    game = Game([GodPlayer] * 4, rng=5)
+    game.play()
+
+    record = results.game_record(game, 5)
+
+    assert record[:6] == (
+        5,
+        4,
+        game.score,
+        game.bombs,
+        game.hints_remaining,
+        game.turns_played,
+    )
+    if game.deck.is_empty and game.turns_remaining == 0:
+        # The game lasts one more round after the last card is drawn.
+        assert record[7] == game.turns_played - len(game.players)
+
+
+def test_dead_colors():
+    """
+    A color should be dead once every copy of one of its unplayed cards
+    was discarded.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    for _ in range(2):
+        game.record_discard(cards.Card(cards.Colors.BLUE, 3))
+
+    index = list(cards.Colors).index(cards.Colors.BLUE)
+    assert results.dead_colors(game) == 1 << index
+
+
+def test_turns_played_undo():
+    """
+    Undoing a move should restore the turn counters.
+    """
+    game = Game([GodPlayer] * 3, rng=1)
+
+    game.make_move(game.legal_moves()[0])
+    assert game.turns_played == 1
+    assert game.last_draw_turn == 0
+
+    game.unmake_move()
+    assert game.turns_played == 0
+    assert game.last_draw_turn is None
+
+
+def test_writer_and_store(tmp_path):
+    """
+    Records appended by a writer should be readable from the store,
+    including across separate writers.
+    """
+    records = [(i, 4, i % 26, 0, 1, 60, 0, 50) for i in range(10)]
+
+    with results.ResultWriter(tmp_path, buffer_size=3) as writer:
+        for record in records[:5]:
+            writer.append(record)
+
+    with results.ResultWriter(tmp_path) as writer:
+        array = results.empty_records(5)
+        array[:] = records[5:]
+        writer.extend(array)
+
+    store = results.ResultStore(tmp_path)
+
+    assert len(store) == 10
+    assert list(store['seed']) == list(range(10))
+    assert isinstance(store['score'], np.memmap)
+    assert store.histogram('score') == {i: 1 for i in range(10)}
+
+
+def test_writer_repairs_partial_append(tmp_path):
+    """
+    A column left longer than the others by an interrupted append
+    should be truncated when the store is opened for writing.
+    """
+    with results.ResultWriter(tmp_path) as writer:
+        writer.append((1, 2, 3, 0, 0, 10, 0, 5))
+
+    with open(tmp_path / 'seed.bin', 'ab') as f:
+        f.write(b'\0' * 8)
+
+    assert len(results.ResultStore(tmp_path)) == 1
+
+    with results.ResultWriter(tmp_path) as writer:
+        writer.append((2, 2, 4, 0, 0, 10, 0, 5))
+
+    store = results.ResultStore(tmp_path)
+    assert list(store['seed']) == [1, 2]
+
+
+def test_store_rejects_other_format(tmp_path):
+    """
+    A store with a different format should not be opened.
+    """
+    results.ResultWriter(tmp_path).close()
+    (tmp_path / 'meta.json').write_text('{"version": 0}')
+
+    with pytest.raises(ValueError):
+        results.ResultStore(tmp_path)
+
+
+def test_run_trials_records_games(tmp_path):
+    """
+    A recorded run should store every game in trial order, with the
+    same statistics as the run and seeds that recreate each game.
+    """
+    with results.ResultWriter(tmp_path) as writer:
+        result = simulation.run_trials(
+            25, seed=3, chunk_size=10, writer=writer
+        )
+
+    store = results.ResultStore(tmp_path)
+    statistics = store.score_statistics(block_size=7)
+
+    assert len(store) == 25
+    assert statistics.histogram == result.statistics.histogram
+    assert statistics.total_squares == result.statistics.total_squares
+
+    game = Game([GodPlayer] * 4, rng=int(store['seed'][12]))
+    game.play()
+    assert game.score == store['score'][12]
+    assert game.turns_played == store['turns'][12]
@@ -0,0 +1,175 @@
+import pytest
+
+from hanabi import cards, serialization
+from hanabi.game import Game
+from hanabi.players import BasePlayer, GodPlayer
+
+
+def _advance(game, turns):
+    """
+    Let a game's players make a number of moves.
+    """
+    for _ in range(turns):
+        if game.is_finished:
+            break
+
+        game.players[game.current_player_index].get_move()
+        game.end_turn()
+
+
+@pytest.mark.parametrize('turns', [0, 10, 45, 100])
+def test_round_trip(turns):
+    """
+    Decoding an encoded game should give a game in the same state.
+    """
+    game = Game([GodPlayer] * 3, rng=turns)
+    _advance(game, turns)
+
+    data = serialization.encode(game)
+    copy = serialization.decode(data, [GodPlayer] * 3)
+
+    assert copy.snapshot() == game.snapshot()
+    assert serialization.decode_state(data) == game.snapshot()
+
+
+def test_round_trip_knowledge():
+    """
+    What players were told about their cards should be kept.
+    """
+    game = Game([GodPlayer] * 2, rng=0)
+    giver, target = game.players
+    color = game.player_hands[target][0].color
+    game.give_hint(giver, target=target, color=color)
+
+    copy = serialization.decode(serialization.encode(game))
+
+    assert copy.hand_knowledge[copy.players[1]] == (
+        game.hand_knowledge[target]
+    )
+
+
+def test_decode_seats_base_players():
+    """
+    Without player classes, the game should be seated with base players
+    and still support searching through moves.
+    """
+    game = Game([GodPlayer] * 4, rng=1)
+    copy = serialization.decode(serialization.encode(game))
+
+    assert all(type(player) is BasePlayer for player in copy.players)
+
+    before = copy.snapshot()
+    copy.make_move(copy.legal_moves()[0])
+    copy.unmake_move()
+    assert copy.snapshot() == before
+
+
+def test_decoded_game_plays_identically():
+    """
+    A decoded game should finish exactly like the original.
+    """
+    game = Game([GodPlayer] * 4, rng=2)
+    _advance(game, 20)
+    copy = serialization.decode(serialization.encode(game), [GodPlayer] * 4)
+
+    game.play()
+    copy.play()
+
+    assert copy.snapshot() == game.snapshot()
+
+
+def test_encoding_is_compact():
+    """
+    A fresh game should take a byte for each card plus a small header.
+    """
+    game = Game([GodPlayer] * 4, rng=3)
+    data = serialization.encode(game)
+
+    hand_cards = 4 * Game.CARDS_PER_PLAYER
+    assert len(data) < len(cards.FULL_DECK) + 4 * hand_cards + 32
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data: b'XYZ' + data[3:],
+    lambda data: data[:3] + bytes([99]) + data[4:],
+    lambda data: data[:-1],
+    lambda data: data[:10],
+    lambda data: data[:30] + bytes([200]) + data[31:],
+])
+def test_decode_rejects_invalid_data(corrupt):
+    """
+    Data that isn't a valid state should be rejected.
+    """
+    data = serialization.encode(Game([GodPlayer] * 2, rng=4))
+
+    with pytest.raises(ValueError):
+        serialization.decode_state(corrupt(data))
+
+
+def _replace(data, offset, value):
+    """
+    Replace the bytes of an encoded state starting at an offset.
+    """
+    return data[:offset] + value + data[offset + len(value):]
+
+
+_DECK_START = serialization._HEADER.size + 2
+
+
+@pytest.mark.parametrize('corrupt', [
+    # A stack higher than the number of cards in a color.
+    lambda data: _replace(data, 7, bytes([6])),
+    # More hints than the game allows.
+    lambda data: _replace(data, 12, bytes([Game.MAX_HINTS + 1])),
+    # More bombs than the game allows.
+    lambda data: _replace(data, 13, bytes([Game.MAX_BOMBS + 1])),
+    # A negative number of turns remaining.
+    lambda data: _replace(data, 14, (-2).to_bytes(1, 'little', signed=True)),
+    # A current player who isn't in the game.
+    lambda data: _replace(data, 15, bytes([9])),
+    # A card drawn in a negative turn.
+    lambda data: _replace(data, 18, (-2).to_bytes(2, 'little', signed=True)),
+    # Knowledge of a card that doesn't exist.
+    lambda data: _replace(data, len(data) - 4, (1 << 25).to_bytes(4, 'little')),
+    # Two copies of a card that only has one.
+    lambda data: _replace(data, _DECK_START, bytes([4, 4])),
+    # A card that is also on its stack.
+    lambda data: _replace(data, 7, bytes([5] * 5)),
+])
+def test_decode_rejects_impossible_state(corrupt):
+    """
+    Data in the right format that doesn't describe a possible game should
+    be rejected rather than failing once the game is used.
+    """
+    data = serialization.encode(Game([GodPlayer] * 2, rng=4))
+
+    with pytest.raises(ValueError):
+        serialization.decode(corrupt(data))
+
+
+def test_decode_uses_game_class_limits():
+    """
+    The limits of the game class should be used to check the state.
+    """
+    class ManyHintsGame(Game):
+        MAX_HINTS = 10
+
+    game = ManyHintsGame([GodPlayer] * 2, rng=6)
+    game.hints_remaining = 10
+    data = serialization.encode(game)
+
+    with pytest.raises(ValueError):
+        serialization.decode(data)
+
+    copy = serialization.decode(data, game_class=ManyHintsGame)
+    assert copy.hints_remaining == 10
+
+
+def test_decode_wrong_player_count():
+    """
+    The number of player classes must match the encoded game.
+    """
+    data = serialization.encode(Game([GodPlayer] * 2, rng=5))
+
+    with pytest.raises(ValueError):
+        serialization.decode(data, [GodPlayer] * 3)
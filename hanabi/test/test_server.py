@@ -0,0 +1,246 @@
+import asyncio
+import json
+
+import pytest
+
+from hanabi import cards, server
+from hanabi.game import Move, MoveType
+
+
+def _run(coroutine):
+    """
+    Run a coroutine in a new event loop.
+    """
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def _start():
+    """
+    Start a server on a free port.
+
+    Returns:
+        A tuple containing the server, the listening socket server, and
+        a coroutine function that connects to it.
+    """
+    hanabi_server = server.Server(seed=1)
+    listener = await hanabi_server.start(port=0)
+    host, port = listener.sockets[0].getsockname()[:2]
+
+    async def connect():
+        return await asyncio.open_connection(host, port, limit=2 ** 20)
+
+    return hanabi_server, listener, connect
+
+
+@pytest.mark.parametrize('line, expected', [
+    ('PLAY 2\n', Move(MoveType.PLAY, 2)),
+    ('discard 0', Move(MoveType.DISCARD, 0)),
+    ('HINT', Move(MoveType.HINT, None)),
+    ('HINT 1', None),
+    ('HINT 1 COLOR red', Move(MoveType.HINT, None, 1, cards.Colors.RED)),
+    ('hint 2 number 5', Move(MoveType.HINT, None, 2, number=5)),
+    ('HINT 1 COLOR purple', None),
+    ('HINT 1 NUMBER 6', None),
+    ('HINT red COLOR 1', None),
+    ('PLAY', None),
+    ('PLAY -1', None),
+    ('', None),
+])
+def test_parse_move(line, expected):
+    """
+    Only well formed move commands should be parsed into moves.
+    """
+    assert server.parse_move(line) == expected
+
+
+def test_load_test_completes_every_game():
+    """
+    Many concurrent tables with several clients each should all play
+    to completion and be cleaned up.
+    """
+    async def scenario():
+        hanabi_server, listener, connect = await _start()
+        result = await server.load_test(
+            connect, 30, player_count=4, humans=2
+        )
+        listener.close()
+
+        return hanabi_server, result
+
+    hanabi_server, result = _run(scenario())
+
+    assert result.games == 30
+    assert result.moves > 0
+    assert hanabi_server.games_played == 30
+    assert hanabi_server.tables == {}
+
+
+def test_invalid_moves_are_rejected():
+    """
+    Clients should receive an error for malformed or illegal moves and
+    be asked again on the same turn.
+    """
+    async def scenario():
+        hanabi_server, listener, connect = await _start()
+        reader, writer = await connect()
+
+        async def receive(message_type):
+            while True:
+                message = json.loads(await reader.readline())
+                if message['type'] == message_type:
+                    return message
+
+        writer.write(b'JOIN 2 1\n')
+        seat = await receive('seat')
+        turn = await receive('turn')
+
+        writer.write(b'PLAY 9\n')
+        illegal = await receive('error')
+        writer.write(b'FOLD\n')
+        malformed = await receive('error')
+
+        writer.write(b'HINT\n')
+        event = await receive('event')
+
+        writer.close()
+        while hanabi_server.tables:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        listener.close()
+
+        return seat, turn, illegal, malformed, event
+
+    seat, turn, illegal, malformed, event = _run(scenario())
+
+    assert seat['seat'] == 0
+    assert turn['state']['hints'] == 8
+    assert illegal['message'] == 'That move is not legal.'
+    assert malformed['message'].startswith('Moves must be')
+    assert event == {'type': 'event', 'event': 'hint_spent', 'seat': 0}
+
+
+def test_clients_give_real_hints():
+    """
+    Clients should be able to tell another player about their cards,
+    and every client should be told what each player knows.
+    """
+    async def scenario():
+        hanabi_server, listener, connect = await _start()
+        reader, writer = await connect()
+
+        async def receive(message_type):
+            while True:
+                message = json.loads(await reader.readline())
+                if message['type'] == message_type:
+                    return message
+
+        writer.write(b'JOIN 2 1\n')
+        await receive('seat')
+        first = await receive('turn')
+
+        writer.write(b'HINT 0 NUMBER 1\n')
+        to_self = await receive('error')
+
+        number = int(first['state']['hands']['1'][0].split()[1])
+        missing = next(
+            n for n in range(1, 6)
+            if all(
+                int(card.split()[1]) != n
+                for card in first['state']['hands']['1']
+            )
+        )
+        writer.write(f'HINT 1 NUMBER {missing}\n'.encode())
+        not_applicable = await receive('error')
+
+        writer.write(f'HINT 1 NUMBER {number}\n'.encode())
+        event = await receive('event')
+
+        writer.close()
+        while hanabi_server.tables:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        listener.close()
+
+        return first, to_self, not_applicable, number, event
+
+    first, to_self, not_applicable, number, event = _run(scenario())
+
+    unknown = {
+        'colors': [color.value for color in cards.Colors],
+        'numbers': [1, 2, 3, 4, 5],
+    }
+
+    assert first['state']['knowledge']['0'] == [unknown] * 4
+    assert to_self['message'] == 'Hints must be given to another player.'
+    assert not_applicable['message'] == (
+        'A hint must apply to at least one card.'
+    )
+    assert event['event'] == 'hint_spent'
+    assert event['target'] == 1
+    assert event['number'] == number
+    assert 0 in event['card_indices']
+
+
+def test_hints_update_knowledge():
+    """
+    The knowledge sent to clients should include what they were told.
+    """
+    table = server.Table(0, 2, 2, rng=1)
+    hand = table.game.player_hands[table.game.players[1]]
+    hint = Move(MoveType.HINT, None, 1, color=hand[0].color)
+
+    assert table._check_hint(0, hint) is None
+
+    table.game.apply_move(hint)
+    knowledge = table.describe(1)['knowledge'][1]
+
+    assert knowledge[0]['colors'] == [hand[0].color.value]
+
+
+@pytest.mark.parametrize('join', [False, True])
+def test_flooding_client_is_throttled(join):
+    """
+    A client that sends bad lines without reading the errors should not
+    make the server buffer an unbounded number of replies.
+    """
+    writers = []
+    finished = []
+
+    class RecordingServer(server.Server):
+        async def handle_client(self, reader, writer):
+            writers.append(writer)
+            await super().handle_client(reader, writer)
+            finished.append(writer)
+
+    async def scenario():
+        hanabi_server = RecordingServer(seed=1)
+        listener = await hanabi_server.start(port=0)
+        host, port = listener.sockets[0].getsockname()[:2]
+        reader, writer = await asyncio.open_connection(host, port)
+
+        if join:
+            writer.write(b'JOIN 2 1\n')
+        writer.write(b'FOLD\n' * 500000)
+
+        # Give the server time to work through as much of the flood as
+        # it will accept.
+        buffered = 0
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            buffered = max(
+                buffered, writers[0].transport.get_write_buffer_size()
+            )
+
+        writer.transport.abort()
+        while not finished:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        listener.close()
+
+        return buffered
+
+    assert _run(scenario()) <= 2 ** 17
@@ -0,0 +1,117 @@
+import pytest
+
+from hanabi import players, simulation
+
+
+def test_build_tasks_covers_all_trials():
+    """
+    The chunks built for a run should add up to the requested number of
+    trials, with only the final chunk being smaller than the chunk size.
+    """
+    tasks = list(simulation.build_tasks(25, 1, None, 4, chunk_size=10))
+
+    assert [task[1] for task in tasks] == [0, 10, 20]
+    assert [task[2] for task in tasks] == [10, 10, 5]
+
+
+def test_derive_seed_is_deterministic():
+    """
+    Deriving a seed should depend only on the run seed and index.
+    """
+    assert simulation.derive_seed(1, 2) == simulation.derive_seed(1, 2)
+    assert simulation.derive_seed(1, 2) != simulation.derive_seed(1, 3)
+    assert simulation.derive_seed(1, 2) != simulation.derive_seed(2, 2)
+
+
+def test_run_trials_independent_of_worker_count():
+    """
+    The merged result of a run should be the same regardless of how
+    many processes the trials are spread over.
+    """
+    serial = simulation.run_trials(40, workers=1, seed=3, chunk_size=10)
+    parallel = simulation.run_trials(40, workers=2, seed=3, chunk_size=10)
+
+    assert serial.trials == parallel.trials == 40
+    assert serial.histogram == parallel.histogram
+    assert serial.total_score == parallel.total_score
+    assert len(parallel.worker_throughput()) >= 1
+
+
+def test_run_trials_independent_of_chunk_size():
+    """
+    Since each trial is seeded individually, changing the chunk size
+    should not change the result.
+    """
+    small = simulation.run_trials(30, seed=4, chunk_size=7)
+    large = simulation.run_trials(30, seed=4, chunk_size=30)
+
+    assert small.histogram == large.histogram
+
+
+def test_build_game_is_reproducible():
+    """
+    Re-creating a trial's game should give the same deal.
+    """
+    first = simulation.build_game(1, 17, [players.GodPlayer] * 2)
+    second = simulation.build_game(1, 17, [players.GodPlayer] * 2)
+
+    assert first.deck.cards == second.deck.cards
+    assert list(first.player_hands.values()) == list(
+        second.player_hands.values()
+    )
+
+
+def test_run_trials_stops_when_precise():
+    """
+    A run with a precision target should stop at the first chunk where
+    the confidence interval is narrow enough, regardless of the number
+    of workers.
+    """
+    serial = simulation.run_trials(
+        None, seed=2, chunk_size=20, precision=0.15, metric='mean'
+    )
+    parallel = simulation.run_trials(
+        None, workers=2, seed=2, chunk_size=20, precision=0.15, metric='mean'
+    )
+
+    assert serial.trials == parallel.trials
+    assert serial.trials % 20 == 0
+    assert serial.statistics.half_width('mean') < 0.15
+    assert serial.histogram == parallel.histogram
+
+
+def test_run_trials_win_only_counts_same_wins():
+    """
+    Stopping games once they can't be won should not change the number
+    of wins, and the scores should be upper bounds on the real ones.
+    """
+    full = simulation.run_trials(40, player_count=2, seed=5, chunk_size=10)
+    win_only = simulation.run_trials(
+        40, player_count=2, seed=5, chunk_size=10, win_only=True
+    )
+
+    assert win_only.wins == full.wins
+    assert win_only.total_score >= full.total_score
+
+
+def test_run_trials_win_only_measures_win_rate():
+    """
+    Only the win rate can be measured when games stop early.
+    """
+    with pytest.raises(ValueError):
+        simulation.run_trials(
+            None, precision=0.1, metric='mean', win_only=True
+        )
+
+
+def test_run_trials_precision_waits_for_min_trials():
+    """
+    A precision target should not stop a run before the minimum number
+    of trials, even if the first games happen to have equal scores.
+    """
+    result = simulation.run_trials(
+        None, seed=2, chunk_size=10, precision=1.0, metric='mean',
+        min_trials=50,
+    )
+
+    assert result.trials == 50
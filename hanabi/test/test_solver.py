@@ -0,0 +1,90 @@
+import pytest
+
+from hanabi import cards, solver
+from hanabi.game import Game
+from hanabi.players import GodPlayer
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_solver_beats_god_player(seed):
+    """
+    The best score with full knowledge should never be lower than the
+    score the god player heuristic reaches on the same deal.
+    """
+    deck = cards.Deck.full_shuffled_deck(seed)
+    game = Game([GodPlayer] * 4, deck=cards.Deck.from_indices(
+        [card.index for card in deck.cards]
+    ))
+    game.play()
+
+    result = solver.solve(deck, 4)
+
+    assert result.exact
+    assert game.score <= result.score <= 25
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_solver_last_card_is_unplayable(seed):
+    """
+    The player who draws the last card never gets another turn, so a
+    five at the bottom of the deck makes the deal unwinnable.
+    """
+    deck = cards.Deck.full_shuffled_deck(seed)
+    five = cards.Card(cards.Colors.BLUE, 5)
+    deck.cards.remove(five)
+    deck.cards.insert(0, five)
+
+    result = solver.solve(deck, 4)
+
+    assert result.exact
+    assert result.score == 24
+
+
+def test_solver_node_budget():
+    """
+    If the node budget runs out, the result should be marked as inexact.
+    """
+    result = solver.solve(cards.Deck.full_shuffled_deck(0), 4, max_nodes=1)
+
+    assert not result.exact
+
+
+def test_solver_default_budget():
+    """
+    A deal that is slow to solve should give up once the default budget
+    runs out rather than searching indefinitely.
+    """
+    result = solver.solve(cards.Deck.full_shuffled_deck(24), 2)
+
+    assert not result.exact
+    assert result.nodes <= solver.DEFAULT_MAX_NODES + 1
+
+
+def test_make_unmake_restores_state():
+    """
+    Undoing a move should restore the state and its hash exactly.
+    """
+    search = solver.Solver(cards.Deck.full_shuffled_deck(1), 3)
+    original = (
+        [hand.copy() for hand in search.hands],
+        search.stacks.copy(),
+        search.deck_size,
+        search.hints,
+        search.hash,
+    )
+
+    undo_stack = []
+    for _ in range(20):
+        move = search._moves(search._reachable())[-1]
+        undo_stack.append(search._make(move))
+
+    while undo_stack:
+        search._unmake(undo_stack.pop())
+
+    assert original == (
+        search.hands,
+        search.stacks,
+        search.deck_size,
+        search.hints,
+        search.hash,
+    )
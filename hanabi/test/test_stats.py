@@ -0,0 +1,113 @@
+import math
+import random
+import statistics
+
+import pytest
+
+from hanabi import stats
+
+
+def test_streaming_matches_batch_statistics():
+    """
+    The streaming mean and variance should match those computed from all
+    of the scores at once, regardless of how the scores are split up.
+    """
+    rng = random.Random(0)
+    scores = [rng.randint(15, 25) for _ in range(500)]
+
+    first = stats.ScoreStatistics()
+    second = stats.ScoreStatistics()
+    for score in scores[:123]:
+        first.add(score)
+    for score in scores[123:]:
+        second.add(score)
+    first.merge(second)
+
+    assert first.count == len(scores)
+    assert first.mean == pytest.approx(statistics.mean(scores))
+    assert first.variance == pytest.approx(statistics.variance(scores))
+    assert first.wins == scores.count(25)
+
+
+def test_win_rate_interval_contains_estimate():
+    """
+    The Wilson interval should contain the observed win rate and stay
+    within the bounds of a probability.
+    """
+    statistics_ = stats.ScoreStatistics()
+    for score in [25] * 3 + [24] * 7:
+        statistics_.add(score)
+
+    lower, upper = statistics_.win_rate_interval()
+
+    assert 0 <= lower < 0.3 < upper <= 1
+    assert statistics_.half_width('win_rate') == pytest.approx(
+        (upper - lower) / 2
+    )
+
+
+def test_mean_interval_half_width():
+    """
+    The mean interval should use the standard error of the mean.
+    """
+    statistics_ = stats.ScoreStatistics()
+    for score in [20, 22, 24, 25]:
+        statistics_.add(score)
+
+    lower, upper = statistics_.mean_interval()
+    expected = stats.DEFAULT_Z * math.sqrt(statistics_.variance / 4)
+
+    assert (upper - lower) / 2 == pytest.approx(expected)
+
+
+def test_mean_interval_needs_two_scores():
+    """
+    With fewer than two scores, the mean is completely uncertain.
+    """
+    statistics_ = stats.ScoreStatistics()
+    statistics_.add(25)
+
+    assert statistics_.mean_interval() == (-math.inf, math.inf)
+    assert statistics_.half_width('mean') == math.inf
+
+
+def test_half_width_rejects_unknown_metric():
+    """
+    Asking for the interval of an unknown metric should fail.
+    """
+    with pytest.raises(ValueError):
+        stats.ScoreStatistics().half_width('median')
+
+
+@pytest.mark.parametrize('degrees_of_freedom, expected', [
+    (5, 2.571),
+    (10, 2.228),
+    (30, 2.042),
+    (1000, 1.962),
+])
+def test_t_quantile(degrees_of_freedom, expected):
+    """
+    The approximate t quantiles should match tabulated values.
+    """
+    assert stats.t_quantile(1.96, degrees_of_freedom) == pytest.approx(
+        expected, abs=2e-3
+    )
+
+
+def test_difference_statistics_interval():
+    """
+    The paired interval should be centered on the mean difference and
+    use the t quantile for the sample size.
+    """
+    differences = [1, -2, 3, 0, 2, 1]
+    statistics = stats.DifferenceStatistics()
+    for difference in differences:
+        statistics.add(difference)
+
+    lower, upper = statistics.mean_interval()
+    expected = stats.t_quantile(stats.DEFAULT_Z, 5) * math.sqrt(
+        statistics.variance / len(differences)
+    )
+
+    assert (lower + upper) / 2 == pytest.approx(sum(differences) / 6)
+    assert (upper - lower) / 2 == pytest.approx(expected)
@@ -0,0 +1,129 @@
+import pytest
+
+from hanabi import sweep
+from hanabi.game import Game
+
+
+def test_build_grid():
+    """
+    The grid should contain every combination of its values, with the
+    rules normalized.
+    """
+    configs = sweep.build_grid(
+        ['GodPlayer'],
+        [2, 3],
+        MAX_HINTS=[6, 8],
+        HINT_GIVING_NUMBERS=[[5, 4]],
+    )
+
+    assert len(configs) == 4
+    assert configs[0] == sweep.SweepConfig(
+        'GodPlayer',
+        2,
+        (('HINT_GIVING_NUMBERS', (4, 5)), ('MAX_HINTS', 6)),
+    )
+
+
+def test_build_grid_unknown_rule():
+    """
+    Only the game's rule constants can be swept.
+    """
+    with pytest.raises(ValueError):
+        sweep.build_grid(['GodPlayer'], [2], MAX_PLAYERS=[3])
+
+
+def test_game_class_for():
+    """
+    The game class should override the given rules and nothing else.
+    """
+    game_class = sweep.game_class_for((('MAX_HINTS', 3),))
+
+    assert issubclass(game_class, Game)
+    assert game_class.MAX_HINTS == 3
+    assert game_class.MAX_BOMBS == Game.MAX_BOMBS
+    assert sweep.game_class_for(()) is Game
+
+    game = game_class([], rng=0)
+    assert game.hints_remaining == 3
+
+
+def test_run_sweep_uses_cache(tmp_path):
+    """
+    A repeated sweep should load every chunk from the cache, and an
+    extended sweep should only play the chunks it is missing.
+    """
+    cache = sweep.ResultCache(tmp_path)
+    configs = sweep.build_grid(
+        ['GodPlayer'], [3], CARDS_PER_PLAYER=[4, 5]
+    )
+
+    first = sweep.run_sweep(configs, 20, seed=1, chunk_size=10, cache=cache)
+    second = sweep.run_sweep(configs, 20, seed=1, chunk_size=10, cache=cache)
+    extended = sweep.run_sweep(
+        configs, 30, seed=1, chunk_size=10, cache=cache
+    )
+
+    assert (first.computed, first.cached) == (4, 0)
+    assert (second.computed, second.cached) == (0, 4)
+    assert (extended.computed, extended.cached) == (2, 4)
+
+    for config in configs:
+        expected = first.statistics[config]
+        assert second.statistics[config].histogram == expected.histogram
+        assert second.statistics[config].total == expected.total
+        assert extended.statistics[config].count == 30
+
+
+def test_run_sweep_matches_uncached(tmp_path):
+    """
+    Cached results should match playing the games without a cache.
+    """
+    configs = sweep.build_grid(['GodPlayer'], [2], MAX_HINTS=[4])
+    cache = sweep.ResultCache(tmp_path)
+
+    sweep.run_sweep(configs, 15, seed=2, chunk_size=10, cache=cache)
+    cached = sweep.run_sweep(configs, 15, seed=2, chunk_size=10, cache=cache)
+    uncached = sweep.run_sweep(configs, 15, seed=2, chunk_size=10)
+
+    statistics = cached.statistics[configs[0]]
+    expected = uncached.statistics[configs[0]]
+    assert statistics.histogram == expected.histogram
+    assert statistics.total_squares == expected.total_squares
+
+
+def test_cache_key_depends_on_inputs():
+    """
+    Chunks with different configurations, seeds, or trials should have
+    different keys.
+    """
+    cache = sweep.ResultCache('unused')
+    config = sweep.SweepConfig('GodPlayer', 2, ())
+
+    keys = {
+        cache.key(config, 0, 0, 10),
+        cache.key(config, 1, 0, 10),
+        cache.key(config, 0, 10, 10),
+        cache.key(config._replace(player_count=3), 0, 0, 10),
+        cache.key(config._replace(rules=(('MAX_HINTS', 4),)), 0, 0, 10),
+    }
+
+    assert len(keys) == 5
+    assert cache.key(config, 0, 0, 10) == cache.key(config, 0, 0, 10)
+
+
+@pytest.mark.parametrize('player_count, rules', [
+    (5, (('CARDS_PER_PLAYER', 10),)),
+    (4, (('CARDS_PER_PLAYER', 13),)),
+    (1, ()),
+    (3, (('MAX_BOMBS', 0),)),
+    (3, (('HINT_GIVING_NUMBERS', (6,)),)),
+])
+def test_run_sweep_rejects_unplayable_configs(player_count, rules):
+    """
+    Configurations that can't be played should be rejected before any
+    games are played.
+    """
+    config = sweep.SweepConfig('GodPlayer', player_count, rules)
+
+    with pytest.raises(ValueError):
+        sweep.run_sweep([config], 10)
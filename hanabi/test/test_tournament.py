@@ -0,0 +1,66 @@
+import pytest
+
+from hanabi import players, tournament
+
+
+class NoHintPlayer(players.GodPlayer):
+    """
+    A god player that discards instead of giving hints.
+    """
+
+    def give_hint(self):
+        """
+        Discard the last card in the hand instead.
+        """
+        hand = self.game.player_hands[self]
+        self.discard(len(hand) - 1)
+
+
+def test_identical_players_have_no_difference():
+    """
+    Two copies of the same deterministic player play identical games on
+    a common deal, so every paired difference should be exactly zero.
+    """
+    class OtherGodPlayer(players.GodPlayer):
+        pass
+
+    result = tournament.run_tournament(
+        20, [players.GodPlayer, OtherGodPlayer], player_counts=[2, 3], seed=1
+    )
+
+    assert result.trials == 20
+    for comparison in result.comparisons():
+        assert comparison.score.count == 20
+        assert comparison.score.total_squares == 0
+        assert comparison.score.mean_interval() == (0.0, 0.0)
+
+
+def test_paired_differences_match_scores():
+    """
+    The mean paired difference should equal the difference between the
+    mean scores of the two classes.
+    """
+    result = tournament.run_tournament(
+        30, [players.GodPlayer, NoHintPlayer], seed=2, chunk_size=7
+    )
+
+    (comparison,) = result.comparisons()
+    god = result.statistics[(4, players.GodPlayer)]
+    no_hint = result.statistics[(4, NoHintPlayer)]
+
+    assert comparison.score.mean == pytest.approx(god.mean - no_hint.mean)
+    assert comparison.win_rate.mean == pytest.approx(
+        god.win_rate - no_hint.win_rate
+    )
+    assert comparison.score.mean > 0
+
+
+def test_requires_two_player_classes():
+    """
+    A tournament with a single entrant has nothing to compare.
+    """
+    with pytest.raises(ValueError):
+        tournament.run_tournament(10, [players.GodPlayer])
+
+    with pytest.raises(ValueError):
+        tournament.run_tournament(10, [players.GodPlayer] * 2)
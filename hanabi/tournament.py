@@ -0,0 +1,322 @@
+import collections
+import itertools
+import time
+
+from hanabi import players, simulation, stats
+
+
+Comparison = collections.namedtuple(
+    'Comparison',
+    ['player_count', 'first', 'second', 'score', 'win_rate'],
+)
+"""
+The paired difference between two player classes for a player count.
+The score and win rate are :class:`hanabi.stats.DifferenceStatistics`
+of the first class's results minus the second's.
+"""
+
+
+class TournamentResult:
+    """
+    The merged outcome of playing several player classes on the same
+    deals.
+    """
+
+    def __init__(self, player_classes, player_counts):
+        """
+        Create a new, empty result.
+
+        Args:
+            player_classes:
+                The player classes taking part in the tournament.
+            player_counts:
+                The numbers of players that each deal is played with.
+        """
+        self.elapsed = 0.0
+        self.player_classes = list(player_classes)
+        self.player_counts = list(player_counts)
+
+        self.statistics = {
+            (count, klass): stats.ScoreStatistics()
+            for count in self.player_counts
+            for klass in self.player_classes
+        }
+        self.score_differences = {}
+        self.win_differences = {}
+        for count in self.player_counts:
+            for pair in itertools.combinations(self.player_classes, 2):
+                self.score_differences[(count,) + pair] = (
+                    stats.DifferenceStatistics()
+                )
+                self.win_differences[(count,) + pair] = (
+                    stats.DifferenceStatistics()
+                )
+
+    @property
+    def trials(self):
+        """
+        Returns:
+            The number of deals played.
+        """
+        key = (self.player_counts[0], self.player_classes[0])
+
+        return self.statistics[key].count
+
+    def add_deal(self, player_count, scores):
+        """
+        Record the scores each player class reached on a single deal.
+
+        Args:
+            player_count:
+                The number of players the deal was played with.
+            scores:
+                The score of each player class, in the same order as
+                the tournament's player classes.
+        """
+        for klass, score in zip(self.player_classes, scores):
+            self.statistics[(player_count, klass)].add(score)
+
+        pairs = itertools.combinations(
+            zip(self.player_classes, scores), 2
+        )
+        for (first, first_score), (second, second_score) in pairs:
+            key = (player_count, first, second)
+            self.score_differences[key].add(first_score - second_score)
+            self.win_differences[key].add(
+                (first_score == stats.WINNING_SCORE)
+                - (second_score == stats.WINNING_SCORE)
+            )
+
+    def comparisons(self):
+        """
+        Returns:
+            A list of :class:`Comparison` instances for every pair of
+            player classes and every player count.
+        """
+        return [
+            Comparison(
+                key[0],
+                key[1],
+                key[2],
+                self.score_differences[key],
+                self.win_differences[key],
+            )
+            for key in self.score_differences
+        ]
+
+    def merge(self, other):
+        """
+        Add the deals recorded by another result to this result.
+
+        Args:
+            other:
+                A result for the same player classes and counts.
+        """
+        for key, statistics in other.statistics.items():
+            self.statistics[key].merge(statistics)
+
+        for key, differences in other.score_differences.items():
+            self.score_differences[key].merge(differences)
+
+        for key, differences in other.win_differences.items():
+            self.win_differences[key].merge(differences)
+
+
+def run_chunk(task):
+    """
+    Play a chunk of deals with every player class and player count.
+
+    Args:
+        task:
+            A tuple containing the chunk index, the index of the chunk's
+            first trial, the number of trials in the chunk, the run
+            seed, the player classes, and the player counts.
+
+    Returns:
+        A :class:`TournamentResult` for the chunk's deals.
+    """
+    _, first_trial, trials, seed, player_classes, player_counts = task
+
+    result = TournamentResult(player_classes, player_counts)
+
+    start = time.perf_counter()
+
+    for trial in range(first_trial, first_trial + trials):
+        for count in player_counts:
+            scores = []
+            for klass in player_classes:
+                game = simulation.build_game(seed, trial, [klass] * count)
+                game.play()
+
+                scores.append(game.score)
+
+            result.add_deal(count, scores)
+
+    result.elapsed = time.perf_counter() - start
+
+    return result
+
+
+def run_tournament(
+        trials,
+        player_classes,
+        player_counts=(4,),
+        workers=1,
+        seed=0,
+        chunk_size=simulation.DEFAULT_CHUNK_SIZE,
+        progress=None,
+):
+    """
+    Play every player class on the same deals for each player count.
+
+    Since every class plays the same deals, most of the variance caused
+    by the luck of the deal cancels out of the paired differences. Far
+    fewer trials are needed to tell two classes apart than when each is
+    simulated on its own deals.
+
+    Args:
+        trials:
+            The number of deals to play for each player count.
+        player_classes:
+            The player classes to compare. There must be at least two,
+            and each may only be entered once.
+        player_counts:
+            The numbers of players to play each deal with.
+        workers:
+            The number of worker processes to use. If this is 1, the
+            games are played in the current process.
+        seed:
+            The seed for the entire run.
+        chunk_size:
+            The maximum number of deals in each chunk.
+        progress:
+            An optional callable that receives the number of deals in
+            each chunk as it completes.
+
+    Returns:
+        A :class:`TournamentResult` containing the merged results.
+    """
+    if len(player_classes) < 2:
+        raise ValueError('At least two player classes are required.')
+
+    if len(set(player_classes)) != len(player_classes):
+        raise ValueError('Each player class may only be entered once.')
+
+    player_classes = tuple(player_classes)
+    player_counts = tuple(player_counts)
+
+    # The chunks are split up the same way as a regular simulation, with
+    # all of the tournament's entrants played on each trial's deal.
+    tasks = (
+        (index, first_trial, size, seed, player_classes, player_counts)
+        for index, first_trial, size, *_ in simulation.build_tasks(
+            trials, seed, None, None, chunk_size
+        )
+    )
+    result = TournamentResult(player_classes, player_counts)
+
+    start = time.perf_counter()
+
+    for chunk_result in simulation.run_chunks(tasks, workers, run_chunk):
+        result.merge(chunk_result)
+
+        if progress is not None:
+            progress(chunk_result.trials)
+
+    result.elapsed = time.perf_counter() - start
+
+    return result
+
+
+def main():
+    """
+    Compare player classes on common deals from the command line.
+    """
+    import argparse
+    import random
+
+    from tqdm import tqdm
+
+    parser = argparse.ArgumentParser(
+        description='Compare Hanabi AI players on the same deals.'
+    )
+    parser.add_argument(
+        'player_classes', metavar='PLAYER_CLASS', nargs='+',
+        help='The names of the player classes in hanabi.players to compare.',
+    )
+    parser.add_argument(
+        '--trials', default=10_000, type=int,
+        help='The number of deals to play for each player count.',
+    )
+    parser.add_argument(
+        '--players', default=[4], nargs='+', type=int,
+        help='The numbers of players to play each deal with.',
+    )
+    parser.add_argument(
+        '--workers', default=1, type=int,
+        help='The number of worker processes to spread the games over.',
+    )
+    parser.add_argument(
+        '--chunk-size', default=simulation.DEFAULT_CHUNK_SIZE, type=int,
+        help='The number of deals in each unit of work.',
+    )
+    parser.add_argument(
+        '--seed', default=None, type=int,
+        help='The seed for the run. A random seed is used if omitted.',
+    )
+    args = parser.parse_args()
+
+    if len(args.player_classes) < 2:
+        parser.error('at least two player classes are required')
+
+    if len(set(args.player_classes)) != len(args.player_classes):
+        parser.error('each player class may only be entered once')
+
+    seed = args.seed
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+
+    player_classes = [getattr(players, name) for name in args.player_classes]
+
+    with tqdm(total=args.trials) as progress_bar:
+        result = run_tournament(
+            args.trials,
+            player_classes,
+            player_counts=args.players,
+            workers=args.workers,
+            seed=seed,
+            chunk_size=args.chunk_size,
+            progress=progress_bar.update,
+        )
+
+    print(f'Played {result.trials:,} deals in {result.elapsed:.2f} seconds.')
+    print(f'\tSeed: {seed}')
+
+    for count in result.player_counts:
+        print(f'\n{count} players:')
+
+        for klass in result.player_classes:
+            statistics = result.statistics[(count, klass)]
+            print(
+                f'\t{klass.__name__}: average score {statistics.mean:.2f}, '
+                f'wins {statistics.win_rate:.2%}'
+            )
+
+        for comparison in result.comparisons():
+            if comparison.player_count != count:
+                continue
+
+            score_low, score_high = comparison.score.mean_interval()
+            win_low, win_high = comparison.win_rate.mean_interval()
+            print(
+                f'\t{comparison.first.__name__} - '
+                f'{comparison.second.__name__}: '
+                f'score {comparison.score.mean:+.3f} '
+                f'[{score_low:+.3f}, {score_high:+.3f}], '
+                f'win rate {comparison.win_rate.mean:+.2%} '
+                f'[{win_low:+.2%}, {win_high:+.2%}]'
+            )
+
+
+if __name__ == '__main__':
+    main()